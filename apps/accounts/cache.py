@@ -0,0 +1,89 @@
+import hashlib
+import time
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models.fields.files import FieldFile
+
+# Prefixo das gerações por usuário (lidas sempre do cache compartilhado,
+# ver LOCAL_BYPASS em CACHES)
+GENERATION_PREFIX = "accounts:generation:"
+# Tempo máximo do usuário e do dispositivo OTP em cache
+TIMEOUT = 300
+# Campos do usuário que nunca vão para o cache
+USER_EXCLUDED_FIELDS = {"password"}
+# Únicos campos guardados dos dispositivos OTP (sem chaves nem tokens)
+DEVICE_FIELDS = ("id", "user_id", "name", "confirmed")
+
+
+def get_generation(user_id):
+    """
+    Geração do estado de autenticação de um usuário.
+
+    Compõe as chaves do usuário e dos dispositivos OTP em cache; é
+    incrementada sempre que o usuário ou um dos seus dispositivos muda.
+    """
+    key = f"{GENERATION_PREFIX}{user_id}"
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_user(user_id):
+    """Descarta o usuário e os dispositivos em cache de todas as sessões."""
+    key = f"{GENERATION_PREFIX}{user_id}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def user_key(user_id, session_key):
+    # A chave da sessão não é gravada em claro no cache
+    digest = hashlib.sha256(session_key.encode()).hexdigest()
+    return f"accounts:user:{user_id}:{get_generation(user_id)}:{digest}"
+
+
+def device_key(user_id, persistent_id):
+    return f"accounts:device:{user_id}:{get_generation(user_id)}:{persistent_id}"
+
+
+def _fields(instance, names):
+    campos = {}
+    for name in names:
+        value = getattr(instance, name)
+        # FieldFile guarda a instância inteira (e a senha com ela): só o nome
+        campos[name] = value.name if isinstance(value, FieldFile) else value
+    return campos
+
+
+def _restore(model, db, fields):
+    """
+    Instância de ``model`` com ``fields``, como se lida do banco. Os demais
+    campos ficam adiados: se usados, são buscados no banco.
+    """
+    return model.from_db(db, list(fields), list(fields.values()))
+
+
+def dump_user(user):
+    """Entrada do usuário em cache: campos sem a senha e o hash da sessão."""
+    names = [f.attname for f in user._meta.concrete_fields if f.name not in USER_EXCLUDED_FIELDS]
+    return {
+        "db": user._state.db,
+        "fields": _fields(user, names),
+        "session_hash": user.get_session_auth_hash(),
+    }
+
+
+def load_user(model, entry):
+    return _restore(model, entry["db"], entry["fields"])
+
+
+def dump_device(device):
+    return {"model": device.model_label(), "db": device._state.db, "fields": _fields(device, DEVICE_FIELDS)}
+
+
+def load_device(entry):
+    return _restore(apps.get_model(entry["model"]), entry["db"], entry["fields"])
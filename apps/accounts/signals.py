@@ -0,0 +1,27 @@
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django_otp.models import Device
+
+from .cache import invalidate_user
+
+
+def user_changed(sender, instance, **kwargs):
+    """Invalida o estado de autenticação em cache após alterar o usuário"""
+    invalidate_user(instance.pk)
+
+
+def device_changed(sender, instance, **kwargs):
+    """Invalida o estado de autenticação em cache após alterar um dispositivo OTP"""
+    invalidate_user(instance.user_id)
+
+
+def connect_signals():
+    User = get_user_model()
+    post_save.connect(user_changed, sender=User, dispatch_uid="accounts_user_save")
+    post_delete.connect(user_changed, sender=User, dispatch_uid="accounts_user_delete")
+    # Todos os tipos de dispositivo instalados (TOTP, estático, e-mail, telefone)
+    for model in apps.get_models():
+        if issubclass(model, Device):
+            post_save.connect(device_changed, sender=model, dispatch_uid=f"accounts_{model.__name__}_save")
+            post_delete.connect(device_changed, sender=model, dispatch_uid=f"accounts_{model.__name__}_delete")
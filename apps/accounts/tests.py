@@ -1,3 +1,141 @@
-from django.test import TestCase
+import pickle
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django_otp import DEVICE_ID_SESSION_KEY
+from django_otp.plugins.otp_totp.models import TOTPDevice
+
+from apps.main.tests import CacheTestCase
+from core.middleware.auth import CachedAuthenticationMiddleware, CachedOTPMiddleware
+
+from . import cache as auth_cache
+
+URL = "/password_reset/"
+# Regra password_reset: 3 tentativas por conta e 10 por IP por hora
+JANELA = 60 * 60
+
+
+class ThrottleTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        # Início de uma janela fixa, para a contagem não depender da hora
+        self.inicio = (int(time.time() // JANELA) + 1) * JANELA
+
+    def post(self, email="conta@example.com", segundos=0, **extra):
+        with mock.patch("time.time", return_value=self.inicio + segundos):
+            return self.client.post(URL, {"email": email}, **extra)
+
+    def test_account_limit_returns_429_with_retry_after(self):
+        for _ in range(3):
+            self.assertEqual(self.post().status_code, 302)
+        response = self.post()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "60")
+        # Outra conta do mesmo IP continua liberada
+        self.assertEqual(self.post("outra@example.com").status_code, 302)
+
+    def test_window_outlasts_default_cache_timeout(self):
+        for segundos in (0, 600, 1200):
+            self.assertEqual(self.post(segundos=segundos).status_code, 302)
+        self.assertEqual(self.post(segundos=1800).status_code, 429)
+
+    def test_lockout_doubles_on_each_strike(self):
+        for _ in range(3):
+            self.post()
+        self.assertEqual(self.post()["Retry-After"], "60")
+        self.assertEqual(self.post(segundos=30)["Retry-After"], "30")
+        # Após o bloqueio a conta ainda está acima do limite da janela
+        self.assertEqual(self.post(segundos=61)["Retry-After"], "120")
+        self.assertEqual(self.post(segundos=182)["Retry-After"], "240")
+        # Reincidências contam por STRIKES_TIMEOUT, não pelo timeout padrão
+        self.assertEqual(self.post(segundos=800)["Retry-After"], "480")
+
+    def test_ip_limit_uses_remote_addr_by_default(self):
+        for n in range(10):
+            self.post(f"conta{n}@example.com", HTTP_X_FORWARDED_FOR=f"10.0.0.{n}")
+        self.assertEqual(self.post("nova@example.com").status_code, 429)
+
+    @override_settings(CLIENT_IP_HEADER="HTTP_X_FORWARDED_FOR", TRUSTED_PROXY_COUNT=1)
+    def test_ip_limit_uses_configured_proxy_header(self):
+        for n in range(10):
+            self.post(f"conta{n}@example.com", HTTP_X_FORWARDED_FOR="1.1.1.1")
+        # Valores acrescentados pelo cliente antes do IP real são ignorados
+        response = self.post("nova@example.com", HTTP_X_FORWARDED_FOR="2.2.2.2, 1.1.1.1")
+        self.assertEqual(response.status_code, 429)
+        # Outros visitantes atrás do mesmo proxy não são afetados
+        response = self.post("nova@example.com", HTTP_X_FORWARDED_FOR="3.3.3.3")
+        self.assertEqual(response.status_code, 302)
+
+
+class CachedAuthenticationTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = get_user_model().objects.create_user("admin@example.com", "senha-antiga")
+        self.device = TOTPDevice.objects.create(user=self.user, name="app", confirmed=True)
+        self.client.force_login(self.user)
+        session = self.client.session
+        session[DEVICE_ID_SESSION_KEY] = self.device.persistent_id
+        session.save()
+
+    def authenticate(self):
+        """Usuário da requisição após os middlewares de autenticação e OTP."""
+        request = RequestFactory().get("/adminmk/")
+        request.session = self.client.session
+        CachedAuthenticationMiddleware(lambda request: HttpResponse()).process_request(request)
+        CachedOTPMiddleware(lambda request: HttpResponse())(request)
+        return request.user
+
+    def cached_entries(self):
+        return [
+            cache.get(auth_cache.user_key(self.user.pk, self.client.session.session_key)),
+            cache.get(auth_cache.device_key(self.user.pk, self.device.persistent_id)),
+        ]
+
+    def test_cached_user_and_device_without_secrets(self):
+        self.assertTrue(self.authenticate().is_verified())
+        entradas = self.cached_entries()
+        self.assertNotIn(None, entradas)
+        serializado = pickle.dumps(entradas)
+        self.assertNotIn(self.user.password.encode(), serializado)
+        self.assertNotIn(self.device.key.encode(), serializado)
+        # Só a leitura da sessão: usuário e dispositivo vêm do cache
+        with self.assertNumQueries(1):
+            user = self.authenticate()
+            self.assertEqual((user.pk, user.email), (self.user.pk, "admin@example.com"))
+            self.assertTrue(user.is_verified())
+
+    def test_password_change_drops_cached_user(self):
+        self.authenticate()
+        self.user.set_password("senha-nova")
+        self.user.save()
+        self.assertFalse(self.authenticate().is_authenticated)
+
+    def test_logout_and_session_rotation_drop_cached_user(self):
+        self.authenticate()
+        antiga = self.client.cookies["sessionid"].value
+        self.client.logout()
+        self.client.cookies["sessionid"] = antiga
+        self.assertFalse(self.authenticate().is_authenticated)
+        self.client.force_login(self.user)
+        self.assertNotEqual(self.client.session.session_key, antiga)
+        self.assertIsNone(self.cached_entries()[0])
+
+    def test_deactivation_drops_cached_user(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        self.assertFalse(self.authenticate().is_authenticated)
+
+    def test_device_changes_drop_cached_device(self):
+        self.authenticate()
+        self.device.confirmed = False
+        self.device.save()
+        self.assertFalse(self.authenticate().otp_device.confirmed)
+        self.device.delete()
+        user = self.authenticate()
+        self.assertIsNone(user.otp_device)
+        self.assertFalse(user.is_verified())
@@ -1,5 +1,6 @@
 from django.contrib.auth import views as auth_views
 from django.urls import path
+from django.views.generic import RedirectView
 
 urlpatterns = [
     path(
@@ -30,6 +31,13 @@ urlpatterns = [
         ),
         name="password_reset_complete",
     ),
+    # Link público de login: reverter 'two_factor:login' nas páginas públicas
+    # carregaria todo o two_factor (importado sob demanda em core/urls.py)
+    path(
+        "login/",
+        RedirectView.as_view(pattern_name="two_factor:login", query_string=True),
+        name="login",
+    ),
     #path(
     #    "login/",
     #    auth_views.LoginView.as_view(template_name="registration/login.html"),
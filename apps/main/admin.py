@@ -1,7 +1,19 @@
-from django.contrib import admin
+import json
+from datetime import timedelta
+
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
 from django.db import transaction
+from django.db.models import Sum
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
 from django.utils.html import format_html
 from django.contrib.admin import SimpleListFilter
+from . import skill_index
+from .cache import invalidate_homepage_cache
 from .models import *
 
 # Filtros personalizados
@@ -125,7 +137,7 @@ class HeroAdmin(AdminSingleton):
 
     fieldsets = (
         ('Informações do Hero', {
-            'fields': ('greeting', 'full_name', 'title'),
+            'fields': ('greeting', 'full_name', 'title', 'works_for'),
             'description': 'Conteúdo principal da seção hero na página inicial'
         }),
         ('Biografia', {
@@ -248,16 +260,17 @@ class SkillAdmin(BaseAdmin):
 # Admin para Projetos
 @admin.register(Project)
 class ProjectAdmin(BaseAdmin):
-    list_display = ('title', 'preview_imagem', 'contagem_skills', 'links_disponiveis', 'ordering_index')
-    list_editable = ('ordering_index',)
-    list_filter = (FilterActive,)
-    search_fields = ('title', 'description')
+    list_display = ('title', 'preview_imagem', 'contagem_skills', 'links_disponiveis', 'featured', 'ordering_index')
+    list_filter = (FilterActive, 'featured')
+    search_fields = ('title', 'description', 'slug')
     filter_horizontal = ('skill',)
+    prepopulated_fields = {'slug': ('title',)}
     ordering = ('ordering_index',)
+    change_list_template = 'admin/main/project/change_list.html'
 
     fieldsets = (
         ('Informações do Projeto', {
-            'fields': ('title', 'description'),
+            'fields': ('title', 'slug', 'description'),
             'classes': ('wide',)
         }),
         ('Mídia', {
@@ -273,7 +286,7 @@ class ProjectAdmin(BaseAdmin):
             'description': 'Selecione as tecnologias/skills usadas'
         }),
         ('Configurações de exibição', {
-            'fields': ('ordering_index', 'is_active'),
+            'fields': ('featured', 'ordering_index', 'is_active'),
             'classes': ('collapse',)
         }),
     )
@@ -301,6 +314,72 @@ class ProjectAdmin(BaseAdmin):
         return format_html(' | '.join(links)) if links else format_html('<span style="color: #999;">Sem links</span>')
     links_disponiveis.short_description = 'Links'
 
+    def get_urls(self):
+        urls = [
+            path(
+                'reorder/',
+                self.admin_site.admin_view(self.reorder_view),
+                name='main_project_reorder',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def reorder_view(self, request):
+        """
+        Reordena todos os projetos de uma vez.
+
+        Recebe a lista completa de ids na nova ordem (JSON ``{"order": [...]}``
+        ou campo ``order`` separado por vírgulas) e grava os índices com um
+        único ``bulk_update`` dentro de uma transação.
+        """
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        if request.method != 'POST':
+            context = {
+                **self.admin_site.each_context(request),
+                'opts': self.model._meta,
+                'title': 'Reordenar projetos',
+                'projects': Project.objects.order_by('ordering_index', '-created').only(
+                    'id', 'title', 'is_active', 'ordering_index'
+                ),
+            }
+            return TemplateResponse(request, 'admin/main/project/reorder.html', context)
+
+        is_json = request.content_type == 'application/json'
+        try:
+            if is_json:
+                order = json.loads(request.body)['order']
+            else:
+                order = request.POST.get('order', '').split(',')
+            order = [int(pk) for pk in order if str(pk).strip()]
+        except (ValueError, KeyError, TypeError):
+            return HttpResponseBadRequest('Ordem inválida.')
+
+        with transaction.atomic():
+            projects = {
+                p.pk: p for p in Project.objects.select_for_update().only('id', 'ordering_index')
+            }
+            if len(order) != len(set(order)) or set(order) != set(projects):
+                return HttpResponseBadRequest('A ordem deve conter todos os projetos exatamente uma vez.')
+
+            alterados = []
+            for posicao, pk in enumerate(order, start=1):
+                projeto = projects[pk]
+                if projeto.ordering_index != posicao:
+                    projeto.ordering_index = posicao
+                    alterados.append(projeto)
+            if alterados:
+                Project.objects.bulk_update(alterados, ['ordering_index'], batch_size=500)
+                # bulk_update não dispara sinais: invalida o cache uma única vez
+                transaction.on_commit(invalidate_homepage_cache)
+                transaction.on_commit(skill_index.invalidate_index)
+
+        if is_json:
+            return JsonResponse({'updated': len(alterados)})
+        messages.success(request, f'Ordem salva ({len(alterados)} projetos alterados).')
+        return redirect('admin:main_project_changelist')
+
 admin.site.register(Sections)
 class SectionsAdmin(BaseAdmin):
     list_display = ('about_me', 'projects', 'skills', 'contact')
@@ -390,6 +469,59 @@ class MessageAdmin(BaseAdmin):
     preview_message.short_description = 'Mensagem'
 
 
+@admin.register(PageView)
+class PageViewAdmin(admin.ModelAdmin):
+    """Painel somente leitura sobre as visualizações agregadas"""
+    list_display = ('day', 'path', 'section', 'referrer_host', 'views')
+    list_filter = ('day', 'section')
+    search_fields = ('path', 'referrer_host')
+    date_hierarchy = 'day'
+    change_list_template = 'admin/main/pageview/change_list.html'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        inicio = timezone.localdate() - timedelta(days=29)
+        recentes = PageView.objects.filter(day__gte=inicio)
+        paginas = recentes.filter(section='')
+        extra_context = {
+            **(extra_context or {}),
+            'periodo_inicio': inicio,
+            'total_visualizacoes': paginas.aggregate(total=Sum('views'))['total'] or 0,
+            'por_dia': paginas.values('day').annotate(total=Sum('views')).order_by('-day'),
+            'por_pagina': paginas.values('path').annotate(total=Sum('views')).order_by('-total')[:10],
+            'por_origem': paginas.exclude(referrer_host='').values('referrer_host')
+                .annotate(total=Sum('views')).order_by('-total')[:10],
+            'por_secao': recentes.exclude(section='').values('section')
+                .annotate(total=Sum('views')).order_by('-total'),
+        }
+        return super().changelist_view(request, extra_context=extra_context)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Acompanhamento da fila de e-mails"""
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'next_attempt', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'recipients')
+    readonly_fields = [f.name for f in OutboundEmail._meta.fields]
+    actions = ('retry_now',)
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Reenviar na próxima execução da fila')
+    def retry_now(self, request, queryset):
+        total = queryset.exclude(status=OutboundEmail.SENT).update(
+            status=OutboundEmail.PENDING, next_attempt=timezone.now(),
+        )
+        self.message_user(request, f'{total} e-mail(s) reagendado(s).', messages.SUCCESS)
+
+
 # Personalização do painel admin
 admin.site.site_header = "🎨 Painel de Administração do Portfólio"
 admin.site.site_title = "Administração do Portfólio"
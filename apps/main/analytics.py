@@ -0,0 +1,96 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import PageView
+
+logger = logging.getLogger(__name__)
+
+# Contadores em memória: (path, section, day, referrer_host) -> visualizações.
+# _counts_lock protege os incrementos e a troca do dicionário no flush.
+_counts = defaultdict(int)
+_counts_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def referrer_host(request):
+    """Extrai o host do Referer, ignorando navegação interna do próprio site."""
+    referer = request.META.get("HTTP_REFERER")
+    if not referer:
+        return ""
+    host = (urlsplit(referer).hostname or "")[:255]
+    return "" if host == request.get_host().split(":")[0] else host
+
+
+def record(path, referrer="", section=""):
+    """
+    Contabiliza uma visualização no agregador do processo.
+
+    O custo no caminho da requisição é um incremento de dicionário; a
+    gravação acontece em lotes a cada ``ANALYTICS_FLUSH_INTERVAL`` segundos
+    ou quando o buffer atinge ``ANALYTICS_MAX_KEYS`` chaves distintas.
+    """
+    key = (path[:255], section, timezone.localdate(), referrer)
+    with _counts_lock:
+        _counts[key] += 1
+        pendentes = len(_counts)
+    if (
+        time.monotonic() - _last_flush >= settings.ANALYTICS_FLUSH_INTERVAL
+        or pendentes >= settings.ANALYTICS_MAX_KEYS
+    ):
+        flush()
+
+
+def _upsert(rows):
+    table = connection.ops.quote_name(PageView._meta.db_table)
+    sql = (
+        f"INSERT INTO {table} (path, section, day, referrer_host, views) "
+        "VALUES (%s, %s, %s, %s, %s) "
+        "ON CONFLICT (path, section, day, referrer_host) "
+        f"DO UPDATE SET views = {table}.views + excluded.views"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def flush():
+    """
+    Grava os contadores pendentes com um único upsert em lote.
+
+    Chamado no caminho da requisição: uma falha ao gravar é registrada no
+    log e os contadores voltam para o buffer, sem propagar a exceção.
+    """
+    global _counts, _last_flush
+    if not _flush_lock.acquire(blocking=False):
+        # Outra thread já está gravando
+        return
+    try:
+        with _counts_lock:
+            pending, _counts = _counts, defaultdict(int)
+        _last_flush = time.monotonic()
+        if not pending:
+            return
+        rows = [
+            (path, section, connection.ops.adapt_datefield_value(day), host, views)
+            for (path, section, day, host), views in pending.items()
+        ]
+        try:
+            _upsert(rows)
+        except Exception:
+            logger.exception("Falha ao gravar visualizações; contadores mantidos em memória.")
+            with _counts_lock:
+                for key, views in pending.items():
+                    _counts[key] += views
+    finally:
+        _flush_lock.release()
+
+
+atexit.register(flush)
@@ -0,0 +1,147 @@
+"""
+API JSON somente leitura com o conteúdo do portfólio.
+
+Cada seção é serializada à mão (apenas os campos publicados e apenas os
+itens ativos, inclusive nas relações) e o corpo
+da resposta é gerado uma vez por versão do conteúdo, já com a versão
+comprimida em gzip e o ETag, de modo que servir a API custa uma leitura
+de cache.
+"""
+import gzip
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from .cache import get_content_version
+from .models import About, Contact, Footer, Hero, InfoItem, Project, Skill, SkillGroup, SocialLink
+from .seo import absolute_url
+
+API_KEY = "main:api"
+API_TIMEOUT = 60 * 60 * 24
+
+
+def _image(field, width, height):
+    if not field:
+        return None
+    return {"url": absolute_url(field.url), "width": width, "height": height}
+
+
+def hero():
+    obj = Hero.objects.filter(is_active=True).first()
+    if obj is None:
+        return None
+    return {
+        "greeting": obj.greeting,
+        "full_name": obj.full_name,
+        "title": obj.title,
+        "works_for": obj.works_for,
+        "bio_html": obj.bio_html,
+    }
+
+
+def about():
+    obj = About.objects.filter(is_active=True).first()
+    if obj is None:
+        return None
+    return {
+        "about_html": obj.about_html,
+        "avatar": _image(obj.avatar, obj.avatar_width, obj.avatar_height),
+    }
+
+
+def projects():
+    queryset = Project.objects.filter(is_active=True).prefetch_related(
+        Prefetch("skill", queryset=Skill.objects.filter(is_active=True).only("id", "title"))
+    )
+    return [
+        {
+            "id": obj.pk,
+            "slug": obj.slug,
+            "url": absolute_url(obj.get_absolute_url()),
+            "title_html": obj.title_html,
+            "description_html": obj.description_html,
+            "image": _image(obj.image, obj.image_width, obj.image_height),
+            "demo_url": obj.demo_url,
+            "source_url": obj.source_url,
+            "featured": obj.featured,
+            "skills": [skill.title for skill in obj.skill.all()],
+        }
+        for obj in queryset
+    ]
+
+
+def skills():
+    queryset = SkillGroup.objects.filter(is_active=True).prefetch_related(
+        Prefetch("skill_set", queryset=Skill.objects.filter(is_active=True))
+    )
+    return [
+        {
+            "title": group.title,
+            "skills": [
+                {"id": skill.pk, "title": skill.title, "icon": skill.icon}
+                for skill in group.skill_set.all()
+            ],
+        }
+        for group in queryset
+    ]
+
+
+def contact():
+    obj = Contact.objects.filter(is_active=True).prefetch_related(
+        Prefetch("info_items", queryset=InfoItem.objects.filter(is_active=True)),
+        Prefetch("social_links", queryset=SocialLink.objects.filter(is_active=True)),
+    ).first()
+    if obj is None:
+        return None
+    return {
+        "title": obj.title,
+        "description": obj.description,
+        "info_items": [
+            {"key": item.key, "value": item.value, "link": item.link, "icon": item.icon}
+            for item in obj.info_items.all()
+        ],
+        "social_links": [
+            {"title": link.title, "link": link.link, "icon": link.icon}
+            for link in obj.social_links.all()
+        ],
+    }
+
+
+def footer():
+    obj = Footer.objects.first()
+    return {"copyright_text": obj.copyright_text} if obj else None
+
+
+SECTIONS = {
+    "hero": hero,
+    "about": about,
+    "projects": projects,
+    "skills": skills,
+    "contact": contact,
+    "footer": footer,
+}
+PORTFOLIO = "portfolio"
+
+
+def build(name):
+    """Corpo JSON da seção ``name`` (ou de todas, em ``portfolio``)."""
+    if name == PORTFOLIO:
+        dados = {section: serializer() for section, serializer in SECTIONS.items()}
+    else:
+        dados = SECTIONS[name]()
+    return json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def get_payload(name, version=None):
+    """``(etag, corpo, corpo em gzip)`` da seção na versão atual do conteúdo."""
+    version = get_content_version() if version is None else version
+    key = f"{API_KEY}:{name}:v{version}"
+    payload = cache.get(key)
+    if payload is None:
+        corpo = build(name)
+        etag = f'"{hashlib.sha1(corpo).hexdigest()[:20]}"'
+        payload = (etag, corpo, gzip.compress(corpo, mtime=0))
+        cache.set(key, payload, API_TIMEOUT)
+    return payload
@@ -0,0 +1,129 @@
+import re
+import time
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.cache import CacheMiddleware
+from django.middleware.csrf import get_token
+from django.utils.decorators import decorator_from_middleware_with_args
+
+from core.utils.html import minify_response
+
+CONTENT_VERSION_KEY = "main:content_version"
+PAGE_KEY = "main:page"
+# Gerações por projeto (lidas sempre do cache compartilhado, ver LOCAL_BYPASS)
+PROJECT_GENERATION_PREFIX = "main:project_generation:"
+# Marca gravada no lugar do token CSRF do formulário de contato
+CSRF_PLACEHOLDER = "__csrf_token__"
+_CSRF_INPUT = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+
+
+def get_content_version():
+    """
+    Retorna a versão atual do conteúdo público do portfólio.
+
+    A versão compõe as chaves de cache da página inicial; ao ser
+    incrementada, todos os fragmentos antigos deixam de ser usados.
+    """
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        # Valor inicial baseado no relógio para não reaproveitar versões
+        # antigas caso a chave seja descartada pelo backend.
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+def invalidate_homepage_cache():
+    """Invalida de uma só vez todos os caches da página inicial."""
+    try:
+        cache.incr(CONTENT_VERSION_KEY)
+    except ValueError:
+        cache.set(CONTENT_VERSION_KEY, time.time_ns(), None)
+
+
+class ContentVersionCacheMiddleware(CacheMiddleware):
+    """``CacheMiddleware`` com a versão do conteúdo no prefixo das chaves."""
+
+    @property
+    def key_prefix(self):
+        return f"{self._key_prefix}v{get_content_version()}"
+
+    @key_prefix.setter
+    def key_prefix(self, value):
+        self._key_prefix = value
+
+
+def versioned_cache_page(timeout):
+    """
+    Igual a ``cache_page``, mas invalidado junto com a página inicial: ao
+    editar o conteúdo, todos os workers passam a usar chaves novas.
+    """
+    return decorator_from_middleware_with_args(ContentVersionCacheMiddleware)(
+        page_timeout=timeout
+    )
+
+
+def get_project_generation(project_id):
+    """
+    Geração do conteúdo de um projeto, usada na chave do fragmento da
+    página do projeto; muda apenas quando o projeto ou suas habilidades
+    mudam.
+    """
+    key = f"{PROJECT_GENERATION_PREFIX}{project_id}"
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate_project(project_id):
+    key = f"{PROJECT_GENERATION_PREFIX}{project_id}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _page_key(request, name, version):
+    return f"{PAGE_KEY}:{request.get_host()}:{name}:v{version}"
+
+
+def _page_cacheable(request):
+    # Mensagens pendentes (ex.: erro no formulário) só aparecem uma vez
+    return request.method == "GET" and not len(messages.get_messages(request))
+
+
+def get_cached_page(request, name, version):
+    """
+    Página pública ``name`` (ex.: ``"index"``, ``"project:<slug>"``) da
+    versão ``version``, já minificada, com o token CSRF da requisição.
+    ``None`` se não estiver em cache.
+    """
+    if not _page_cacheable(request):
+        return None
+    html = cache.get(_page_key(request, name, version))
+    if html is None:
+        return None
+    response = HttpResponse(html.replace(CSRF_PLACEHOLDER, get_token(request), 1))
+    response.html_minified = settings.HTML_MINIFY
+    return response
+
+
+def cache_page_response(request, name, version, response):
+    """
+    Minifica e guarda a página renderizada, trocando o token CSRF (único
+    dado das páginas públicas que varia por visitante) pela marca.
+    """
+    if response.status_code != 200 or not _page_cacheable(request):
+        return response
+    if settings.HTML_MINIFY:
+        minify_response(response)
+    html = _CSRF_INPUT.sub(
+        rf"\g<1>{CSRF_PLACEHOLDER}\g<2>", response.content.decode(response.charset), 1
+    )
+    cache.set(_page_key(request, name, version), html, settings.PAGE_CACHE_TIMEOUT)
+    return response
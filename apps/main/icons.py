@@ -0,0 +1,132 @@
+"""
+Sprite SVG dos ícones cadastrados no admin.
+
+Os ícones de ``Skill``, ``InfoItem`` e ``SocialLink`` são SVGs colados
+pelo autor. Cada um é normalizado e vira um ``<symbol>`` identificado pelo
+hash do conteúdo, de modo que ícones repetidos entram uma única vez no
+sprite e a página só referencia ``<use href="sprite#id">``. O sprite é
+montado uma vez por versão do conteúdo e servido com cache longo, já que
+a URL leva o hash de todos os símbolos.
+"""
+import hashlib
+import re
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.html import escape
+
+from .cache import get_content_version
+from .models import InfoItem, Skill, SocialLink
+
+SPRITE_KEY = "main:icons"
+SPRITE_TIMEOUT = 60 * 60 * 24
+SYMBOL_PREFIX = "i-"
+
+_SVG = re.compile(r"^\s*<svg\b([^>]*)>(.*)</svg>\s*$", re.IGNORECASE | re.DOTALL)
+_ATTRIBUTE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_BETWEEN_TAGS = re.compile(r">\s+<")
+# Atributos que ficam no <svg> de cada uso, não no símbolo compartilhado
+_USE_ATTRIBUTES = {"class", "width", "height", "style"}
+_IGNORED_ATTRIBUTES = {"xmlns", "xmlns:xlink", "id", "version"}
+
+
+def parse(markup):
+    """
+    Separa um SVG em ``(atributos do símbolo, atributos do uso, conteúdo)``.
+
+    Retorna ``None`` se o ícone não for um único elemento ``<svg>`` (ex.:
+    uma classe CSS ou um ``<i>``), caso em que é usado como está.
+    """
+    match = _SVG.match(markup or "")
+    if match is None:
+        return None
+    simbolo, uso = {}, {}
+    for nome, aspas_duplas, aspas_simples in _ATTRIBUTE.findall(match.group(1)):
+        nome = nome.lower()
+        valor = aspas_duplas if aspas_duplas or not aspas_simples else aspas_simples
+        if nome in _IGNORED_ATTRIBUTES:
+            continue
+        (uso if nome in _USE_ATTRIBUTES else simbolo)[nome] = " ".join(valor.split())
+    conteudo = _BETWEEN_TAGS.sub("><", _COMMENT.sub("", match.group(2))).strip()
+    simbolo.setdefault("viewbox", "0 0 24 24")
+    # Com o mesmo viewBox o <svg> do uso é dimensionado como o original
+    uso["viewbox"] = simbolo["viewbox"]
+    return simbolo, uso, conteudo
+
+
+def _attributes(attrs):
+    # viewBox é o único atributo do SVG sensível a maiúsculas
+    return "".join(
+        f' {"viewBox" if nome == "viewbox" else nome}="{escape(valor)}"'
+        for nome, valor in sorted(attrs.items())
+    )
+
+
+def _symbol(attrs, conteudo):
+    corpo = f"{_attributes(attrs)}>{conteudo}"
+    icon_id = SYMBOL_PREFIX + hashlib.sha1(corpo.encode()).hexdigest()[:12]
+    return icon_id, f'<symbol id="{icon_id}"{corpo}</symbol>'
+
+
+def symbol(markup):
+    """``(id, <symbol>)`` do ícone, ou ``None`` se não for um SVG."""
+    parsed = parse(markup)
+    if parsed is None:
+        return None
+    attrs, _, conteudo = parsed
+    return _symbol(attrs, conteudo)
+
+
+def _icons():
+    # Apenas itens ativos, os mesmos que as views da página inicial exibem
+    for model in (Skill, InfoItem, SocialLink):
+        yield from (
+            model.objects.filter(is_active=True)
+            .exclude(icon__isnull=True).exclude(icon="")
+            .values_list("icon", flat=True).distinct().iterator()
+        )
+
+
+def build_sprite():
+    """Monta o sprite com um símbolo por ícone distinto: ``(hash, svg)``."""
+    simbolos = {}
+    for markup in _icons():
+        resultado = symbol(markup)
+        if resultado is not None:
+            simbolos.setdefault(*resultado)
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg">'
+        + "".join(simbolos[icon_id] for icon_id in sorted(simbolos))
+        + "</svg>"
+    )
+    return hashlib.sha1(svg.encode()).hexdigest()[:12], svg
+
+
+def get_sprite(version=None):
+    """Sprite da versão atual do conteúdo, montado uma vez por versão."""
+    version = get_content_version() if version is None else version
+    key = f"{SPRITE_KEY}:v{version}"
+    sprite = cache.get(key)
+    if sprite is None:
+        sprite = build_sprite()
+        cache.set(key, sprite, SPRITE_TIMEOUT)
+    return sprite
+
+
+def sprite_url(version=None):
+    digest, _ = get_sprite(version)
+    return reverse("icon_sprite", args=[digest])
+
+
+def render_icon(markup, url):
+    """
+    ``<svg><use></svg>`` apontando para o símbolo do ícone no sprite em
+    ``url``. Ícones que não são SVG são devolvidos sem alteração.
+    """
+    parsed = parse(markup)
+    if parsed is None:
+        return markup or ""
+    attrs, uso, conteudo = parsed
+    icon_id, _ = _symbol(attrs, conteudo)
+    return f'<svg{_attributes(uso)} aria-hidden="true"><use href="{url}#{icon_id}"></use></svg>'
@@ -0,0 +1,263 @@
+"""
+Gerador de carga assíncrono usando apenas a biblioteca padrão.
+
+Cada usuário virtual mantém uma conexão keep-alive e seus próprios cookies,
+sorteando a próxima ação de um mix ponderado de cenários.
+"""
+import asyncio
+import random
+import re
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+CSRF_INPUT = re.compile(rb'name="csrfmiddlewaretoken" value="([^"]+)"')
+ADMIN_PATHS = ("/adminmk/", "/adminmk/main/project/", "/adminmk/main/message/")
+
+# Limites (ms) do histograma de latência exibido no relatório
+HISTOGRAM_BOUNDS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class Connection:
+    """Conexão HTTP/1.1 keep-alive mínima, com reconexão automática."""
+
+    def __init__(self, host, port, timeout=10.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers=None, body=b""):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        linhas = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        linhas += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        if body:
+            linhas.append(f"Content-Length: {len(body)}")
+        self.writer.write(("\r\n".join(linhas) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            return await asyncio.wait_for(self._read_response(), self.timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _read_response(self):
+        cabecalho = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = cabecalho.decode("latin-1").split("\r\n")
+        status = int(status_line.split(" ", 2)[1])
+        headers = []
+        for linha in header_lines:
+            if ":" in linha:
+                nome, valor = linha.split(":", 1)
+                headers.append((nome.strip().lower(), valor.strip()))
+        mapa = dict(headers)
+
+        if mapa.get("transfer-encoding") == "chunked":
+            partes = []
+            while True:
+                tamanho = int((await self.reader.readline()).split(b";")[0], 16)
+                if tamanho == 0:
+                    await self.reader.readline()
+                    break
+                partes.append(await self.reader.readexactly(tamanho))
+                await self.reader.readexactly(2)
+            body = b"".join(partes)
+        elif "content-length" in mapa:
+            body = await self.reader.readexactly(int(mapa["content-length"]))
+        else:
+            body = await self.reader.read()
+            await self.close()
+
+        if mapa.get("connection", "").lower() == "close":
+            await self.close()
+        return Response(status, headers, body)
+
+
+class VirtualUser:
+    def __init__(self, host, port, cookies=None, rng=None):
+        self.connection = Connection(host, port)
+        self.cookies = dict(cookies or {})
+        self.rng = rng or random.Random()
+
+    def _headers(self, extra=None):
+        headers = {"User-Agent": "portfolio-loadgen"}
+        if self.cookies:
+            headers["Cookie"] = "; ".join(f"{k}={v}" for k, v in self.cookies.items())
+        headers.update(extra or {})
+        return headers
+
+    async def request(self, method, path, headers=None, body=b""):
+        response = await self.connection.request(method, path, self._headers(headers), body)
+        for nome, valor in response.headers:
+            if nome == "set-cookie":
+                for morsel in SimpleCookie(valor).values():
+                    self.cookies[morsel.key] = morsel.value
+        return response
+
+
+# Cenários: recebem o usuário virtual e retornam a resposta final
+async def scenario_index(user):
+    return await user.request("GET", "/")
+
+
+async def scenario_robots(user):
+    return await user.request("GET", "/robots.txt")
+
+
+async def scenario_sitemap(user):
+    return await user.request("GET", "/sitemap.xml")
+
+
+async def scenario_contact(user):
+    """Envia o formulário de contato com token CSRF válido."""
+    pagina = await user.request("GET", "/")
+    match = CSRF_INPUT.search(pagina.body)
+    if match is None:
+        return pagina
+    body = urlencode({
+        "csrfmiddlewaretoken": match.group(1).decode(),
+        "name": "Teste de carga",
+        "email": "carga@example.com",
+        "message": "Mensagem gerada pelo teste de carga.",
+    }).encode()
+    return await user.request(
+        "POST", "/", {"Content-Type": "application/x-www-form-urlencoded"}, body
+    )
+
+
+async def scenario_admin(user):
+    """Navega pelo admin (requer cookie de sessão para passar do login)."""
+    return await user.request("GET", user.rng.choice(ADMIN_PATHS))
+
+
+SCENARIOS = {
+    "index": scenario_index,
+    "robots": scenario_robots,
+    "sitemap": scenario_sitemap,
+    "contact": scenario_contact,
+    "admin": scenario_admin,
+}
+
+DEFAULT_MIX = {"index": 80, "robots": 4, "sitemap": 4, "contact": 4, "admin": 8}
+
+
+def path_scenario(path):
+    """Cenário que apenas faz GET em ``path`` (usado por benchmarks simples)."""
+    async def scenario(user):
+        return await user.request("GET", path)
+    scenario.__name__ = path
+    return scenario
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+        self.errors = {}
+        self.elapsed = 0.0
+
+    def record(self, name, latency, status=None, error=None):
+        if error is not None:
+            self.errors.setdefault(name, {}).setdefault(error, 0)
+            self.errors[name][error] += 1
+            return
+        self.latencies.setdefault(name, []).append(latency)
+        contagem = self.statuses.setdefault(name, {})
+        contagem[status] = contagem.get(status, 0) + 1
+
+    def summary(self):
+        def percentil(ordenadas, pct):
+            return ordenadas[min(len(ordenadas) - 1, int(round(pct / 100 * (len(ordenadas) - 1))))]
+
+        linhas = {}
+        nomes = set(self.latencies) | set(self.errors)
+        for nome in sorted(nomes):
+            ordenadas = sorted(self.latencies.get(nome, []))
+            falhas = sum(self.errors.get(nome, {}).values())
+            erros_5xx = sum(c for s, c in self.statuses.get(nome, {}).items() if s >= 500)
+            total = len(ordenadas) + falhas
+            linhas[nome] = {
+                "requests": total,
+                "rps": total / self.elapsed if self.elapsed else 0.0,
+                "error_rate": (falhas + erros_5xx) / total if total else 0.0,
+                "statuses": self.statuses.get(nome, {}),
+                "errors": self.errors.get(nome, {}),
+                "p50_ms": percentil(ordenadas, 50) * 1000 if ordenadas else None,
+                "p90_ms": percentil(ordenadas, 90) * 1000 if ordenadas else None,
+                "p99_ms": percentil(ordenadas, 99) * 1000 if ordenadas else None,
+                "max_ms": ordenadas[-1] * 1000 if ordenadas else None,
+                "histogram_ms": histogram(ordenadas),
+            }
+        return linhas
+
+
+def histogram(latencias):
+    """Conta as latências (s) em cada faixa de HISTOGRAM_BOUNDS (ms)."""
+    limites = [*(f"<={b}" for b in HISTOGRAM_BOUNDS), f">{HISTOGRAM_BOUNDS[-1]}"]
+    contagens = dict.fromkeys(limites, 0)
+    for latencia in latencias:
+        ms = latencia * 1000
+        for bound, rotulo in zip(HISTOGRAM_BOUNDS, limites):
+            if ms <= bound:
+                contagens[rotulo] += 1
+                break
+        else:
+            contagens[limites[-1]] += 1
+    return contagens
+
+
+async def run(base_url, mix, concurrency, duration, seed=0, cookies=None):
+    """
+    Executa ``concurrency`` usuários virtuais por ``duration`` segundos.
+
+    ``mix`` mapeia nomes de cenário (ou funções) para pesos relativos.
+    """
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    nomes = list(mix)
+    pesos = [mix[n] for n in nomes]
+    cenarios = {n: (n if callable(n) else SCENARIOS[n]) for n in nomes}
+    stats = Stats()
+    fim = time.monotonic() + duration
+
+    async def worker(indice):
+        rng = random.Random(seed + indice)
+        user = VirtualUser(host, port, cookies, rng)
+        try:
+            while time.monotonic() < fim:
+                nome = rng.choices(nomes, pesos)[0]
+                rotulo = getattr(nome, "__name__", nome)
+                inicio = time.perf_counter()
+                try:
+                    response = await cenarios[nome](user)
+                except (
+                    OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+                    asyncio.LimitOverrunError, ValueError,
+                ) as exc:
+                    # LimitOverrunError: cabeçalho maior que o buffer do StreamReader
+                    stats.record(rotulo, None, error=type(exc).__name__)
+                    continue
+                stats.record(rotulo, time.perf_counter() - inicio, status=response.status)
+        finally:
+            await user.connection.close()
+
+    inicio = time.monotonic()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    stats.elapsed = time.monotonic() - inicio
+    return stats
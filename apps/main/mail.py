@@ -0,0 +1,238 @@
+"""
+Fila de e-mails no banco.
+
+O ``OutboxEmailBackend`` apenas grava as mensagens em ``OutboundEmail``,
+de modo que nenhuma requisição espera pelo servidor SMTP. O comando
+``send_outbox`` entrega a fila em lotes com o backend real
+(``OUTBOX_DELIVERY_BACKEND``), reutilizando a conexão e reagendando as
+falhas com espera exponencial.
+"""
+import base64
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from .models import Message, NotificationCursor, OutboundEmail
+
+DIGEST_CURSOR = "messages_digest"
+
+logger = logging.getLogger(__name__)
+
+
+def serialize(message):
+    """Converte um ``EmailMessage`` em JSON (anexos em base64)."""
+    anexos = []
+    for anexo in message.attachments:
+        if isinstance(anexo, tuple):
+            nome, conteudo, mimetype = anexo
+        else:  # MIMEBase
+            nome, conteudo, mimetype = (
+                anexo.get_filename(), anexo.get_payload(decode=True), anexo.get_content_type()
+            )
+        if isinstance(conteudo, str):
+            conteudo = conteudo.encode()
+        anexos.append([nome, base64.b64encode(conteudo).decode(), mimetype])
+    return {
+        "subject": message.subject,
+        "body": message.body,
+        "from_email": message.from_email,
+        "to": list(message.to),
+        "cc": list(message.cc),
+        "bcc": list(message.bcc),
+        "reply_to": list(message.reply_to),
+        "headers": dict(message.extra_headers),
+        "content_subtype": message.content_subtype,
+        "alternatives": [list(alt) for alt in getattr(message, "alternatives", [])],
+        "attachments": anexos,
+    }
+
+
+def deserialize(payload):
+    message = EmailMultiAlternatives(
+        subject=payload["subject"],
+        body=payload["body"],
+        from_email=payload["from_email"],
+        to=payload["to"],
+        cc=payload["cc"],
+        bcc=payload["bcc"],
+        reply_to=payload["reply_to"],
+        headers=payload["headers"],
+        alternatives=[tuple(alt) for alt in payload["alternatives"]],
+    )
+    message.content_subtype = payload["content_subtype"]
+    for nome, conteudo, mimetype in payload["attachments"]:
+        message.attach(nome, base64.b64decode(conteudo), mimetype)
+    return message
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """Backend de e-mail que enfileira as mensagens no banco."""
+
+    def send_messages(self, email_messages):
+        linhas = [
+            OutboundEmail(
+                subject=message.subject[:998],
+                recipients=", ".join(message.recipients()),
+                payload=serialize(message),
+            )
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutboundEmail.objects.bulk_create(linhas)
+        return len(linhas)
+
+
+def _backoff(attempts):
+    espera = settings.OUTBOX_RETRY_BACKOFF * 2 ** (attempts - 1)
+    return timedelta(seconds=min(espera, settings.OUTBOX_RETRY_MAX_BACKOFF))
+
+
+def _failed(email, erro, agora):
+    email.attempts += 1
+    email.last_error = str(erro)[:2000]
+    if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboundEmail.FAILED
+    else:
+        email.next_attempt = agora + _backoff(email.attempts)
+
+
+def drain(batch_size=None):
+    """
+    Entrega um lote de e-mails pendentes usando uma única conexão.
+
+    Retorna ``(enviados, falhas)``. Se a conexão não puder ser aberta, todo
+    o lote é reagendado.
+
+    O lote fica bloqueado (``SELECT ... FOR UPDATE SKIP LOCKED``) até o
+    fim do envio: workers simultâneos pegam lotes diferentes em vez de
+    reenviar os mesmos e-mails. No SQLite, sem bloqueio por linha, as
+    gravações já são serializadas pelo banco.
+    """
+    with transaction.atomic():
+        return _drain(batch_size or settings.OUTBOX_BATCH_SIZE)
+
+
+def _drain(batch_size):
+    agora = timezone.now()
+    lote = list(
+        OutboundEmail.objects.select_for_update(skip_locked=True)
+        .filter(status=OutboundEmail.PENDING, next_attempt__lte=agora)
+        .order_by("next_attempt", "id")[:batch_size]
+    )
+    if not lote:
+        return 0, 0
+
+    enviados, falhas = 0, 0
+    connection = get_connection(settings.OUTBOX_DELIVERY_BACKEND, fail_silently=False)
+    try:
+        connection.open()
+    except Exception as erro:
+        logger.warning("Falha ao conectar ao servidor de e-mail: %s", erro)
+        for email in lote:
+            _failed(email, erro, agora)
+        falhas = len(lote)
+    else:
+        try:
+            for email in lote:
+                try:
+                    connection.send_messages([deserialize(email.payload)])
+                except Exception as erro:
+                    logger.warning("Falha ao enviar o e-mail %s: %s", email.pk, erro)
+                    _failed(email, erro, agora)
+                    falhas += 1
+                else:
+                    email.status = OutboundEmail.SENT
+                    email.sent_at = timezone.now()
+                    email.attempts += 1
+                    enviados += 1
+        finally:
+            connection.close()
+
+    OutboundEmail.objects.bulk_update(
+        lote, ["status", "attempts", "next_attempt", "last_error", "sent_at"]
+    )
+    return enviados, falhas
+
+
+def notify_new_message(message):
+    """
+    Avisa o dono do portfólio sobre uma nova mensagem de contato (no modo
+    ``digest`` as mensagens são avisadas em resumos periódicos).
+    """
+    if not settings.MESSAGE_NOTIFY_TO or settings.MESSAGE_NOTIFY_MODE != "immediate":
+        return
+    corpo = (
+        f"Nome: {message.name}\n"
+        f"Email: {message.email}\n"
+        f"Enviada em: {timezone.localtime(message.created):%d/%m/%Y %H:%M}\n\n"
+        f"{message.message}"
+    )
+    # Enfileira após o commit para não notificar mensagens descartadas
+    transaction.on_commit(lambda: send_mail(
+        f"Nova mensagem de {message.name}",
+        corpo,
+        None,
+        settings.MESSAGE_NOTIFY_TO,
+    ))
+
+
+@transaction.atomic
+def send_message_digest(force=False):
+    """
+    Envia um resumo das mensagens recebidas desde o último resumo.
+
+    A marca d'água guarda o maior ``id`` já resumido, então cada execução
+    é uma consulta por intervalo na chave primária; só quando o resumo é
+    truncado em ``MESSAGE_DIGEST_MAX_ITEMS`` uma segunda consulta conta o
+    restante. Na primeira execução o cursor parte da última mensagem
+    existente. Retorna o número de mensagens resumidas.
+    """
+    if not settings.MESSAGE_NOTIFY_TO:
+        return 0
+    agora = timezone.now()
+    cursor = NotificationCursor.objects.select_for_update().filter(name=DIGEST_CURSOR).first()
+    if cursor is None:
+        ultimo = Message.objects.aggregate(ultimo=Max("id"))["ultimo"] or 0
+        NotificationCursor.objects.create(name=DIGEST_CURSOR, last_id=ultimo, last_sent=agora)
+        return 0
+    intervalo = timedelta(seconds=settings.MESSAGE_DIGEST_INTERVAL)
+    if not force and cursor.last_sent and agora - cursor.last_sent < intervalo:
+        return 0
+
+    limite = settings.MESSAGE_DIGEST_MAX_ITEMS
+    novas = list(
+        Message.objects.filter(id__gt=cursor.last_id).order_by("id")
+        .values("id", "name", "email", "message", "created")[:limite]
+    )
+    if not novas:
+        return 0
+    total, ultimo = len(novas), novas[-1]["id"]
+    if total == limite:
+        restante = Message.objects.filter(id__gt=cursor.last_id).aggregate(
+            total=Count("id"), ultimo=Max("id")
+        )
+        total, ultimo = restante["total"], restante["ultimo"]
+
+    linhas = [
+        f"{timezone.localtime(m['created']):%d/%m %H:%M} - {m['name']} <{m['email']}>\n"
+        f"    {(m['message'] or '')[:200]}"
+        for m in novas
+    ]
+    if total > len(novas):
+        linhas.append(f"... e mais {total - len(novas)} mensagem(ns) no painel.")
+    send_mail(
+        f"{total} nova(s) mensagem(ns) no portfólio",
+        "\n\n".join(linhas),
+        None,
+        settings.MESSAGE_NOTIFY_TO,
+    )
+    cursor.last_id = ultimo
+    cursor.last_sent = agora
+    cursor.save(update_fields=["last_id", "last_sent"])
+    return total
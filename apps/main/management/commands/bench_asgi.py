@@ -0,0 +1,97 @@
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.main import loadgen
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=20):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"Servidor não respondeu na porta {port}.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara requisições por segundo e latência p99 da página inicial "
+        "servida via ASGI (uvicorn, view assíncrona) e via WSGI (gunicorn)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/", help="Caminho requisitado (padrão: /).")
+        parser.add_argument("--duration", type=float, default=10.0, help="Segundos de carga por servidor.")
+        parser.add_argument("--concurrency", type=int, default=16, help="Conexões simultâneas.")
+        parser.add_argument("--workers", type=int, default=1, help="Processos de cada servidor.")
+        parser.add_argument("--warmup", type=float, default=2.0, help="Segundos de aquecimento antes da medição.")
+
+    def handle(self, *args, **options):
+        alvos = {
+            "asgi": [
+                "uvicorn", "core.asgi:application",
+                "--workers", str(options["workers"]), "--log-level", "warning",
+                "--host", "127.0.0.1", "--port", "{port}",
+            ],
+            "wsgi": [
+                "gunicorn", "core.wsgi:application",
+                "--workers", str(options["workers"]), "--log-level", "warning",
+                "--bind", "127.0.0.1:{port}",
+            ],
+        }
+        for comando in alvos.values():
+            if shutil.which(comando[0]) is None:
+                raise CommandError(f"'{comando[0]}' não está instalado neste ambiente.")
+
+        resultados = {}
+        for nome, comando in alvos.items():
+            port = _free_port()
+            env = {**os.environ, "ASYNC_INDEX": "True" if nome == "asgi" else "False"}
+            processo = subprocess.Popen(
+                [c.format(port=port) for c in comando],
+                cwd=settings.BASE_DIR, env=env,
+                stdout=subprocess.DEVNULL, stderr=sys.stderr,
+            )
+            url = f"http://127.0.0.1:{port}"
+            mix = {loadgen.path_scenario(options["path"]): 1}
+            try:
+                _wait_for_port(port)
+                asyncio.run(loadgen.run(url, mix, options["concurrency"], options["warmup"]))
+                stats = asyncio.run(
+                    loadgen.run(url, mix, options["concurrency"], options["duration"])
+                )
+            finally:
+                processo.terminate()
+                processo.wait(timeout=10)
+
+            resumo = stats.summary().get(options["path"])
+            if not resumo or resumo["p50_ms"] is None:
+                raise CommandError(f"Nenhuma requisição concluída em {nome}.")
+            resultados[nome] = {
+                "rps": resumo["rps"],
+                "p50": resumo["p50_ms"],
+                "p99": resumo["p99_ms"],
+                "erros": resumo["requests"] - resumo["statuses"].get(200, 0),
+            }
+
+        self.stdout.write(f"{'servidor':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'erros':>8}")
+        for nome, r in resultados.items():
+            self.stdout.write(
+                f"{nome:<10}{r['rps']:>10.1f}{r['p50']:>10.2f}{r['p99']:>10.2f}{r['erros']:>8}"
+            )
@@ -0,0 +1,180 @@
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import django
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, setup_test_environment, teardown_test_environment,
+)
+
+from apps.accounts.models import User
+from apps.main import analytics
+from apps.main.synthetic import generate_content
+from core.cache import isolated_caches
+
+# Métricas comparadas entre execuções (maior é pior)
+COMPARED = ("p50_ms", "p99_ms", "queries", "alloc_kb")
+
+
+def _percentile(amostras, pct):
+    ordenadas = sorted(amostras)
+    indice = min(len(ordenadas) - 1, int(round(pct / 100 * (len(ordenadas) - 1))))
+    return ordenadas[indice]
+
+
+def _clear_caches():
+    # Só é chamado dentro de isolated_caches(), nunca no cache do site
+    for cache in caches.all():
+        cache.clear()
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa o benchmark das páginas públicas e do admin em um banco de "
+        "teste com conteúdo sintético e grava os resultados em JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=50)
+        parser.add_argument("--groups", type=int, default=6)
+        parser.add_argument("--skills", type=int, default=10, help="Habilidades por grupo.")
+        parser.add_argument("--messages", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--output", help="Arquivo JSON onde gravar os resultados.")
+        parser.add_argument("--compare", help="Resultados anteriores (JSON) para comparação.")
+        parser.add_argument(
+            "--threshold", type=float, default=0.2,
+            help="Piora relativa tolerada antes de sinalizar regressão (padrão: 0.2).",
+        )
+
+    def scenarios(self, admin_client, client):
+        post_data = {"name": "Bench", "email": "bench@example.com", "message": "Olá"}
+        return {
+            "index_get": (client.get, "/", {}, False),
+            "index_get_cold": (client.get, "/", {}, True),
+            "index_post": (client.post, "/", post_data, False),
+            "sitemap": (client.get, "/sitemap.xml", {}, True),
+            "admin_skillgroup_changelist": (admin_client.get, "/adminmk/main/skillgroup/", {}, False),
+            "admin_project_changelist": (admin_client.get, "/adminmk/main/project/", {}, False),
+            "admin_message_changelist": (admin_client.get, "/adminmk/main/message/", {}, False),
+        }
+
+    def measure(self, request, path, data, cold, iterations, warmup):
+        for _ in range(warmup):
+            if cold:
+                _clear_caches()
+            request(path, data)
+
+        latencias, consultas = [], []
+        for _ in range(iterations):
+            if cold:
+                _clear_caches()
+            with CaptureQueriesContext(connection) as queries:
+                inicio = time.perf_counter()
+                response = request(path, data)
+                latencias.append(time.perf_counter() - inicio)
+            if response.status_code >= 400:
+                raise CommandError(f"{path} respondeu {response.status_code}.")
+            consultas.append(len(queries))
+
+        # Alocações medidas em uma execução separada (tracemalloc distorce o tempo)
+        if cold:
+            _clear_caches()
+        tracemalloc.start()
+        request(path, data)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            "p50_ms": round(statistics.median(latencias) * 1000, 3),
+            "p90_ms": round(_percentile(latencias, 90) * 1000, 3),
+            "p99_ms": round(_percentile(latencias, 99) * 1000, 3),
+            "mean_ms": round(statistics.fmean(latencias) * 1000, 3),
+            "queries": statistics.median(consultas),
+            "alloc_kb": round(pico / 1024, 1),
+        }
+
+    def run(self, options):
+        setup_test_environment()
+        nome_original = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            generate_content(
+                projects=options["projects"], groups=options["groups"],
+                skills=options["groups"] * options["skills"], messages=options["messages"],
+                seed=options["seed"],
+            )
+            _clear_caches()
+            admin = User.objects.create_superuser("bench@example.com", "bench", username="bench")
+            admin_client = Client()
+            admin_client.force_login(admin)
+
+            resultados = {}
+            for nome, (request, path, data, cold) in self.scenarios(admin_client, Client()).items():
+                resultados[nome] = self.measure(
+                    request, path, data, cold, options["iterations"], options["warmup"]
+                )
+                self.stdout.write(f"{nome:<30} {resultados[nome]}")
+        finally:
+            # Grava as visualizações pendentes antes de descartar o banco de teste
+            analytics.flush()
+            connection.creation.destroy_test_db(nome_original, verbosity=0)
+            teardown_test_environment()
+        return resultados
+
+    def handle(self, *args, **options):
+        # Banco de teste e caches isolados: o conteúdo sintético e as
+        # limpezas dos cenários "cold" não chegam ao site
+        with isolated_caches():
+            resultados = self.run(options)
+
+        relatorio = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "params": {
+                    k: options[k]
+                    for k in ("projects", "groups", "skills", "messages", "seed", "iterations")
+                },
+            },
+            "scenarios": resultados,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as arquivo:
+                json.dump(relatorio, arquivo, indent=2)
+
+        if options["compare"]:
+            regressoes = self.compare(options["compare"], resultados, options["threshold"])
+            if regressoes:
+                sys.exit(1)
+
+    def compare(self, caminho, resultados, threshold):
+        with open(caminho) as arquivo:
+            anteriores = json.load(arquivo)["scenarios"]
+        regressoes = []
+        for nome, atual in resultados.items():
+            anterior = anteriores.get(nome)
+            if anterior is None:
+                continue
+            for metrica in COMPARED:
+                antes, depois = anterior.get(metrica), atual[metrica]
+                if antes is not None and depois > antes * (1 + threshold):
+                    regressoes.append(f"{nome}.{metrica}: {antes} -> {depois}")
+        if regressoes:
+            self.stdout.write(self.style.ERROR("Regressões detectadas:"))
+            for linha in regressoes:
+                self.stdout.write(self.style.ERROR(f"  {linha}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Nenhuma regressão acima do limite."))
+        return regressoes
@@ -0,0 +1,100 @@
+import os
+import re
+import resource
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# Inicialização de um worker: setup, aplicação WSGI, URLconf raiz e,
+# opcionalmente, uma requisição GET atendida sem servidor HTTP
+BOOT_SCRIPT = """
+import sys
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+application = get_wsgi_application()
+get_resolver().url_patterns
+path = sys.argv[1]
+if path:
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "SERVER_NAME": "127.0.0.1",
+        "SERVER_PORT": "80", "wsgi.url_scheme": "http", "wsgi.input": sys.stdin.buffer,
+    }
+    status = []
+    application(environ, lambda s, h, exc_info=None: status.append(s))
+    print(status[0], file=sys.stderr)
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o custo de importação na inicialização de um worker "
+        "(python -X importtime) agrupado por app e por pacote."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path", default="",
+            help="Atende também um GET neste caminho (ex.: /) após a inicialização.",
+        )
+        parser.add_argument("--limit", type=int, default=15, help="Linhas de cada tabela.")
+
+    def group(self, module, apps):
+        for app in apps:
+            if module == app or module.startswith(app + "."):
+                return app
+        return module.split(".")[0]
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ["DJANGO_SETTINGS_MODULE"]}
+        processo = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT, options["path"]],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if processo.returncode != 0:
+            raise CommandError(processo.stderr.strip().splitlines()[-1])
+        rss_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+        # Apps mais específicos primeiro (two_factor.plugins.email antes de two_factor)
+        apps = sorted(
+            (app.split(".apps.")[0] for app in settings.INSTALLED_APPS),
+            key=len, reverse=True,
+        )
+        por_grupo = defaultdict(lambda: [0, 0])
+        modulos = []
+        status = None
+        for linha in processo.stderr.splitlines():
+            match = IMPORT_LINE.match(linha)
+            if match is None:
+                if linha[:1].isdigit():
+                    status = linha
+                continue
+            proprio, acumulado, _, modulo = match.groups()
+            grupo = por_grupo[self.group(modulo, apps)]
+            grupo[0] += int(proprio)
+            grupo[1] += 1
+            modulos.append((int(acumulado), modulo))
+
+        total = sum(proprio for proprio, _ in por_grupo.values())
+        self.stdout.write(f"{'app / pacote':<40}{'módulos':>10}{'ms':>10}{'%':>8}")
+        for nome, (proprio, quantidade) in sorted(
+            por_grupo.items(), key=lambda item: item[1][0], reverse=True
+        )[: options["limit"]]:
+            self.stdout.write(
+                f"{nome:<40}{quantidade:>10}{proprio / 1000:>10.1f}{proprio * 100 / total:>8.1f}"
+            )
+        self.stdout.write("")
+        self.stdout.write(f"{'módulo (acumulado)':<50}{'ms':>10}")
+        for acumulado, modulo in sorted(modulos, reverse=True)[: options["limit"]]:
+            self.stdout.write(f"{modulo:<50}{acumulado / 1000:>10.1f}")
+        self.stdout.write("")
+        self.stdout.write(
+            f"{len(modulos)} módulos, {total / 1000:.1f} ms de importação, "
+            f"pico de memória {rss_kb / 1024:.1f} MB"
+        )
+        if status:
+            self.stdout.write(f"GET {options['path']}: {status}")
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.main import loadgen
+
+
+def _parse_mix(valor):
+    mix = {}
+    for parte in valor.split(","):
+        nome, _, peso = parte.partition("=")
+        if nome not in loadgen.SCENARIOS:
+            raise CommandError(f"Cenário desconhecido: {nome}. Opções: {', '.join(loadgen.SCENARIOS)}.")
+        mix[nome] = float(peso or 1)
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera tráfego realista contra um servidor já iniciado e reporta vazão, "
+        "histogramas de latência e taxa de erros. Atenção: o cenário 'contact' "
+        "grava mensagens no banco do servidor alvo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Servidor alvo.")
+        parser.add_argument("--duration", type=float, default=30.0, help="Segundos por etapa.")
+        parser.add_argument(
+            "--concurrency", default="10",
+            help="Usuários virtuais; aceita uma lista (ex.: 5,10,20,40) para medir etapas crescentes.",
+        )
+        parser.add_argument(
+            "--mix", default=",".join(f"{k}={v}" for k, v in loadgen.DEFAULT_MIX.items()),
+            help="Pesos dos cenários (padrão: %(default)s).",
+        )
+        parser.add_argument("--admin-session", help="Valor do cookie sessionid de um admin logado.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--json", dest="json_output", help="Grava o relatório completo em JSON.")
+
+    def handle(self, *args, **options):
+        mix = _parse_mix(options["mix"])
+        cookies = {"sessionid": options["admin_session"]} if options["admin_session"] else None
+        etapas = [int(c) for c in options["concurrency"].split(",")]
+
+        relatorio = []
+        for concurrency in etapas:
+            stats = asyncio.run(loadgen.run(
+                options["url"], mix, concurrency, options["duration"], options["seed"], cookies
+            ))
+            resumo = stats.summary()
+            relatorio.append({"concurrency": concurrency, "elapsed": stats.elapsed, "scenarios": resumo})
+            self.print_stage(concurrency, stats, resumo)
+
+        if options["json_output"]:
+            with open(options["json_output"], "w") as arquivo:
+                json.dump(relatorio, arquivo, indent=2, default=str)
+
+    def print_stage(self, concurrency, stats, resumo):
+        total = sum(linha["requests"] for linha in resumo.values())
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"\n{concurrency} usuários: {total} requisições em {stats.elapsed:.1f}s "
+            f"({total / stats.elapsed:.1f} req/s)"
+        ))
+        self.stdout.write(
+            f"{'cenário':<10}{'req':>8}{'req/s':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'erros':>8}"
+        )
+        for nome, linha in resumo.items():
+            def ms(valor):
+                return f"{valor:.1f}" if valor is not None else "-"
+            self.stdout.write(
+                f"{nome:<10}{linha['requests']:>8}{linha['rps']:>9.1f}"
+                f"{ms(linha['p50_ms']):>9}{ms(linha['p90_ms']):>9}{ms(linha['p99_ms']):>9}"
+                f"{ms(linha['max_ms']):>9}{linha['error_rate']:>8.1%}"
+            )
+        for nome, linha in resumo.items():
+            self.stdout.write(f"  {nome}: status {linha['statuses']} falhas {linha['errors']}")
+            barras = " ".join(f"{faixa}ms:{n}" for faixa, n in linha["histogram_ms"].items() if n)
+            self.stdout.write(f"    {barras}")
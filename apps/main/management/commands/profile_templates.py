@@ -0,0 +1,71 @@
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import (
+    override_settings, setup_test_environment, teardown_test_environment,
+)
+
+from core import template_profiling
+from core.cache import isolated_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Renderiza uma página N vezes com o conteúdo atual do banco e mostra "
+        "o tempo acumulado por template e por {% include %}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/", help="Página renderizada (padrão: /).")
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--cold", action="store_true",
+            help=(
+                "Limpa os caches antes de cada renderização (sem fragmentos em cache). "
+                "Os caches são sempre isolados dos usados pelo site."
+            ),
+        )
+        parser.add_argument("--limit", type=int, default=20, help="Linhas de cada tabela.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        template_profiling.install()
+        # As renderizações do perfil não devem entrar nas estatísticas de
+        # acesso, nem ler ou limpar o cache do site
+        with override_settings(ANALYTICS_EXCLUDED_PREFIXES=["/"]), isolated_caches():
+            client = Client()
+            try:
+                for _ in range(options["warmup"]):
+                    self.request(client, options)
+                with template_profiling.profile() as profile:
+                    for _ in range(options["iterations"]):
+                        self.request(client, options)
+            finally:
+                teardown_test_environment()
+
+        iteracoes = options["iterations"]
+        self.stdout.write(
+            f"{'template':<45}{'chamadas':>10}{'total ms':>12}{'próprio ms':>12}{'ms/render':>12}"
+        )
+        for nome, (chamadas, total, proprio) in profile.rows(options["limit"]):
+            self.stdout.write(
+                f"{nome:<45}{chamadas:>10}{total * 1000:>12.2f}"
+                f"{proprio * 1000:>12.2f}{proprio * 1000 / iteracoes:>12.3f}"
+            )
+        self.stdout.write("")
+        self.stdout.write(f"{'include':<65}{'chamadas':>10}{'total ms':>12}{'ms/render':>12}")
+        for (origem, incluido), (chamadas, total) in profile.include_rows(options["limit"]):
+            self.stdout.write(
+                f"{f'{origem} -> {incluido}':<65}{chamadas:>10}"
+                f"{total * 1000:>12.2f}{total * 1000 / iteracoes:>12.3f}"
+            )
+
+    def request(self, client, options):
+        if options["cold"]:
+            # Caches de isolated_caches(), não os do site
+            for cache in caches.all():
+                cache.clear()
+        response = client.get(options["path"])
+        if response.status_code != 200:
+            raise CommandError(f"{options['path']} respondeu {response.status_code}.")
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.main.cache import invalidate_homepage_cache
+from apps.main.skill_index import invalidate_index
+from apps.main.synthetic import clear_content, generate_content
+
+
+class Command(BaseCommand):
+    help = "Popula o portfólio com conteúdo sintético para testes de carga e escala."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=100)
+        parser.add_argument("--skills", type=int, default=50, help="Total de habilidades.")
+        parser.add_argument("--groups", type=int, default=10, help="Grupos de habilidades.")
+        parser.add_argument("--messages", type=int, default=0)
+        parser.add_argument("--page-view-days", type=int, default=0, help="Dias de visualizações agregadas.")
+        parser.add_argument("--seed", type=int, default=0, help="Semente do gerador (padrão: 0).")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Linhas por bulk_create.")
+        parser.add_argument("--clear", action="store_true", help="Apaga o conteúdo existente antes.")
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        if options["clear"]:
+            # Com o índice desatualizado as exclusões não o atualizam uma a uma
+            invalidate_index()
+            clear_content()
+        generate_content(
+            projects=options["projects"],
+            skills=options["skills"],
+            groups=options["groups"],
+            messages=options["messages"],
+            page_view_days=options["page_view_days"],
+            seed=options["seed"],
+            chunk_size=options["chunk_size"],
+        )
+        # bulk_create não dispara sinais: invalida o cache uma única vez
+        invalidate_homepage_cache()
+        invalidate_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"Conteúdo gerado em {time.perf_counter() - inicio:.1f}s."
+        ))
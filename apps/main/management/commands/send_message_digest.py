@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.main.mail import send_message_digest
+
+
+class Command(BaseCommand):
+    help = (
+        "Enfileira o resumo das novas mensagens de contato, se o intervalo "
+        "MESSAGE_DIGEST_INTERVAL já passou desde o último resumo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Ignora o intervalo.")
+
+    def handle(self, *args, **options):
+        total = send_message_digest(force=options["force"])
+        self.stdout.write(f"{total} mensagem(ns) resumida(s).")
@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.main.mail import drain, send_message_digest
+
+
+class Command(BaseCommand):
+    help = (
+        "Entrega os e-mails da fila (OutboundEmail) em lotes. Com --loop, "
+        "continua drenando a fila até ser interrompido (use um único worker) "
+        "e, no modo digest, enfileira os resumos de mensagens."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Executa continuamente.")
+        parser.add_argument(
+            "--interval", type=float, default=5.0,
+            help="Espera (s) entre verificações quando a fila está vazia.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            if options["loop"] and settings.MESSAGE_NOTIFY_MODE == "digest":
+                send_message_digest()
+            enviados, falhas = drain(options["batch_size"])
+            if enviados or falhas:
+                self.stdout.write(f"{enviados} enviados, {falhas} falhas.")
+            # Lote cheio: provavelmente há mais e-mails esperando
+            if enviados + falhas >= options["batch_size"]:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,91 @@
+import asyncio
+import random
+from email import message_from_bytes, policy
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Servidor SMTP local que apenas grava as mensagens recebidas, para "
+        "testar o envio da fila sem um servidor de e-mail real."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=1025)
+        parser.add_argument("--output", help="Diretório onde gravar cada mensagem (.eml).")
+        parser.add_argument(
+            "--fail-rate", type=float, default=0.0,
+            help="Fração de mensagens recusadas com erro temporário (451).",
+        )
+        parser.add_argument("--delay", type=float, default=0.0, help="Latência (s) por mensagem.")
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.received = 0
+        if options["output"]:
+            Path(options["output"]).mkdir(parents=True, exist_ok=True)
+        self.stdout.write(f"SMTP escutando em {options['host']}:{options['port']}")
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"{self.received} mensagens recebidas.")
+
+    async def serve(self):
+        server = await asyncio.start_server(self.session, self.options["host"], self.options["port"])
+        async with server:
+            await server.serve_forever()
+
+    async def session(self, reader, writer):
+        def reply(linha):
+            writer.write(f"{linha}\r\n".encode())
+
+        reply("220 smtp_sink pronto")
+        remetente, destinatarios = None, []
+        while line := await reader.readline():
+            comando = line.decode("latin-1").strip()
+            verbo = comando[:4].upper()
+            if verbo in ("HELO", "EHLO"):
+                reply("250 smtp_sink")
+            elif verbo == "MAIL":
+                remetente, destinatarios = comando[10:].strip("<> "), []
+                reply("250 OK")
+            elif verbo == "RCPT":
+                destinatarios.append(comando[8:].strip("<> "))
+                reply("250 OK")
+            elif verbo == "DATA":
+                reply("354 Fim com <CRLF>.<CRLF>")
+                await writer.drain()
+                dados = []
+                while (linha := await reader.readline()) not in (b".\r\n", b".\n", b""):
+                    dados.append(linha[1:] if linha.startswith(b"..") else linha)
+                if self.options["delay"]:
+                    await asyncio.sleep(self.options["delay"])
+                if random.random() < self.options["fail_rate"]:
+                    reply("451 Falha temporária simulada")
+                else:
+                    self.store(remetente, destinatarios, b"".join(dados))
+                    reply("250 OK")
+            elif verbo in ("RSET", "NOOP"):
+                reply("250 OK")
+            elif verbo == "QUIT":
+                reply("221 Tchau")
+                await writer.drain()
+                break
+            else:
+                reply("502 Comando não implementado")
+            await writer.drain()
+        writer.close()
+
+    def store(self, remetente, destinatarios, dados):
+        self.received += 1
+        mensagem = message_from_bytes(dados, policy=policy.default)
+        self.stdout.write(
+            f"#{self.received} {remetente} -> {', '.join(destinatarios)}: {mensagem['Subject']}"
+        )
+        if self.options["output"]:
+            caminho = Path(self.options["output"]) / f"{self.received:06d}.eml"
+            caminho.write_bytes(dados)
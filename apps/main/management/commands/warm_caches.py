@@ -0,0 +1,128 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from apps.main import api
+from apps.main.cache import get_content_version
+from apps.main.icons import get_sprite
+from apps.main.models import About, Project
+from apps.main.seo import get_seo_head
+
+# Páginas públicas cacheadas: robots e sitemap com cache_page, a página
+# inicial com os fragmentos versionados de sobre, projetos e habilidades,
+# além da lista de projetos (todas as páginas) e da página de cada projeto
+PAGES = ("index", "robots", "sitemap")
+
+
+class Command(BaseCommand):
+    help = (
+        "Renderiza e grava em cache as páginas e fragmentos públicos. "
+        "Execute após migrate e collectstatic em cada deploy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--host", action="append", dest="hosts",
+            help=(
+                "Host usado nas chaves do cache_page (repetível). "
+                "Padrão: todos os nomes de ALLOWED_HOSTS."
+            ),
+        )
+        parser.add_argument(
+            "--secure", action="store_true",
+            help="Requisições via HTTPS (quando o proxy repassa o esquema ao Django).",
+        )
+        parser.add_argument(
+            "--images", action="store_true",
+            help="Lê as imagens de projetos e do sobre para o cache de páginas do sistema.",
+        )
+
+    def step(self, nome, funcao, *args):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        decorrido = (time.perf_counter() - inicio) * 1000
+        self.stdout.write(f"{nome:<45}{decorrido:>10.1f} ms  {resultado}")
+        return decorrido
+
+    def handle(self, *args, **options):
+        if all(isinstance(cache, LocMemCache) for cache in caches.all()):
+            self.stderr.write(self.style.WARNING(
+                "Os caches configurados são locais a cada processo: o aquecimento "
+                "feito por este comando não é visto pelos workers."
+            ))
+        hosts = options["hosts"] or [
+            host for host in settings.ALLOWED_HOSTS if host != "*" and not host.startswith(".")
+        ]
+        if not hosts:
+            raise CommandError("Informe ao menos um --host.")
+
+        total = self.step("versão do conteúdo", get_content_version)
+        # Independentes do host: sprite de ícones, <head> de SEO e API
+        versao = get_content_version()
+        total += self.step("sprite de ícones", self.sprite, versao)
+        total += self.step("head de SEO", self.seo_head, versao)
+        for nome in (api.PORTFOLIO, *api.SECTIONS):
+            total += self.step(f"api {nome}", self.payload, nome, versao)
+        # As requisições de aquecimento não entram nas estatísticas de acesso
+        with override_settings(ANALYTICS_EXCLUDED_PREFIXES=["/"]):
+            for host in hosts:
+                client = Client(HTTP_HOST=host)
+                for path in self.paths():
+                    total += self.step(f"{host} {path}", self.fetch, client, path, options["secure"])
+        if options["images"]:
+            total += self.step("imagens", self.read_images)
+        self.stdout.write(self.style.SUCCESS(f"Caches aquecidos em {total:.1f} ms."))
+
+    def paths(self):
+        slugs = list(
+            Project.objects.filter(is_active=True)
+            .order_by("-featured", "ordering_index", "-created").values_list("slug", flat=True)
+        )
+        lista = reverse("project_list")
+        paginas = max(1, math.ceil(len(slugs) / settings.PROJECTS_PER_PAGE))
+        return [
+            *(reverse(page) for page in PAGES),
+            lista, *(f"{lista}?page={numero}" for numero in range(2, paginas + 1)),
+            *(reverse("project_detail", args=[slug]) for slug in slugs),
+        ]
+
+    def fetch(self, client, path, secure):
+        response = client.get(path, secure=secure)
+        if response.status_code != 200:
+            raise CommandError(f"{path} respondeu {response.status_code}.")
+        return f"{len(response.content)} bytes"
+
+    def sprite(self, versao):
+        digest, svg = get_sprite(versao)
+        return f"{digest} ({len(svg)} bytes)"
+
+    def seo_head(self, versao):
+        return f"{len(get_seo_head(versao))} bytes"
+
+    def payload(self, nome, versao):
+        _, corpo, comprimido = api.get_payload(nome, versao)
+        return f"{len(corpo)} bytes ({len(comprimido)} em gzip)"
+
+    def read_images(self):
+        """Lê cada imagem enviada, trazendo os arquivos para o cache do SO."""
+        arquivos = [
+            *(about.avatar for about in About.objects.filter(is_active=True).exclude(avatar="")),
+            *(project.image for project in Project.objects.filter(is_active=True).exclude(image="")),
+        ]
+        lidos, ausentes, tamanho = 0, 0, 0
+        for arquivo in arquivos:
+            if not arquivo.storage.exists(arquivo.name):
+                ausentes += 1
+                continue
+            with arquivo.storage.open(arquivo.name, "rb") as handle:
+                while bloco := handle.read(1 << 20):
+                    tamanho += len(bloco)
+            lidos += 1
+        return f"{lidos} lidas ({tamanho // 1024} KB), {ausentes} ausentes"
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_footer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageView',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255, verbose_name='Caminho')),
+                ('section', models.CharField(blank=True, default='', max_length=50, verbose_name='Seção')),
+                ('day', models.DateField(verbose_name='Dia')),
+                ('referrer_host', models.CharField(blank=True, default='', max_length=255, verbose_name='Origem')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Visualizações')),
+            ],
+            options={
+                'verbose_name': 'Visualização',
+                'verbose_name_plural': 'Visualizações',
+                'db_table': 'page_views',
+                'ordering': ['-day', '-views'],
+                'constraints': [models.UniqueConstraint(fields=('path', 'section', 'day', 'referrer_host'), name='unique_page_view_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:13
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0003_pageview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.TextField(blank=True, default='', verbose_name='Assunto')),
+                ('recipients', models.TextField(blank=True, default='', verbose_name='Destinatários')),
+                ('payload', models.JSONField(verbose_name='Conteúdo')),
+                ('status', models.CharField(choices=[('pending', 'Pendente'), ('sent', 'Enviado'), ('failed', 'Falhou')], default='pending', max_length=10, verbose_name='Status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('next_attempt', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Próxima tentativa')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='Último erro')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Enviado em')),
+            ],
+            options={
+                'verbose_name': 'E-mail na fila',
+                'verbose_name_plural': 'E-mails na fila',
+                'db_table': 'outbound_emails',
+                'ordering': ['-created'],
+                'indexes': [models.Index(fields=['status', 'next_attempt'], name='outbound_email_due')],
+            },
+        ),
+    ]
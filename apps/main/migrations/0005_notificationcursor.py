@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Nome')),
+                ('last_id', models.BigIntegerField(default=0, verbose_name='Último ID')),
+                ('last_sent', models.DateTimeField(blank=True, null=True, verbose_name='Último envio')),
+            ],
+            options={
+                'verbose_name': 'Cursor de notificação',
+                'verbose_name_plural': 'Cursores de notificação',
+                'db_table': 'notification_cursors',
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:21
+
+from django.db import migrations, models
+
+from core.utils.richtext import render_markdown
+
+# modelo -> {campo de origem: (campo renderizado, inline)}
+RENDERED_FIELDS = {
+    'hero': {'bio': ('bio_html', False)},
+    'about': {'about': ('about_html', False)},
+    'project': {'title': ('title_html', True), 'description': ('description_html', False)},
+}
+
+
+def render_existing(apps, schema_editor):
+    for model_name, campos in RENDERED_FIELDS.items():
+        model = apps.get_model('main', model_name)
+        objetos = list(model.objects.only('pk', *campos))
+        for obj in objetos:
+            for origem, (destino, inline) in campos.items():
+                setattr(obj, destino, render_markdown(getattr(obj, origem), inline=inline))
+        model.objects.bulk_update(
+            objetos, [destino for destino, _ in campos.values()], batch_size=500
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_notificationcursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='about',
+            name='about_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='hero',
+            name='bio_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='title_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AlterField(
+            model_name='about',
+            name='about',
+            field=models.TextField(blank=True, help_text='Aceita Markdown (e HTML simples, que é sanitizado).', null=True, verbose_name='Descrição'),
+        ),
+        migrations.AlterField(
+            model_name='hero',
+            name='bio',
+            field=models.TextField(blank=True, help_text='Aceita Markdown (e HTML simples, que é sanitizado).', null=True, verbose_name='Biografia'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='description',
+            field=models.TextField(blank=True, help_text='Aceita Markdown (e HTML simples, que é sanitizado).', null=True, verbose_name='Descrição'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='title',
+            field=models.CharField(blank=True, help_text='Aceita Markdown (e HTML simples, que é sanitizado).', max_length=255, null=True, verbose_name='Título'),
+        ),
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:22
+
+from django.core.files.images import get_image_dimensions
+from django.db import migrations, models
+
+# modelo -> (campo da imagem, largura, altura)
+IMAGE_FIELDS = {
+    'about': ('avatar', 'avatar_width', 'avatar_height'),
+    'project': ('image', 'image_width', 'image_height'),
+}
+
+
+def store_dimensions(apps, schema_editor):
+    """Lê as dimensões das imagens já enviadas (arquivos ausentes são ignorados)."""
+    for model_name, (campo, largura, altura) in IMAGE_FIELDS.items():
+        model = apps.get_model('main', model_name)
+        objetos = []
+        for obj in model.objects.exclude(**{campo: ''}).exclude(**{f'{campo}__isnull': True}):
+            arquivo = getattr(obj, campo)
+            if not arquivo.storage.exists(arquivo.name):
+                continue
+            with arquivo.storage.open(arquivo.name, 'rb') as handle:
+                dimensoes = get_image_dimensions(handle)
+            setattr(obj, largura, dimensoes[0])
+            setattr(obj, altura, dimensoes[1])
+            objetos.append(obj)
+        model.objects.bulk_update(objetos, [largura, altura], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_rendered_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='about',
+            name='avatar_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='about',
+            name='avatar_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='hero',
+            name='works_for',
+            field=models.CharField(blank=True, help_text='Usada nos dados estruturados (JSON-LD) da página.', max_length=255, null=True, verbose_name='Empresa atual'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='about',
+            name='avatar',
+            field=models.ImageField(blank=True, height_field='avatar_height', null=True, upload_to='about/', verbose_name='Foto', width_field='avatar_width'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='image',
+            field=models.ImageField(blank=True, height_field='image_height', null=True, upload_to='projects/', verbose_name='Imagem', width_field='image_width'),
+        ),
+        migrations.RunPython(store_dimensions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Slug nulo e sem unicidade; preenchido em 0009 e restringido em 0010."""
+
+    dependencies = [
+        ('main', '0007_image_dimensions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='featured',
+            field=models.BooleanField(default=False, help_text='Projetos em destaque aparecem primeiro na página inicial.', verbose_name='Destaque'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=255, null=True, verbose_name='Slug'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['is_active', '-featured', 'ordering_index'], name='project_listing'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:40
+
+from django.db import migrations
+
+from core.utils.slugs import unique_slug
+
+
+def populate_slugs(apps, schema_editor):
+    Project = apps.get_model('main', 'Project')
+    usados = set()
+    projetos = list(Project.objects.order_by('pk').only('pk', 'title'))
+    for projeto in projetos:
+        projeto.slug = unique_slug(projeto.title, usados.__contains__, fallback='projeto')
+        usados.add(projeto.slug)
+    Project.objects.bulk_update(projetos, ['slug'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_project_slug'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_slugs, migrations.RunPython.noop),
+    ]
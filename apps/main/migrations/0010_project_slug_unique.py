@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_populate_project_slug'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Endereço da página do projeto; gerado a partir do título se vazio.', max_length=255, unique=True, verbose_name='Slug'),
+        ),
+    ]
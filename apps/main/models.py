@@ -1,4 +1,36 @@
 from django.db import models, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from core.utils.richtext import render_markdown
+from core.utils.slugs import unique_slug
+
+MARKDOWN_HELP = "Aceita Markdown (e HTML simples, que é sanitizado)."
+
+
+class RenderedTextMixin:
+    """
+    Renderiza campos em Markdown para colunas ``*_html`` ao salvar.
+
+    ``rendered_fields`` mapeia o campo de origem para ``(campo renderizado,
+    inline)``; os templates leem só as colunas renderizadas.
+    """
+    rendered_fields = {}
+
+    def render_text_fields(self):
+        for origem, (destino, inline) in self.rendered_fields.items():
+            setattr(self, destino, render_markdown(getattr(self, origem), inline=inline))
+
+    def save(self, *args, **kwargs):
+        self.render_text_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *(
+                destino for origem, (destino, _) in self.rendered_fields.items()
+                if origem in update_fields
+            )}
+        super().save(*args, **kwargs)
+
 
 class MetaData(models.Model):
     """Armazena metadados para SEO das páginas"""
@@ -17,16 +49,23 @@ class MetaData(models.Model):
         return self.title or "Metadado sem título"
 
 
-class Hero(models.Model):
+class Hero(RenderedTextMixin, models.Model):
     """Seção principal do portfólio"""
     greeting = models.CharField(
         "Saudação", max_length=255, default="Olá, meu nome é", null=True, blank=True
     )
     full_name = models.CharField("Nome completo", max_length=255, null=True, blank=True)
     title = models.CharField("Título profissional", max_length=255, null=True, blank=True)
-    bio = models.TextField("Biografia", null=True, blank=True)
+    bio = models.TextField("Biografia", null=True, blank=True, help_text=MARKDOWN_HELP)
+    bio_html = models.TextField(blank=True, default="", editable=False)
+    works_for = models.CharField(
+        "Empresa atual", max_length=255, null=True, blank=True,
+        help_text="Usada nos dados estruturados (JSON-LD) da página.",
+    )
     is_active = models.BooleanField(default=True)
 
+    rendered_fields = {"bio": ("bio_html", False)}
+
     class Meta:
         verbose_name = "Hero"
         verbose_name_plural = "Hero"
@@ -44,12 +83,20 @@ class Hero(models.Model):
         return f"{self.full_name or 'Sem nome'} - {self.title or ''}"
 
 
-class About(models.Model):
+class About(RenderedTextMixin, models.Model):
     """Seção 'Sobre mim'"""
-    about = models.TextField("Descrição", null=True, blank=True)
-    avatar = models.ImageField("Foto", upload_to="about/", null=True, blank=True)
+    about = models.TextField("Descrição", null=True, blank=True, help_text=MARKDOWN_HELP)
+    about_html = models.TextField(blank=True, default="", editable=False)
+    avatar = models.ImageField(
+        "Foto", upload_to="about/", null=True, blank=True,
+        width_field="avatar_width", height_field="avatar_height",
+    )
+    avatar_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    avatar_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
 
+    rendered_fields = {"about": ("about_html", False)}
+
     class Meta:
         verbose_name = "Sobre"
         verbose_name_plural = "Sobre"
@@ -67,23 +114,60 @@ class About(models.Model):
         return (self.about[:30] + "...") if self.about else "Sem descrição"
 
 
-class Project(models.Model):
+class Project(RenderedTextMixin, models.Model):
     """Projetos do portfólio"""
-    title = models.CharField("Título", max_length=255, null=True, blank=True)
-    description = models.TextField("Descrição", null=True, blank=True)
-    image = models.ImageField("Imagem", upload_to="projects/", null=True, blank=True)
+    title = models.CharField("Título", max_length=255, null=True, blank=True, help_text=MARKDOWN_HELP)
+    title_html = models.TextField(blank=True, default="", editable=False)
+    slug = models.SlugField(
+        "Slug", max_length=255, unique=True, blank=True,
+        help_text="Endereço da página do projeto; gerado a partir do título se vazio.",
+    )
+    description = models.TextField("Descrição", null=True, blank=True, help_text=MARKDOWN_HELP)
+    description_html = models.TextField(blank=True, default="", editable=False)
+    image = models.ImageField(
+        "Imagem", upload_to="projects/", null=True, blank=True,
+        width_field="image_width", height_field="image_height",
+    )
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
     demo_url = models.URLField("URL da demonstração", null=True, blank=True)
     source_url = models.URLField("Código-fonte", default="https://github.com/", null=True, blank=True)
     skill = models.ManyToManyField("Skill", blank=True)
     is_active = models.BooleanField(default=True)
+    featured = models.BooleanField(
+        "Destaque", default=False, help_text="Projetos em destaque aparecem primeiro na página inicial."
+    )
     ordering_index = models.IntegerField("Ordem de exibição", null=True, blank=True)
     created = models.DateTimeField("Data de criação", auto_now_add=True, null=True, blank=True)
 
+    rendered_fields = {
+        "title": ("title_html", True),
+        "description": ("description_html", False),
+    }
+
     class Meta:
         ordering = ["ordering_index", "-created"]
         verbose_name = "Projeto"
         verbose_name_plural = "Projetos"
         db_table = "projects"
+        indexes = [
+            # Listagem da página inicial (destaques primeiro) e de /projects/
+            models.Index(fields=["is_active", "-featured", "ordering_index"], name="project_listing"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            self.slug = unique_slug(
+                self.title,
+                lambda slug: Project.objects.filter(slug=slug).exclude(pk=self.pk).exists(),
+                fallback="projeto",
+            )
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "slug"}
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return reverse("project_detail", args=[self.slug])
 
     def __str__(self):
         return self.title or "Projeto sem título"
@@ -230,3 +314,77 @@ class Footer(models.Model):
 
     def __str__(self):
         return self.copyright_text or "Rodapé sem texto"
+
+
+class PageView(models.Model):
+    """Visualizações agregadas por página, seção, dia e origem"""
+    path = models.CharField("Caminho", max_length=255)
+    section = models.CharField("Seção", max_length=50, blank=True, default="")
+    day = models.DateField("Dia")
+    referrer_host = models.CharField("Origem", max_length=255, blank=True, default="")
+    views = models.PositiveIntegerField("Visualizações", default=0)
+
+    class Meta:
+        verbose_name = "Visualização"
+        verbose_name_plural = "Visualizações"
+        ordering = ["-day", "-views"]
+        db_table = "page_views"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["path", "section", "day", "referrer_host"],
+                name="unique_page_view_bucket",
+            ),
+        ]
+
+    def __str__(self):
+        alvo = f"{self.path}#{self.section}" if self.section else self.path
+        return f"{alvo} ({self.day}): {self.views}"
+
+
+class OutboundEmail(models.Model):
+    """E-mails aguardando envio pelo worker da fila (``send_outbox``)"""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "Pendente"),
+        (SENT, "Enviado"),
+        (FAILED, "Falhou"),
+    )
+
+    subject = models.TextField("Assunto", blank=True, default="")
+    recipients = models.TextField("Destinatários", blank=True, default="")
+    payload = models.JSONField("Conteúdo")
+    status = models.CharField("Status", max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField("Tentativas", default=0)
+    next_attempt = models.DateTimeField("Próxima tentativa", default=timezone.now)
+    last_error = models.TextField("Último erro", blank=True, default="")
+    created = models.DateTimeField("Criado em", auto_now_add=True)
+    sent_at = models.DateTimeField("Enviado em", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "E-mail na fila"
+        verbose_name_plural = "E-mails na fila"
+        ordering = ["-created"]
+        db_table = "outbound_emails"
+        indexes = [
+            models.Index(fields=["status", "next_attempt"], name="outbound_email_due"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {self.recipients}"
+
+
+class NotificationCursor(models.Model):
+    """Última mensagem incluída em um resumo enviado (marca d'água)"""
+    name = models.CharField("Nome", max_length=50, unique=True)
+    last_id = models.BigIntegerField("Último ID", default=0)
+    last_sent = models.DateTimeField("Último envio", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Cursor de notificação"
+        verbose_name_plural = "Cursores de notificação"
+        db_table = "notification_cursors"
+
+    def __str__(self):
+        return f"{self.name}: {self.last_id}"
@@ -0,0 +1,137 @@
+"""
+Metadados estruturados da página inicial.
+
+JSON-LD (schema.org) e Open Graph são gerados a partir de ``Hero``,
+``MetaData``, ``SocialLink``, da foto do ``About`` e das imagens dos
+projetos, com as dimensões gravadas no upload. O trecho do ``<head>`` é
+renderizado uma vez por versão do conteúdo e guardado em cache.
+"""
+import html
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+from django.utils.safestring import mark_safe
+
+from .cache import get_content_version
+from .models import About, Hero, MetaData, Project, SocialLink
+
+SEO_KEY = "main:seo"
+SEO_TIMEOUT = 60 * 60 * 24
+# Projetos listados no JSON-LD (os primeiros na ordem de exibição)
+MAX_PROJECTS = 10
+
+# Escapes para o JSON poder ficar dentro de <script>
+_SCRIPT_ESCAPES = {ord("<"): "\\u003C", ord(">"): "\\u003E", ord("&"): "\\u0026"}
+
+
+def _text(value):
+    """Texto simples a partir de um campo que pode conter HTML."""
+    return html.unescape(strip_tags(value or "")).strip()
+
+
+def absolute_url(url):
+    return url if "://" in url else f"{settings.SITE_URL}{url}"
+
+
+def _image(field, width, height, alt):
+    if not field:
+        return None
+    return {"url": absolute_url(field.url), "width": width, "height": height, "alt": alt}
+
+
+def _image_object(image):
+    dados = {"@type": "ImageObject", "url": image["url"]}
+    if image["width"] and image["height"]:
+        dados.update(width=image["width"], height=image["height"])
+    return dados
+
+
+def build_metadata():
+    """Contexto do template ``main/seo.html`` (JSON-LD já serializado)."""
+    metadata = MetaData.objects.filter(is_active=True).first()
+    hero = Hero.objects.filter(is_active=True).first()
+    about = About.objects.filter(is_active=True).first()
+    links = list(
+        SocialLink.objects.filter(is_active=True, contact__is_active=True)
+        .exclude(link__isnull=True).exclude(link="")
+        .values_list("link", flat=True)
+    )
+    projects = list(
+        Project.objects.filter(is_active=True)
+        .order_by("-featured", "ordering_index", "-created")
+        .only(
+            "slug", "title_html", "description_html", "image", "image_width", "image_height"
+        )[:MAX_PROJECTS]
+    )
+
+    url = f"{settings.SITE_URL}/"
+    nome = _text(hero.full_name) if hero else ""
+    titulo = (metadata.title if metadata else "") or nome
+    descricao = (metadata.description if metadata else "") or ""
+    avatar = about and _image(about.avatar, about.avatar_width, about.avatar_height, nome)
+    imagens = [
+        _image(project.image, project.image_width, project.image_height, _text(project.title_html))
+        for project in projects
+    ]
+    # Foto do perfil, ou a imagem do primeiro projeto que tiver uma
+    og_image = avatar or next(filter(None, imagens), None)
+
+    pessoa = {"@type": "Person", "@id": f"{url}#person", "url": url, "name": nome}
+    if hero and hero.title:
+        pessoa["jobTitle"] = _text(hero.title)
+    if hero and hero.works_for:
+        pessoa["worksFor"] = {"@type": "Organization", "name": hero.works_for}
+    if avatar:
+        pessoa["image"] = _image_object(avatar)
+    if links:
+        pessoa["sameAs"] = links
+
+    grafo = [
+        {
+            "@type": "WebSite", "@id": f"{url}#website", "url": url, "name": titulo,
+            "description": descricao, "inLanguage": "pt-BR",
+            "author": {"@id": f"{url}#person"},
+        },
+        pessoa,
+    ]
+    if projects:
+        itens = []
+        for posicao, (project, imagem) in enumerate(zip(projects, imagens), start=1):
+            trabalho = {
+                "@type": "CreativeWork",
+                "name": _text(project.title_html),
+                "description": _text(project.description_html),
+                "author": {"@id": f"{url}#person"},
+            }
+            trabalho["url"] = absolute_url(project.get_absolute_url())
+            if imagem:
+                trabalho["image"] = _image_object(imagem)
+            itens.append({"@type": "ListItem", "position": posicao, "item": trabalho})
+        grafo.append({"@type": "ItemList", "name": "Projetos", "itemListElement": itens})
+
+    json_ld = json.dumps(
+        {"@context": "https://schema.org", "@graph": grafo},
+        ensure_ascii=False, separators=(",", ":"),
+    ).translate(_SCRIPT_ESCAPES)
+    return {
+        "url": url,
+        "title": titulo,
+        "description": descricao,
+        "site_name": nome or titulo,
+        "image": og_image,
+        "json_ld": mark_safe(json_ld),
+    }
+
+
+def get_seo_head(version=None):
+    """Trecho do ``<head>`` com Open Graph e JSON-LD, um por versão."""
+    version = get_content_version() if version is None else version
+    key = f"{SEO_KEY}:v{version}"
+    head = cache.get(key)
+    if head is None:
+        head = render_to_string("main/seo.html", build_metadata())
+        cache.set(key, str(head), SEO_TIMEOUT)
+    return mark_safe(head)
@@ -0,0 +1,114 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from .cache import invalidate_homepage_cache, invalidate_project
+from .mail import notify_new_message
+from . import skill_index
+from .models import (
+    About, Contact, Footer, Hero, InfoItem, Message, MetaData, Project,
+    Sections, Skill, SkillGroup, SocialLink,
+)
+
+# Modelos cujo conteúdo aparece na página inicial
+CONTENT_MODELS = (
+    MetaData, Hero, About, Project, SkillGroup, Skill,
+    Contact, InfoItem, SocialLink, Sections, Footer,
+)
+
+
+def content_changed(sender, **kwargs):
+    """
+    Invalida o cache da página inicial após alterações de conteúdo, só
+    depois do commit: antes dele, uma requisição renderizaria o conteúdo
+    antigo sob a versão nova.
+    """
+    transaction.on_commit(invalidate_homepage_cache)
+
+
+def _invalidate_projects_on_commit(project_ids):
+    """
+    Invalida as páginas dos projetos após o commit, pelo mesmo motivo de
+    ``content_changed``: antes dele a página seria refeita com os dados antigos.
+    """
+    project_ids = list(project_ids)
+
+    def invalidate():
+        for project_id in project_ids:
+            invalidate_project(project_id)
+
+    if project_ids:
+        transaction.on_commit(invalidate)
+
+
+def project_changed(sender, instance, **kwargs):
+    """Descarta o fragmento em cache da página do projeto"""
+    _invalidate_projects_on_commit([instance.pk])
+
+
+def project_skills_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            _invalidate_projects_on_commit([instance.pk])
+    elif action == "pre_clear":
+        # Limpeza a partir da habilidade: os projetos só são conhecidos antes
+        skill_changed(sender, instance)
+    elif action.startswith("post_") and pk_set:
+        _invalidate_projects_on_commit(pk_set)
+
+
+def project_index_changed(sender, instance, **kwargs):
+    project_id = instance.pk
+    transaction.on_commit(lambda: skill_index.refresh_project(project_id))
+
+
+def skill_links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Mantém o índice habilidade → projetos ao alterar as ligações"""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    adicionar = action == "post_add"
+    # Em post_clear pk_set é None: todas as ligações do objeto
+    pk_set = None if pk_set is None else set(pk_set)
+    if reverse:
+        skill_ids, project_ids = {instance.pk}, pk_set
+    else:
+        skill_ids, project_ids = pk_set, {instance.pk}
+    transaction.on_commit(lambda: skill_index.update_links(skill_ids, project_ids, adicionar))
+
+
+def skill_index_changed(sender, **kwargs):
+    transaction.on_commit(skill_index.invalidate_index)
+
+
+def skill_changed(sender, instance, **kwargs):
+    """Habilidades aparecem nas páginas dos projetos que as usam"""
+    if instance.pk is None:
+        return
+    # Consultados agora: no pre_delete as ligações somem antes do commit
+    _invalidate_projects_on_commit(
+        Project.skill.through.objects.filter(skill_id=instance.pk).values_list("project_id", flat=True)
+    )
+
+
+def message_created(sender, instance, created, **kwargs):
+    """Notifica o dono do portfólio sobre novas mensagens de contato"""
+    if created:
+        notify_new_message(instance)
+
+
+def connect_signals():
+    for model in CONTENT_MODELS:
+        post_save.connect(content_changed, sender=model, dispatch_uid=f"main_{model.__name__}_save")
+        post_delete.connect(content_changed, sender=model, dispatch_uid=f"main_{model.__name__}_delete")
+    m2m_changed.connect(content_changed, sender=Project.skill.through, dispatch_uid="main_project_skill")
+    post_save.connect(project_changed, sender=Project, dispatch_uid="main_project_detail_save")
+    post_delete.connect(project_changed, sender=Project, dispatch_uid="main_project_detail_delete")
+    m2m_changed.connect(project_skills_changed, sender=Project.skill.through, dispatch_uid="main_project_detail_skill")
+    post_save.connect(skill_changed, sender=Skill, dispatch_uid="main_project_detail_skill_save")
+    # Antes da exclusão, enquanto as ligações com os projetos ainda existem
+    pre_delete.connect(skill_changed, sender=Skill, dispatch_uid="main_project_detail_skill_delete")
+    post_save.connect(project_index_changed, sender=Project, dispatch_uid="main_skill_index_project_save")
+    post_delete.connect(project_index_changed, sender=Project, dispatch_uid="main_skill_index_project_delete")
+    m2m_changed.connect(skill_links_changed, sender=Project.skill.through, dispatch_uid="main_skill_index_links")
+    post_save.connect(skill_index_changed, sender=Skill, dispatch_uid="main_skill_index_skill_save")
+    post_delete.connect(skill_index_changed, sender=Skill, dispatch_uid="main_skill_index_skill_delete")
+    post_save.connect(message_created, sender=Message, dispatch_uid="main_message_created")
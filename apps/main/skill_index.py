@@ -0,0 +1,201 @@
+"""
+Índice invertido habilidade → projetos, usado no filtro ``/projects/?skill=``.
+
+Para cada habilidade ativa o índice guarda os IDs dos projetos ativos que a
+usam, já na ordem de exibição, de modo que filtrar por várias habilidades é
+uma interseção de conjuntos em memória, sem juntar a tabela do M2M a cada
+requisição. O índice é montado uma vez e depois mantido pelos sinais, após
+o commit: mudanças nas ligações (``m2m_changed``) e nos projetos atualizam
+apenas as listas afetadas; mudanças nas habilidades descartam o índice, que
+é remontado na próxima leitura.
+
+Cada alteração incrementa uma geração, gravada também no índice. Um índice
+de outra geração (uma atualização concorrente ou uma remontagem que leu o
+banco antes do commit) é descartado e remontado, em vez de servir dados
+antigos. Como é alterado no lugar, e não por versão, o índice é sempre lido
+do cache compartilhado (ver ``LOCAL_BYPASS``).
+"""
+import time
+
+from django.core.cache import cache
+from django.utils.text import slugify
+
+from .models import Project, Skill
+
+INDEX_KEY = "main:skill_index"
+GENERATION_KEY = "main:skill_index_generation"
+INDEX_TIMEOUT = 60 * 60 * 24
+# Mesma ordem de exibição da lista de projetos (índice project_listing)
+PROJECT_ORDER = ("-featured", "ordering_index", "-created")
+
+
+def _project_order():
+    return list(
+        Project.objects.filter(is_active=True).order_by(*PROJECT_ORDER).values_list("pk", flat=True)
+    )
+
+
+def _links(**filters):
+    return Project.skill.through.objects.filter(
+        project__is_active=True, skill__is_active=True, **filters
+    ).values_list("skill_id", "project_id")
+
+
+def _sort(index):
+    posicao = {project_id: i for i, project_id in enumerate(index["order"])}
+    for skill_id, projetos in index["skills"].items():
+        index["skills"][skill_id] = sorted(
+            (p for p in set(projetos) if p in posicao), key=posicao.__getitem__
+        )
+
+
+def build_index(generation):
+    """
+    Monta o índice completo da geração ``generation`` (três consultas)::
+
+        order:  IDs dos projetos ativos, na ordem de exibição
+        skills: {id da habilidade: [IDs dos projetos, na mesma ordem]}
+        titles: {id da habilidade: título}
+        slugs:  {slug: [IDs das habilidades com esse slug]}
+    """
+    index = {
+        "generation": generation, "order": _project_order(),
+        "skills": {}, "titles": {}, "slugs": {},
+    }
+    for skill_id, title in (
+        Skill.objects.filter(is_active=True).exclude(title__isnull=True).exclude(title="")
+        .values_list("pk", "title")
+    ):
+        slug = slugify(title)
+        if slug:
+            index["titles"][skill_id] = title
+            index["skills"][skill_id] = []
+            index["slugs"].setdefault(slug, []).append(skill_id)
+    for skill_id, project_id in _links():
+        if skill_id in index["skills"]:
+            index["skills"][skill_id].append(project_id)
+    _sort(index)
+    return index
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def _next_generation():
+    """Nova geração, ou ``None`` se a chave tiver sido descartada."""
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), None)
+        return None
+
+
+def get_index():
+    # A geração é lida antes das consultas: se mudar durante a montagem,
+    # o índice gravado já nasce desatualizado e é refeito na próxima leitura
+    generation = get_generation()
+    index = cache.get(INDEX_KEY)
+    if index is None or index["generation"] != generation:
+        index = build_index(generation)
+        cache.set(INDEX_KEY, index, INDEX_TIMEOUT)
+    return index
+
+
+def invalidate_index():
+    _next_generation()
+
+
+def _update(apply):
+    """
+    Aplica ``apply(index)`` ao índice em cache e grava com a nova geração.
+
+    A geração sempre avança; o índice só é atualizado se ainda estiver na
+    geração anterior, isto é, se nenhuma outra alteração aconteceu desde
+    que foi montado. Caso contrário ele fica desatualizado e é remontado.
+    """
+    index = cache.get(INDEX_KEY)
+    generation = _next_generation()
+    if index is None or generation is None or index["generation"] != generation - 1:
+        return
+    apply(index)
+    index["generation"] = generation
+    _sort(index)
+    cache.set(INDEX_KEY, index, INDEX_TIMEOUT)
+
+
+def update_links(skill_ids, project_ids, add):
+    """
+    Aplica ao índice a inclusão (``add=True``) ou remoção de ligações entre
+    ``skill_ids`` e ``project_ids``; ``None`` equivale a todos. Chamado
+    após o commit das alterações.
+    """
+    def apply(index):
+        ativos = set(index["order"])
+        for skill_id in index["skills"] if skill_ids is None else skill_ids:
+            if skill_id not in index["skills"]:
+                # Habilidade inativa ou sem título: fora do índice
+                continue
+            projetos = set(index["skills"][skill_id])
+            if add:
+                projetos |= set(project_ids) & ativos
+            elif project_ids is None:
+                projetos.clear()
+            else:
+                projetos -= set(project_ids)
+            index["skills"][skill_id] = list(projetos)
+
+    _update(apply)
+
+
+def refresh_project(project_id):
+    """
+    Atualiza o índice após salvar ou excluir um projeto: a ordem é relida
+    e, se o projeto passou a aparecer, suas habilidades são incluídas.
+    """
+    def apply(index):
+        anteriores = set(index["order"])
+        index["order"] = _project_order()
+        if project_id in index["order"] and project_id not in anteriores:
+            for skill_id, _ in _links(project_id=project_id):
+                if skill_id in index["skills"]:
+                    index["skills"][skill_id].append(project_id)
+
+    _update(apply)
+
+
+def normalize(slugs):
+    """Slugs pedidos sem repetição e em ordem, para compor a chave do cache."""
+    return sorted({slugify(slug) for slug in slugs} - {""})
+
+
+def skill_counts(index):
+    """``[(slug, título, nº de projetos)]`` das habilidades usadas em projetos."""
+    contagens = []
+    for slug, skill_ids in index["slugs"].items():
+        projetos = set().union(*(index["skills"][skill_id] for skill_id in skill_ids))
+        if projetos:
+            contagens.append((slug, index["titles"][skill_ids[0]], len(projetos)))
+    return sorted(contagens, key=lambda item: (-item[2], item[1].lower()))
+
+
+def filter_projects(index, slugs):
+    """
+    IDs dos projetos que usam todas as habilidades em ``slugs``, na ordem
+    de exibição. ``None`` se algum slug não existir.
+    """
+    conjuntos = []
+    for slug in slugs:
+        skill_ids = index["slugs"].get(slug)
+        if skill_ids is None:
+            return None
+        conjuntos.append(set().union(*(index["skills"][skill_id] for skill_id in skill_ids)))
+    if not conjuntos:
+        return list(index["order"])
+    conjuntos.sort(key=len)
+    encontrados = conjuntos[0].intersection(*conjuntos[1:])
+    return [project_id for project_id in index["order"] if project_id in encontrados]
@@ -0,0 +1,186 @@
+import random
+from datetime import timedelta
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.utils.richtext import render_markdown
+from core.utils.slugs import unique_slug
+
+from .models import (
+    About, Contact, Footer, Hero, InfoItem, Message, MetaData, PageView,
+    Project, Sections, Skill, SkillGroup, SocialLink,
+)
+
+ICON = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" fill="none" '
+    'stroke="currentColor"><circle cx="12" cy="12" r="{r}"/></svg>'
+)
+PALAVRAS = (
+    "django python api dados cache fila teste deploy web sistema portfólio "
+    "hospital integração relatório painel usuário performance consulta"
+).split()
+REFERRERS = ("", "google.com", "linkedin.com", "github.com", "t.co")
+SECTIONS = ("", "home", "about", "projects", "skills", "contact")
+
+
+def _texto(rng, palavras):
+    return " ".join(rng.choice(PALAVRAS) for _ in range(palavras)).capitalize()
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _bulk_create(model, objs, chunk_size, keep=False):
+    """Insere ``objs`` em lotes de ``chunk_size``; opcionalmente devolve os objetos."""
+    criados = []
+    for chunk in _chunks(objs, chunk_size):
+        model.objects.bulk_create(chunk, batch_size=chunk_size)
+        if keep:
+            criados.extend(chunk)
+    return criados
+
+
+def clear_content():
+    """Remove todo o conteúdo do app (exceto usuários)."""
+    for model in (
+        Project.skill.through, Project, Skill, SkillGroup, InfoItem, SocialLink,
+        Contact, MetaData, Hero, About, Sections, Footer, Message, PageView,
+    ):
+        model.objects.all().delete()
+
+
+@transaction.atomic
+def generate_content(
+    projects=10, skills=20, groups=4, messages=0, page_view_days=0,
+    seed=0, chunk_size=5000,
+):
+    """
+    Gera conteúdo sintético determinístico para testes de carga.
+
+    Cria o conteúdo único da página inicial (metadados, hero, sobre, contato,
+    seções e rodapé) se ainda não existir, ``groups`` grupos com ``skills``
+    habilidades no total, ``projects`` projetos com 1 a 6 habilidades,
+    ``messages`` mensagens e ``page_view_days`` dias de visualizações. Tudo
+    é inserido com ``bulk_create`` em lotes de ``chunk_size``.
+    """
+    rng = random.Random(seed)
+
+    if not MetaData.objects.filter(is_active=True).exists():
+        MetaData.objects.create(title="Portfólio", description=_texto(rng, 20), keywords="django, python")
+    if not Hero.objects.filter(is_active=True).exists():
+        Hero.objects.create(full_name="Fulano de Tal", title="Desenvolvedor", bio=_texto(rng, 40))
+    if not About.objects.filter(is_active=True).exists():
+        About.objects.create(about=_texto(rng, 120))
+    if not Sections.objects.exists():
+        Sections.objects.create()
+    if not Footer.objects.exists():
+        Footer.objects.create(copyright_text="2025 Fulano de Tal")
+    if not Contact.objects.filter(is_active=True).exists():
+        contact = Contact.objects.create(title="Vamos conversar", description=_texto(rng, 15))
+        InfoItem.objects.bulk_create(
+            InfoItem(key=k, value=v, link="https://example.com", icon=ICON.format(r=i + 4), contact=contact)
+            for i, (k, v) in enumerate((("Email", "fulano@example.com"), ("Local", "Recife")))
+        )
+        SocialLink.objects.bulk_create(
+            SocialLink(title=t, link=f"https://{t.lower()}.com/fulano", icon=ICON.format(r=i + 6), contact=contact)
+            for i, t in enumerate(("GitHub", "LinkedIn"))
+        )
+
+    grupos = _bulk_create(
+        SkillGroup, (SkillGroup(title=f"Grupo {g}") for g in range(groups)), chunk_size, keep=True
+    )
+    skill_ids = [
+        skill.pk
+        for skill in _bulk_create(
+            Skill,
+            (
+                Skill(title=f"Skill {s}", icon=ICON.format(r=s % 10 + 1), group=grupos[s % len(grupos)] if grupos else None)
+                for s in range(skills)
+            ),
+            chunk_size,
+            keep=True,
+        )
+    ]
+
+    descricoes = [_texto(rng, 30) for _ in range(min(projects, 500))]
+    # bulk_create não chama save(): renderiza cada descrição distinta uma vez
+    descricoes_html = [render_markdown(texto) for texto in descricoes]
+    # Slugs únicos mesmo ao gerar sobre projetos existentes (inclusive
+    # projetos reais com título igual a um sintético)
+    inicio = Project.objects.aggregate(ultimo=Max("id"))["ultimo"] or 0
+    slugs = set(Project.objects.values_list("slug", flat=True))
+
+    def slug(numero):
+        novo = unique_slug(f"projeto-sintetico-{numero}", slugs.__contains__)
+        slugs.add(novo)
+        return novo
+
+    project_ids = [
+        projeto.pk
+        for projeto in _bulk_create(
+            Project,
+            (
+                Project(
+                    title=f"Projeto {p}",
+                    # Texto simples: o HTML do título é o próprio título
+                    title_html=f"Projeto {p}",
+                    slug=slug(inicio + p + 1),
+                    description=descricoes[p % len(descricoes)],
+                    description_html=descricoes_html[p % len(descricoes)],
+                    demo_url=f"https://example.com/demo/{p}",
+                    ordering_index=p,
+                )
+                for p in range(projects)
+            ),
+            chunk_size,
+            keep=True,
+        )
+    ]
+    if skill_ids:
+        Through = Project.skill.through
+        _bulk_create(
+            Through,
+            (
+                Through(project_id=project_id, skill_id=skill_id)
+                for project_id in project_ids
+                for skill_id in rng.sample(skill_ids, min(len(skill_ids), rng.randint(1, 6)))
+            ),
+            chunk_size,
+        )
+
+    # Textos sorteados de um conjunto fixo: gerar um texto por mensagem
+    # dominaria o tempo de inserção de milhões de linhas
+    textos = [_texto(rng, 25) for _ in range(min(messages, 1000))]
+    _bulk_create(
+        Message,
+        (
+            Message(
+                name=f"Visitante {m}",
+                email=f"visitante{m}@example.com",
+                message=textos[rng.randrange(len(textos))],
+            )
+            for m in range(messages)
+        ),
+        chunk_size,
+    )
+
+    hoje = timezone.localdate()
+    _bulk_create(
+        PageView,
+        (
+            PageView(
+                path="/", section=section, day=hoje - timedelta(days=d),
+                referrer_host="" if section else host, views=rng.randint(1, 500),
+            )
+            for d in range(page_view_days)
+            for section in SECTIONS
+            for host in (REFERRERS if not section else ("",))
+        ),
+        chunk_size,
+    )
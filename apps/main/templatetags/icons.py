@@ -0,0 +1,15 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from apps.main.icons import render_icon
+
+register = template.Library()
+
+
+@register.filter(name='icon')
+def icon(markup, sprite_url):
+    """
+    Troca o SVG de um ícone cadastrado por uma referência ao seu símbolo no
+    sprite: ``{{ skill.icon|icon:icon_sprite }}``.
+    """
+    return mark_safe(render_icon(markup, sprite_url))
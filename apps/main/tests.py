@@ -1,3 +1,862 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import os
+import re
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.contrib.sessions.models import Session
+from django.core import mail
+from django.core.cache import cache, caches
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import Resolver404, include, path, resolve, reverse
+from django.utils import timezone
+
+from core import metrics
+from core.cache import isolated_caches
+from core.middleware import concurrency
+from core.middleware.concurrency import ConcurrencyLimitMiddleware
+from core.utils.html import minify_html
+from core.utils.slugs import unique_slug
+from core.utils.urls import lazy_path
+
+from . import analytics, icons, loadgen, skill_index
+from .cache import (
+    CSRF_PLACEHOLDER, get_content_version, get_project_generation, invalidate_project,
+)
+from .mail import drain, send_message_digest
+from .models import (
+    About, Contact, Hero, InfoItem, Message, MetaData, OutboundEmail, Project, Sections, Skill,
+    SkillGroup, SocialLink,
+)
+from .seo import get_seo_head
+from .views import index_async
+
+
+class CacheTestCase(TestCase):
+    def setUp(self):
+        # Caches vazios em um diretório temporário, removido ao fim de cada
+        # teste, para os testes não usarem (nem apagarem) o cache do projeto
+        self.enterContext(isolated_caches())
+
+    def tearDown(self):
+        # Grava no banco de testes as visualizações das páginas acessadas
+        analytics.flush()
+
+
+class ContentVersionTests(CacheTestCase):
+    def test_version_changes_only_after_commit(self):
+        versao = get_content_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(title="Projeto")
+            self.assertEqual(get_content_version(), versao)
+        self.assertNotEqual(get_content_version(), versao)
+
+
+class ProjectReorderTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        admin = get_user_model().objects.create_superuser(email="admin@example.com", password="x")
+        self.client.force_login(admin)
+        self.url = reverse("admin:main_project_reorder")
+        self.projects = [
+            Project.objects.create(title=f"Projeto {n}", ordering_index=n) for n in range(1, 4)
+        ]
+
+    def post(self, order):
+        return self.client.post(self.url, json.dumps({"order": order}), content_type="application/json")
+
+    def test_saves_new_order_and_invalidates_once(self):
+        primeiro, segundo, terceiro = (p.pk for p in self.projects)
+        versao = get_content_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post([terceiro, primeiro, segundo])
+        self.assertEqual(response.json(), {"updated": 3})
+        self.assertEqual(get_content_version(), versao + 1)
+        self.assertEqual(
+            list(Project.objects.order_by("ordering_index").values_list("pk", flat=True)),
+            [terceiro, primeiro, segundo],
+        )
+
+    def test_unchanged_order_writes_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.post([p.pk for p in self.projects])
+        self.assertEqual(response.json(), {"updated": 0})
+        self.assertEqual(callbacks, [])
+
+    def test_rejects_incomplete_or_repeated_order(self):
+        primeiro, segundo, _ = (p.pk for p in self.projects)
+        self.assertEqual(self.post([primeiro, segundo]).status_code, 400)
+        self.assertEqual(self.post([primeiro, primeiro, segundo]).status_code, 400)
+        self.assertEqual(self.post(["x"]).status_code, 400)
+
+
+class MetricsTests(TestCase):
+    def test_shard_of_finished_thread_is_merged(self):
+        contador = metrics.Counter("test_thread_total", "Teste.")
+        antes = len(metrics._shards)
+        threads = [threading.Thread(target=contador.inc) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(metrics._shards), antes)
+        self.assertEqual(metrics.collect_local()[("test_thread_total", ())], 20)
+
+    @override_settings(METRICS_TOKEN="segredo")
+    def test_token_check(self):
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION="Bearer segredo").status_code, 200)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION="Bearer errado").status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION="Bearer ségredo").status_code, 403)
+
+    def test_ip_check_without_token(self):
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url).status_code, 200)
+        # Repassada pelo proxy local: REMOTE_ADDR é 127.0.0.1, mas o cliente não
+        self.assertEqual(self.client.get(url, HTTP_X_FORWARDED_FOR="203.0.113.5").status_code, 403)
+        self.assertEqual(self.client.get(url, REMOTE_ADDR="203.0.113.5").status_code, 403)
+
+    @override_settings(CLIENT_IP_HEADER="HTTP_X_FORWARDED_FOR", TRUSTED_PROXY_COUNT=1)
+    def test_ip_check_uses_client_ip_behind_proxy(self):
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url, HTTP_X_FORWARDED_FOR="203.0.113.5").status_code, 403)
+        self.assertEqual(
+            self.client.get(url, HTTP_X_FORWARDED_FOR="127.0.0.1, 203.0.113.5").status_code, 403
+        )
+        self.assertEqual(self.client.get(url, HTTP_X_FORWARDED_FOR="127.0.0.1").status_code, 200)
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self):
+        analytics.flush()
+        self.gravadas = []
+        patcher = mock.patch.object(analytics, "_upsert", side_effect=self.gravadas.extend)
+        self.upsert = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def total(self):
+        return sum(linha[-1] for linha in self.gravadas)
+
+    @override_settings(ANALYTICS_MAX_KEYS=5)
+    def test_concurrent_records_are_all_counted(self):
+        def visitar():
+            for n in range(500):
+                analytics.record(f"/pagina/{n % 50}/")
+
+        threads = [threading.Thread(target=visitar) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        analytics.flush()
+        self.assertEqual(self.total(), 8 * 500)
+
+    @override_settings(ANALYTICS_MAX_KEYS=1)
+    def test_write_failure_is_logged_and_counts_kept(self):
+        self.upsert.side_effect = DatabaseError("banco indisponível")
+        with self.assertLogs("apps.main.analytics", "ERROR"):
+            analytics.record("/")
+            analytics.record("/")
+        self.upsert.side_effect = self.gravadas.extend
+        analytics.flush()
+        self.assertEqual(self.total(), 2)
+
+
+class LazyURLResolverTests(TestCase):
+    def urlconf(self):
+        class URLConf:
+            urlpatterns = [
+                path("inicio/", lambda request: HttpResponse(), name="inicio"),
+                lazy_path("lazy/", "apps.main.urls", "lazy"),
+            ]
+        lazy = URLConf.urlpatterns[1]
+        return URLConf, lazy
+
+    def assertLoaded(self, lazy, loaded):
+        self.assertEqual("urlpatterns" in vars(lazy.urlconf_name), loaded)
+
+    def test_root_reverse_does_not_load_include(self):
+        urlconf, lazy = self.urlconf()
+        self.assertEqual(reverse("inicio", urlconf=urlconf), "/inicio/")
+        self.assertEqual(resolve("/inicio/", urlconf=urlconf).url_name, "inicio")
+        self.assertLoaded(lazy, False)
+
+    def test_resolve_loads_include(self):
+        urlconf, lazy = self.urlconf()
+        match = resolve("/lazy/projects/", urlconf=urlconf)
+        self.assertEqual((match.namespace, match.url_name), ("lazy", "project_list"))
+        self.assertLoaded(lazy, True)
+
+    def test_namespaced_reverse_loads_include(self):
+        urlconf, lazy = self.urlconf()
+        reverse("inicio", urlconf=urlconf)
+        self.assertEqual(reverse("lazy:project_list", urlconf=urlconf), "/lazy/projects/")
+        self.assertLoaded(lazy, True)
+
+    def test_prefixed_include_keeps_routes_and_skips_other_paths(self):
+        class URLConf:
+            urlpatterns = [lazy_path("account/", "two_factor.urls", "two_factor", strip_route=True)]
+        lazy = URLConf.urlpatterns[0]
+        with self.assertRaises(Resolver404):
+            resolve("/wp-login.php", urlconf=URLConf)
+        self.assertLoaded(lazy, False)
+        self.assertEqual(resolve("/account/login/", urlconf=URLConf).url_name, "login")
+        self.assertEqual(reverse("two_factor:setup", urlconf=URLConf), "/account/two_factor/setup/")
+        self.assertLoaded(lazy, True)
+
+
+class TieredCacheTests(CacheTestCase):
+    def later(self, seconds):
+        return mock.patch("time.time", return_value=time.time() + seconds)
+
+    def test_incr_keeps_expiry(self):
+        cache.add("main:content_version", 1, None)
+        cache.add("throttle:teste", 0, 7200)
+        cache.incr("main:content_version")
+        cache.incr("throttle:teste")
+        with self.later(3600):
+            self.assertEqual(cache.get("main:content_version"), 2)
+            self.assertEqual(cache.get("throttle:teste"), 1)
+        with self.later(7300):
+            self.assertEqual(cache.get("main:content_version"), 2)
+            self.assertIsNone(cache.get("throttle:teste"))
+
+    def test_incr_missing_or_expired_key(self):
+        with self.assertRaises(ValueError):
+            cache.incr("throttle:ausente")
+        cache.set("throttle:teste", 1, 10)
+        with self.later(20), self.assertRaises(ValueError):
+            cache.incr("throttle:teste")
+
+    def test_local_copy_until_local_timeout(self):
+        cache.set("main:fragmento", "antigo")
+        # Escrita de outro processo, direto no cache compartilhado
+        caches["shared"].set("main:fragmento", "novo")
+        self.assertEqual(cache.get("main:fragmento"), "antigo")
+        with self.later(cache.local_timeout + 1):
+            self.assertEqual(cache.get("main:fragmento"), "novo")
+
+    def test_bypass_keys_always_read_shared(self):
+        cache.set("main:content_version", 1, None)
+        caches["shared"].set("main:content_version", 2, None)
+        self.assertEqual(cache.get("main:content_version"), 2)
+
+    def test_local_entries_are_bounded(self):
+        for n in range(cache.local_max_entries + 10):
+            cache.set(f"main:entrada:{n}", n)
+        self.assertEqual(len(cache._local), cache.local_max_entries)
+
+    def test_isolated_caches_leave_configured_cache_untouched(self):
+        cache.set("main:content_version", 7, None)
+        cache.set("main:fragmento", "site")
+        with isolated_caches():
+            diretorio = caches["shared"]._dir
+            self.assertIsNone(cache.get("main:fragmento"))
+            cache.set("main:content_version", 1, None)
+            cache.clear()
+        self.assertEqual(cache.get("main:content_version"), 7)
+        self.assertEqual(cache.get("main:fragmento"), "site")
+        self.assertFalse(os.path.exists(diretorio))
+
+
+@override_settings(CONCURRENCY_LIMITS={"public": {"limit": 1, "queue": 0, "timeout": 0.1}})
+class ConcurrencyLimitTests(TestCase):
+    def setUp(self):
+        # Limitadores novos, sem herdar os do processo de teste
+        patcher = mock.patch.dict(concurrency._limiters, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.request = RequestFactory().get("/")
+
+    def test_excess_request_gets_503_with_retry_after(self):
+        respostas = []
+
+        def view(request):
+            # Segunda requisição enquanto a primeira ocupa a única vaga
+            respostas.append(middleware(request))
+            return HttpResponse()
+
+        middleware = ConcurrencyLimitMiddleware(view)
+        self.assertEqual(middleware(self.request).status_code, 200)
+        self.assertEqual(respostas[0].status_code, 503)
+        self.assertEqual(respostas[0]["Retry-After"], str(settings.CONCURRENCY_RETRY_AFTER))
+        self.assertEqual(concurrency.snapshot()["public"]["rejected"], 1)
+
+    def test_slot_released_when_view_raises(self):
+        def view(request):
+            raise ValueError("falha na view")
+
+        middleware = ConcurrencyLimitMiddleware(view)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                middleware(self.request)
+        self.assertEqual(concurrency.snapshot()["public"]["in_flight"], 0)
+        self.assertEqual(concurrency.snapshot()["public"]["rejected"], 0)
+
+    def test_async_slot_released_when_view_raises(self):
+        async def view(request):
+            raise ValueError("falha na view")
+
+        async def duas_requisicoes():
+            # No mesmo event loop, que tem um único semáforo
+            for _ in range(2):
+                with self.assertRaises(ValueError):
+                    await middleware(self.request)
+
+        middleware = ConcurrencyLimitMiddleware(view)
+        async_to_sync(duas_requisicoes)()
+        self.assertEqual(concurrency.snapshot()["public"]["in_flight"], 0)
+        self.assertEqual(concurrency.snapshot()["public"]["rejected"], 0)
+
+
+class LoadgenTests(TestCase):
+    def parse(self, dados):
+        async def ler():
+            conexao = loadgen.Connection("127.0.0.1", 80)
+            conexao.reader = asyncio.StreamReader()
+            conexao.reader.feed_data(dados)
+            conexao.reader.feed_eof()
+            return await conexao._read_response()
+        return async_to_sync(ler)()
+
+    def test_parses_content_length_and_chunked_bodies(self):
+        response = self.parse(b"HTTP/1.1 200 OK\r\nContent-Length: 3\r\nSet-Cookie: a=1\r\n\r\nabcresto")
+        self.assertEqual((response.status, response.body), (200, b"abc"))
+        self.assertIn(("set-cookie", "a=1"), response.headers)
+        response = self.parse(
+            b"HTTP/1.1 404 Not Found\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"3;ext=1\r\nabc\r\n2\r\nde\r\n0\r\n\r\n"
+        )
+        self.assertEqual((response.status, response.body), (404, b"abcde"))
+        # Sem Content-Length: o corpo vai até o fim da conexão
+        response = self.parse(b"HTTP/1.0 503 Service Unavailable\r\n\r\natrasado")
+        self.assertEqual((response.status, response.body), (503, b"atrasado"))
+
+    def test_oversized_header_is_counted_as_error(self):
+        async def servidor(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(b"HTTP/1.1 200 OK\r\nX-Grande: " + b"a" * 2 ** 17 + b"\r\n\r\n")
+            await writer.drain()
+            writer.close()
+
+        async def executar():
+            server = await asyncio.start_server(servidor, "127.0.0.1", 0)
+            porta = server.sockets[0].getsockname()[1]
+            async with server:
+                return await loadgen.run(f"http://127.0.0.1:{porta}", {"index": 1}, 1, 0.2)
+
+        resumo = async_to_sync(executar)().summary()["index"]
+        self.assertGreater(resumo["errors"]["LimitOverrunError"], 0)
+        self.assertEqual(resumo["error_rate"], 1.0)
+
+    def test_summary_and_histogram(self):
+        stats = loadgen.Stats()
+        for ms in range(1, 101):
+            stats.record("index", ms / 1000, status=200 if ms <= 98 else 503)
+        stats.record("index", None, error="TimeoutError")
+        stats.elapsed = 10
+        resumo = stats.summary()["index"]
+        self.assertEqual(resumo["requests"], 101)
+        self.assertAlmostEqual(resumo["rps"], 10.1)
+        self.assertAlmostEqual(resumo["error_rate"], 3 / 101)
+        self.assertEqual(resumo["statuses"], {200: 98, 503: 2})
+        self.assertEqual((resumo["p50_ms"], resumo["p99_ms"], resumo["max_ms"]), (51, 99, 100))
+        self.assertEqual(sum(resumo["histogram_ms"].values()), 100)
+        self.assertEqual(
+            loadgen.histogram([0.005, 0.0051, 0.25, 6]),
+            {**dict.fromkeys(resumo["histogram_ms"], 0), "<=5": 1, "<=10": 1, "<=250": 1, ">5000": 1},
+        )
+
+
+class FailingSendBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise OSError("recusado")
+
+
+class FailingOpenBackend(BaseEmailBackend):
+    def open(self):
+        raise OSError("sem conexão")
+
+
+@override_settings(
+    OUTBOX_DELIVERY_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    OUTBOX_RETRY_BACKOFF=60, OUTBOX_RETRY_MAX_BACKOFF=300, OUTBOX_MAX_ATTEMPTS=3,
+)
+class OutboxTests(TestCase):
+    def enqueue(self, n=1):
+        mensagens = [EmailMessage(f"Assunto {i}", "Corpo", None, ["dono@example.com"]) for i in range(n)]
+        mensagens[0].attach("nota.txt", "anexo", "text/plain")
+        get_connection("apps.main.mail.OutboxEmailBackend").send_messages(mensagens)
+
+    def test_queued_message_is_delivered_unchanged(self):
+        self.enqueue()
+        self.assertEqual(drain(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Assunto 0")
+        self.assertEqual(mail.outbox[0].attachments[0][:2], ("nota.txt", "anexo"))
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.SENT, 1))
+        self.assertEqual(drain(), (0, 0))
+
+    def test_batch_size(self):
+        self.enqueue(3)
+        self.assertEqual(drain(batch_size=2), (2, 0))
+        self.assertEqual(drain(batch_size=2), (1, 0))
+
+    @override_settings(OUTBOX_DELIVERY_BACKEND="apps.main.tests.FailingSendBackend")
+    def test_failures_back_off_until_max_attempts(self):
+        self.enqueue()
+        esperas = []
+        for _ in range(3):
+            OutboundEmail.objects.update(next_attempt=timezone.now())
+            antes = timezone.now()
+            with self.assertLogs("apps.main.mail", "WARNING"):
+                self.assertEqual(drain(), (0, 1))
+            email = OutboundEmail.objects.get()
+            esperas.append(round((email.next_attempt - antes).total_seconds() / 60))
+        self.assertEqual(esperas[:2], [1, 2])
+        self.assertEqual((email.status, email.attempts), (OutboundEmail.FAILED, 3))
+        self.assertIn("recusado", email.last_error)
+
+    @override_settings(OUTBOX_DELIVERY_BACKEND="apps.main.tests.FailingOpenBackend")
+    def test_connection_failure_reschedules_batch(self):
+        self.enqueue(2)
+        with self.assertLogs("apps.main.mail", "WARNING") as logs:
+            self.assertEqual(drain(), (0, 2))
+        self.assertIn("sem conexão", logs.output[0])
+        self.assertEqual(drain(), (0, 0))
+        for email in OutboundEmail.objects.all():
+            self.assertEqual((email.status, email.attempts), (OutboundEmail.PENDING, 1))
+            self.assertGreater(email.next_attempt, timezone.now() + timedelta(seconds=50))
+
+
+@override_settings(
+    MESSAGE_NOTIFY_TO=["dono@example.com"], MESSAGE_NOTIFY_MODE="digest",
+    MESSAGE_DIGEST_INTERVAL=3600, MESSAGE_DIGEST_MAX_ITEMS=2,
+)
+class MessageDigestTests(TestCase):
+    def create_messages(self, n):
+        for i in range(n):
+            Message.objects.create(name=f"Pessoa {i}", email="p@example.com", message="Olá")
+
+    def test_first_run_starts_after_existing_messages(self):
+        self.create_messages(2)
+        self.assertEqual(send_message_digest(), 0)
+        self.assertEqual(send_message_digest(force=True), 0)
+        self.assertEqual(mail.outbox, [])
+
+    def test_digest_summarizes_new_messages_once(self):
+        send_message_digest()
+        self.create_messages(1)
+        # Dentro do intervalo só envia com force
+        self.assertEqual(send_message_digest(), 0)
+        self.assertEqual(send_message_digest(force=True), 1)
+        self.assertEqual(send_message_digest(force=True), 0)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn("Pessoa 0", mail.outbox[0].body)
+
+    def test_truncated_digest_counts_the_rest(self):
+        send_message_digest()
+        self.create_messages(3)
+        self.assertEqual(send_message_digest(force=True), 3)
+        self.assertTrue(mail.outbox[0].subject.startswith("3 "))
+        self.assertIn("e mais 1", mail.outbox[0].body)
+        self.create_messages(1)
+        self.assertEqual(send_message_digest(force=True), 1)
+
+
+class MinifyHtmlTests(TestCase):
+    def test_collapses_whitespace_and_drops_comments(self):
+        html = "<div>\n    <p>Olá   <b>mundo</b></p>  <!-- nota -->\n</div>"
+        self.assertEqual(minify_html(html), "<div>\n<p>Olá <b>mundo</b></p>\n</div>")
+
+    def test_keeps_conditional_comments_and_preserved_blocks(self):
+        html = (
+            "<!--[if IE]><p>IE</p><![endif]-->\n"
+            "<pre>  a\n    b</pre>  <textarea> x  </textarea>"
+            "<script>var a  =  1; // <!-- x --></script>"
+        )
+        self.assertEqual(minify_html(html), html.replace("</pre>  ", "</pre> "))
+
+
+class RichTextTests(TestCase):
+    PERIGOSO = (
+        '<script>alert(1)</script> [link](javascript:alert(2)) '
+        '<a href="javascript:alert(3)" onclick="alert(4)">a</a> '
+        '<img src="x.png" onerror="alert(5)"> <b onmouseover="alert(6)">ok</b>'
+    )
+
+    def assertSanitized(self, html):
+        for trecho in ("<script", "alert(1)", "javascript:", "onclick", "onerror", "onmouseover"):
+            self.assertNotIn(trecho, html)
+        self.assertIn("<b>ok</b>", html)
+
+    def test_html_columns_are_sanitized(self):
+        projeto = Project.objects.create(title=self.PERIGOSO, description=self.PERIGOSO)
+        hero = Hero.objects.create(bio=self.PERIGOSO)
+        about = About.objects.create(about=self.PERIGOSO)
+        projeto.refresh_from_db()
+        for html in (projeto.title_html, projeto.description_html, hero.bio_html, about.about_html):
+            self.assertSanitized(html)
+        self.assertNotIn("<p>", projeto.title_html)
+        self.assertNotIn("<img", projeto.title_html)
+
+    def test_html_column_refreshed_when_source_saved(self):
+        projeto = Project.objects.create(title="App", description="**antes**")
+        projeto.description = "_depois_"
+        projeto.save(update_fields=["description"])
+        projeto.refresh_from_db()
+        self.assertEqual(projeto.description_html, "<p><em>depois</em></p>")
+        Project.objects.filter(pk=projeto.pk).update(description="sem renderizar")
+        projeto.refresh_from_db()
+        projeto.save()
+        self.assertEqual(Project.objects.get(pk=projeto.pk).description_html, "<p>sem renderizar</p>")
+
+
+class PageCacheTests(CacheTestCase):
+    def test_homepage_is_minified(self):
+        response = self.client.get("/", HTTP_HOST="127.0.0.1")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(b"  ", response.content)
+
+    def test_cached_homepage_gets_fresh_csrf_token(self):
+        Sections.objects.create(contact=True)
+        Contact.objects.create(title="Contato")
+        primeira = self.client.get("/", HTTP_HOST="127.0.0.1")
+        with self.assertNumQueries(0):
+            segunda = Client().get("/", HTTP_HOST="127.0.0.1")
+        tokens = [
+            re.search(rb'name="csrfmiddlewaretoken" value="([^"]+)"', r.content).group(1)
+            for r in (primeira, segunda)
+        ]
+        self.assertNotIn(CSRF_PLACEHOLDER.encode(), tokens)
+        self.assertNotEqual(*tokens)
+
+    def test_anonymous_visits_write_no_session(self):
+        Project.objects.create(title="Meu App")
+        for url in ("/", "/projects/", "/projects/meu-app/", "/robots.txt"):
+            response = self.client.get(url, HTTP_HOST="127.0.0.1")
+            self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies, url)
+        # A mensagem de erro do formulário vai em cookie, não na sessão
+        response = self.client.post("/", {"name": "Ana"}, HTTP_HOST="127.0.0.1", follow=True)
+        self.assertContains(response, "Todos os campos são obrigatórios.")
+        self.assertIn(CookieStorage.cookie_name, self.client.cookies)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, self.client.cookies)
+        self.assertFalse(Session.objects.exists())
+
+
+class AsyncIndexURLConf:
+    # Rotas do projeto com a página inicial assíncrona (ASYNC_INDEX=True)
+    urlpatterns = [
+        path("", index_async, name="index"),
+        path("", include("core.urls")),
+    ]
+
+
+@override_settings(ROOT_URLCONF=AsyncIndexURLConf, ALLOWED_HOSTS=["testserver"])
+class AsyncIndexTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        Sections.objects.create(contact=True)
+        Contact.objects.create(title="Contato")
+
+    def request(self, method, *args):
+        # As chamadas ao banco do AsyncClient rodam na thread do teste,
+        # onde assertNumQueries as enxerga
+        return async_to_sync(getattr(self.async_client, method))("/", *args)
+
+    def test_renders_and_caches_homepage(self):
+        self.assertIs(resolve("/").func, index_async)
+        primeira = self.request("get")
+        self.assertEqual(primeira.status_code, 200)
+        self.assertContains(primeira, 'name="csrfmiddlewaretoken"')
+        with self.assertNumQueries(0):
+            segunda = self.request("get")
+        self.assertEqual(segunda.status_code, 200)
+        self.assertNotIn(CSRF_PLACEHOLDER.encode(), segunda.content)
+
+    def test_post_is_handled_by_sync_view(self):
+        response = self.request("post", {"name": "Ana", "email": "ana@example.com", "message": "Olá"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Message.objects.filter(email="ana@example.com").exists())
+        response = self.request("post", {"name": "Ana"})
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24" class="w-6"><path d="M{}"/></svg>'
+
+
+class IconSpriteTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        Sections.objects.create()
+        grupo = SkillGroup.objects.create(title="Backend")
+        Skill.objects.create(title="Python", icon=SVG.format(1), group=grupo)
+        Skill.objects.create(title="Django", icon=SVG.format(1), group=grupo)
+        Skill.objects.create(title="Antiga", icon=SVG.format(2), group=grupo, is_active=False)
+        contato = Contact.objects.create(title="Contato")
+        InfoItem.objects.create(contact=contato, key="Email", value="a@b.c", icon=SVG.format(3))
+        SocialLink.objects.create(contact=contato, title="Antigo", icon=SVG.format(4), is_active=False)
+
+    def test_repeated_icons_share_one_symbol(self):
+        _, svg = icons.build_sprite()
+        self.assertEqual(svg.count("<symbol"), 2)
+
+    def test_every_rendered_icon_is_in_the_sprite(self):
+        html = self.client.get("/", HTTP_HOST="127.0.0.1").content.decode()
+        digest, svg = icons.get_sprite()
+        usados = set(re.findall(r'<use href="/icons/[0-9a-f]+\.svg#([\w-]+)"', html))
+        self.assertEqual(len(usados), 2)
+        for icon_id in usados:
+            self.assertIn(f'id="{icon_id}"', svg)
+        self.assertNotIn("Antiga", html)
+
+    def test_sprite_url_is_immutable_only_for_current_digest(self):
+        digest, _ = icons.get_sprite()
+        response = self.client.get(icons.sprite_url(), HTTP_HOST="127.0.0.1")
+        self.assertEqual(response["Content-Type"], "image/svg+xml")
+        self.assertIn("immutable", response["Cache-Control"])
+        antigo = self.client.get(reverse("icon_sprite", args=["0" * 12]), HTTP_HOST="127.0.0.1")
+        self.assertNotIn("immutable", antigo.get("Cache-Control", ""))
+
+
+class SeoHeadTests(CacheTestCase):
+    TITULO = 'Dev </script><script>alert(1)</script> & <b>cia</b>'
+
+    def json_ld(self, head):
+        conteudo = re.search(r'<script type="application/ld\+json">(.*?)</script>', head, re.DOTALL).group(1)
+        return conteudo, json.loads(conteudo)
+
+    def test_json_ld_cannot_close_the_script_tag(self):
+        MetaData.objects.create(title=self.TITULO, description="A & B")
+        Hero.objects.create(full_name="Ana", works_for="<Empresa> & Cia")
+        head = get_seo_head()
+        self.assertEqual(head.count("</script>"), 1)
+        conteudo, dados = self.json_ld(head)
+        for caractere in "<>&":
+            self.assertNotIn(caractere, conteudo)
+        site, pessoa = dados["@graph"][:2]
+        self.assertEqual((site["name"], site["description"]), (self.TITULO, "A & B"))
+        self.assertEqual(pessoa["worksFor"]["name"], "<Empresa> & Cia")
+        # Nas meta tags o título é escapado como HTML
+        self.assertIn('content="Dev &lt;/script&gt;&lt;script&gt;', head)
+
+    def test_head_cached_per_content_version(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            metadata = MetaData.objects.create(title="Antigo")
+        versao = get_content_version()
+        self.assertEqual(self.json_ld(get_seo_head())[1]["@graph"][0]["name"], "Antigo")
+        # Alteração sem sinais: o head em cache da versão atual continua valendo
+        MetaData.objects.filter(pk=metadata.pk).update(title="Sem sinal")
+        self.assertEqual(self.json_ld(get_seo_head())[1]["@graph"][0]["name"], "Antigo")
+        with self.captureOnCommitCallbacks(execute=True):
+            metadata.title = "Novo"
+            metadata.save()
+        self.assertNotEqual(get_content_version(), versao)
+        self.assertEqual(self.json_ld(get_seo_head())[1]["@graph"][0]["name"], "Novo")
+        self.assertEqual(self.json_ld(get_seo_head(versao))[1]["@graph"][0]["name"], "Antigo")
+
+
+class ContentApiTests(CacheTestCase):
+    def get(self, section, **extra):
+        return self.client.get(f"/api/{section}.json", HTTP_HOST="127.0.0.1", **extra)
+
+    def test_only_active_items_in_every_section(self):
+        grupo = SkillGroup.objects.create(title="Backend")
+        ativa = Skill.objects.create(title="Python", group=grupo)
+        inativa = Skill.objects.create(title="Antiga", group=grupo, is_active=False)
+        Project.objects.create(title="Projeto").skill.add(ativa, inativa)
+        contato = Contact.objects.create(title="Contato")
+        InfoItem.objects.create(contact=contato, key="Email", is_active=False)
+        SocialLink.objects.create(contact=contato, title="GitHub")
+        SocialLink.objects.create(contact=contato, title="Antigo", is_active=False)
+
+        dados = json.loads(self.get("portfolio").content)
+        self.assertEqual(dados["projects"][0]["skills"], ["Python"])
+        self.assertEqual([s["title"] for s in dados["skills"][0]["skills"]], ["Python"])
+        self.assertEqual(dados["contact"]["info_items"], [])
+        self.assertEqual([link["title"] for link in dados["contact"]["social_links"]], ["GitHub"])
+
+    def test_etag_and_gzip(self):
+        response = self.get("projects")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get("projects", HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        self.assertEqual(self.get("projects", HTTP_ACCEPT_ENCODING="gzip")["Content-Encoding"], "gzip")
+        self.assertEqual(self.get("desconhecida").status_code, 404)
+
+
+class ProjectSlugTests(CacheTestCase):
+    def test_unique_slug_appends_suffix(self):
+        usados = {"meu-app", "meu-app-2"}
+        self.assertEqual(unique_slug("Meu <b>App</b>", usados.__contains__), "meu-app-3")
+        self.assertEqual(unique_slug("", usados.__contains__, fallback="projeto"), "projeto")
+        self.assertEqual(unique_slug("a" * 20, {"a" * 10}.__contains__, max_length=10), "a" * 8 + "-2")
+
+    def test_save_generates_slug_once(self):
+        primeiro = Project.objects.create(title="Meu **App**")
+        segundo = Project.objects.create(title="Meu App")
+        self.assertEqual((primeiro.slug, segundo.slug), ("meu-app", "meu-app-2"))
+        primeiro.title = "Outro nome"
+        primeiro.save()
+        self.assertEqual(primeiro.slug, "meu-app")
+        self.assertEqual(primeiro.get_absolute_url(), "/projects/meu-app/")
+
+    def test_seed_avoids_existing_slugs(self):
+        # O primeiro projeto sintético seria o número 2 (maior id + 1)
+        Project.objects.create(title="Projeto Sintético 2")
+        call_command("seed_portfolio", projects=3, skills=2, groups=1)
+        slugs = list(Project.objects.values_list("slug", flat=True))
+        self.assertEqual(len(slugs), 4)
+        self.assertEqual(len(set(slugs)), 4)
+
+    def test_detail_page(self):
+        projeto = Project.objects.create(title="Meu App", description="**Descrição**")
+        response = self.client.get(projeto.get_absolute_url(), HTTP_HOST="127.0.0.1")
+        self.assertContains(response, "<strong>Descrição</strong>")
+        self.assertEqual(self.client.get("/projects/inexistente/", HTTP_HOST="127.0.0.1").status_code, 404)
+        Project.objects.filter(pk=projeto.pk).update(is_active=False)
+        cache.clear()
+        self.assertEqual(self.client.get(projeto.get_absolute_url(), HTTP_HOST="127.0.0.1").status_code, 404)
+
+    def test_project_generation_changes_only_on_invalidation(self):
+        geracao = get_project_generation(1)
+        invalidate_project(2)
+        with mock.patch("time.time", return_value=time.time() + 600):
+            self.assertEqual(get_project_generation(1), geracao)
+            invalidate_project(1)
+            nova = get_project_generation(1)
+        self.assertNotEqual(nova, geracao)
+        with mock.patch("time.time", return_value=time.time() + 1200):
+            self.assertEqual(get_project_generation(1), nova)
+
+    def test_project_generation_changes_after_commit(self):
+        projeto = Project.objects.create(title="Meu App")
+        skill = Skill.objects.create(title="Django")
+        mudancas = [
+            lambda: projeto.save(),
+            lambda: projeto.skill.add(skill),
+            lambda: skill.save(),
+            lambda: skill.delete(),
+        ]
+        for mudanca in mudancas:
+            geracao = get_project_generation(projeto.pk)
+            with self.captureOnCommitCallbacks(execute=True):
+                mudanca()
+                self.assertEqual(get_project_generation(projeto.pk), geracao)
+            self.assertNotEqual(get_project_generation(projeto.pk), geracao)
+
+
+@override_settings(PROJECTS_PER_PAGE=2)
+class WarmCachesTests(CacheTestCase):
+    def test_warms_pages_api_seo_and_sprite(self):
+        Sections.objects.create()
+        projetos = [Project.objects.create(title=f"Projeto {n}") for n in range(3)]
+        call_command("warm_caches", "--host", "127.0.0.1", stdout=io.StringIO())
+        versao = get_content_version()
+        for chave in (f"main:seo:v{versao}", f"main:icons:v{versao}", f"main:api:portfolio:v{versao}"):
+            self.assertIsNotNone(cache.get(chave), chave)
+        with self.assertNumQueries(0):
+            for url in ("/", "/projects/", "/projects/?page=2", projetos[2].get_absolute_url()):
+                self.assertEqual(self.client.get(url, HTTP_HOST="127.0.0.1").status_code, 200, url)
+            self.client.get("/api/skills.json", HTTP_HOST="127.0.0.1")
+
+
+class SkillIndexTests(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.django, self.postgres, self.redis = (
+            Skill.objects.create(title=title) for title in ("Django", "Postgres", "Redis")
+        )
+        self.a = Project.objects.create(title="A", ordering_index=2)
+        self.b = Project.objects.create(title="B", ordering_index=1)
+        self.c = Project.objects.create(title="C", ordering_index=3, featured=True)
+        self.a.skill.add(self.django, self.postgres)
+        self.b.skill.add(self.django, self.postgres, self.redis)
+        self.c.skill.add(self.django)
+
+    def filtrar(self, *slugs):
+        return skill_index.filter_projects(skill_index.get_index(), slugs)
+
+    def feature_a(self):
+        self.a.featured = True
+        self.a.save()
+
+    def assertCurrent(self):
+        index = skill_index.get_index()
+        self.assertEqual(index, skill_index.build_index(index["generation"]))
+
+    def test_intersection_in_display_order(self):
+        self.assertEqual(self.filtrar("django"), [self.c.pk, self.b.pk, self.a.pk])
+        self.assertEqual(self.filtrar("postgres", "django"), [self.b.pk, self.a.pk])
+        self.assertEqual(self.filtrar("redis", "postgres"), [self.b.pk])
+        self.assertIsNone(self.filtrar("django", "cobol"))
+        contagens = skill_index.skill_counts(skill_index.get_index())
+        self.assertEqual(contagens[0], ("django", "Django", 3))
+
+    def test_incremental_updates_match_a_rebuild(self):
+        skill_index.get_index()
+        geracao = skill_index.get_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.c.skill.add(self.redis)
+        index = skill_index.get_index()
+        self.assertEqual(index["generation"], geracao + 1)
+        self.assertEqual(index["skills"][self.redis.pk], [self.c.pk, self.b.pk])
+        for alteracao in (
+            lambda: self.a.skill.remove(self.postgres),
+            lambda: self.redis.project_set.clear(),
+            lambda: self.b.skill.clear(),
+            self.feature_a,
+            lambda: self.c.delete(),
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                alteracao()
+            self.assertCurrent()
+
+    def test_rolled_back_change_leaves_index_untouched(self):
+        antes = skill_index.get_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.c.skill.add(self.redis)
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(skill_index.get_index(), antes)
+
+    def test_rebuild_that_read_before_commit_is_discarded(self):
+        # Remontagem que leu o banco antes do commit de uma alteração
+        antigo = skill_index.build_index(skill_index.get_generation())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.c.skill.add(self.redis)
+        cache.set(skill_index.INDEX_KEY, antigo)
+        self.assertEqual(self.filtrar("redis"), [self.c.pk, self.b.pk])
+
+    def test_concurrent_update_is_not_lost(self):
+        skill_index.get_index()
+        # Outro worker alterou o índice depois desta leitura
+        lido = cache.get(skill_index.INDEX_KEY)
+        skill_index.invalidate_index()
+        cache.set(skill_index.INDEX_KEY, lido)
+        skill_index.update_links({self.redis.pk}, {self.c.pk}, True)
+        self.assertCurrent()
+
+    def test_filter_view(self):
+        resposta = self.client.get("/projects/?skill=postgres&skill=Django", HTTP_HOST="127.0.0.1")
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(len(resposta.context["page"].object_list), 2)
+        self.assertContains(resposta, 'href="?skill=django&amp;skill=postgres&amp;skill=redis"')
+        with self.assertNumQueries(0):
+            self.client.get("/projects/?skill=django&skill=postgres", HTTP_HOST="127.0.0.1")
+        self.assertEqual(self.client.get("/projects/?skill=cobol", HTTP_HOST="127.0.0.1").status_code, 404)
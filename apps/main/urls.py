@@ -1,10 +1,20 @@
 
+from django.conf import settings
 from django.urls import path
-from .views import index, robots, sitemap, test_view
+from .views import (
+    content_api, icon_sprite, index, index_async, project_detail, project_list, robots,
+    section_views, sitemap, test_view,
+)
 
 urlpatterns = [
-    path('', index, name='index'),
+    path('', index_async if settings.ASYNC_INDEX else index, name='index'),
+    path('projects/', project_list, name='project_list'),
+    path('projects/<slug:slug>/', project_detail, name='project_detail'),
     path('robots.txt', robots, name='robots'),
     path('sitemap.xml', sitemap, name='sitemap'),
+    path('icons/<str:digest>.svg', icon_sprite, name='icon_sprite'),
+    path('api/portfolio.json', content_api, name='content_api'),
+    path('api/<slug:section>.json', content_api, name='content_api_section'),
     path('test/', test_view, name='test_view'),
+    path('analytics/sections/', section_views, name='section_views'),
 ]
@@ -1,26 +1,99 @@
-from django.shortcuts import render
-from django.views.decorators.cache import cache_page
+import asyncio
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Prefetch
+from django.shortcuts import get_object_or_404, render
 from .models import (
-    MetaData, Hero, About, SkillGroup, Project, Contact, Sections, Footer, Message
+    MetaData, Hero, About, SkillGroup, Skill, Project, Contact, InfoItem, SocialLink,
+    Sections, Footer, Message,
 )
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, urlencode
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
+from core.metrics import CONTACT_SUBMISSIONS
+from . import analytics, api, skill_index
+from .icons import get_sprite, sprite_url
+from .seo import get_seo_head
+from .cache import (
+    cache_page_response, get_cached_page, get_content_version, get_project_generation,
+    versioned_cache_page,
+)
+
+# Seções da página inicial aceitas pelo beacon de engajamento
+TRACKED_SECTIONS = {'home', 'about', 'projects', 'skills', 'contact'}
+# Mesma verificação do GZipMiddleware
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+def _cached_homepage(request):
+    content_version = get_content_version()
+    return content_version, get_cached_page(request, 'index', content_version)
+
+
+def _homepage_projects():
+    """Destaques primeiro, limitados a ``HOMEPAGE_PROJECTS`` (índice project_listing)."""
+    return (
+        Project.objects.filter(is_active=True)
+        .order_by('-featured', 'ordering_index', '-created')
+        .prefetch_related('skill')[:settings.HOMEPAGE_PROJECTS]
+    )
+
+
+def _skill_groups():
+    # Só itens ativos: são os mesmos que entram no sprite de ícones
+    return SkillGroup.objects.filter(is_active=True).prefetch_related(
+        Prefetch('skill_set', queryset=Skill.objects.filter(is_active=True))
+    )
+
+
+def _contacts():
+    return Contact.objects.filter(is_active=True).prefetch_related(
+        Prefetch('info_items', queryset=InfoItem.objects.filter(is_active=True)),
+        Prefetch('social_links', queryset=SocialLink.objects.filter(is_active=True)),
+    )
+
+
+def _layout_context(content_version):
+    """Conteúdo de base.html para as páginas fora da página inicial."""
+    return {
+        'metadata': MetaData.objects.filter(is_active=True).first(),
+        'hero': Hero.objects.filter(is_active=True).first(),
+        'sections': Sections.objects.all().first(),
+        'footer': Footer.objects.all().first(),
+        'content_version': content_version,
+    }
+
 
 def index(request):
+    content_version, cached = _cached_homepage(request)
+    if cached is not None:
+        return cached
 
     metadata = MetaData.objects.filter(is_active=True).first()
     hero = Hero.objects.filter(is_active=True).first()
     about = About.objects.filter(is_active=True).first()
-    skillgroups = SkillGroup.objects.filter(is_active=True)
-    projects = Project.objects.filter(is_active=True)
-    contact = Contact.objects.filter(is_active=True).first()
+    # Consultas preguiçosas: só executam se o fragmento não estiver em cache
+    skillgroups = _skill_groups()
+    projects = _homepage_projects()
+    contact = _contacts().first()
     sections = Sections.objects.all().first()
     footer = Footer.objects.all().first()
     context = {
         'metadata': metadata, 'hero': hero, 'about': about,
         'skillgroups': skillgroups, 'projects': projects,
-        'contact': contact, 'sections': sections, 'footer': footer
+        'contact': contact, 'sections': sections, 'footer': footer,
+        'content_version': content_version,
+        # Só consultado se algum fragmento com ícones for renderizado
+        'icon_sprite': SimpleLazyObject(lambda: sprite_url(content_version)),
+        'seo_head': get_seo_head(content_version),
     }
     
     if request.method == 'POST':
@@ -29,25 +102,199 @@ def index(request):
         message = request.POST.get('message')
 
         if not name or not email or not message:
+            CONTACT_SUBMISSIONS.inc(('invalid',))
             context['error'] = 'Todos os campos são obrigatórios.'
             messages.error(request, 'Todos os campos são obrigatórios.')
             return redirect('index')
 
         Message.objects.create(name=name, email=email, message=message)
+        CONTACT_SUBMISSIONS.inc(('created',))
         return render(request, 'main/index.html', context=context)
 
-    return render(request, 'main/index.html', context=context)
+    response = render(request, 'main/index.html', context=context)
+    return cache_page_response(request, 'index', content_version, response)
+
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+
+async def index_async(request):
+    """
+    Variante assíncrona da página inicial para o deploy ASGI.
+
+    Busca todo o conteúdo em paralelo com a API assíncrona do ORM e já
+    materializa as relações usadas pelos templates, de modo que a
+    renderização não precise acessar o banco. O envio do formulário de
+    contato continua sendo tratado pela view síncrona.
+    """
+    if request.method == 'POST':
+        return await sync_to_async(index)(request)
+
+    content_version, cached = await sync_to_async(_cached_homepage)(request)
+    if cached is not None:
+        return cached
+
+    (
+        metadata, hero, about, skillgroups, projects, contact, sections, footer,
+        icon_sprite, seo_head,
+    ) = await asyncio.gather(
+        MetaData.objects.filter(is_active=True).afirst(),
+        Hero.objects.filter(is_active=True).afirst(),
+        About.objects.filter(is_active=True).afirst(),
+        _alist(_skill_groups()),
+        _alist(_homepage_projects()),
+        _contacts().afirst(),
+        Sections.objects.all().afirst(),
+        Footer.objects.all().afirst(),
+        sync_to_async(sprite_url)(content_version),
+        sync_to_async(get_seo_head)(content_version),
+    )
+    context = {
+        'metadata': metadata, 'hero': hero, 'about': about,
+        'skillgroups': skillgroups, 'projects': projects,
+        'contact': contact, 'sections': sections, 'footer': footer,
+        'content_version': content_version, 'icon_sprite': icon_sprite,
+        'seo_head': seo_head,
+    }
+    response = render(request, 'main/index.html', context=context)
+    return await sync_to_async(cache_page_response)(request, 'index', content_version, response)
+
+
+@require_safe
+def project_list(request):
+    """
+    Todos os projetos ativos, paginados (``?page=``) e filtrados pelas
+    habilidades em ``?skill=`` (todas precisam estar presentes), com a
+    interseção feita no índice invertido de ``skill_index``.
+    """
+    try:
+        numero = int(request.GET.get('page', 1))
+    except ValueError:
+        raise Http404
+    slugs = skill_index.normalize(request.GET.getlist('skill'))
+    if len(slugs) > settings.PROJECT_SKILL_FILTERS:
+        raise Http404
+    content_version = get_content_version()
+    nome = f'projects:{"+".join(slugs)}:{numero}'
+    cached = get_cached_page(request, nome, content_version)
+    if cached is not None:
+        return cached
+
+    index = skill_index.get_index()
+    project_ids = skill_index.filter_projects(index, slugs)
+    if project_ids is None:
+        raise Http404
+    try:
+        page = Paginator(project_ids, settings.PROJECTS_PER_PAGE).page(numero)
+    except InvalidPage:
+        raise Http404
+    projetos = Project.objects.prefetch_related('skill').in_bulk(page.object_list)
+    page.object_list = [projetos[pk] for pk in page.object_list if pk in projetos]
+
+    selecionados = set(slugs)
+    filtros = [
+        {
+            'slug': slug, 'title': title, 'count': count, 'selected': slug in selecionados,
+            'query': urlencode({'skill': sorted(selecionados ^ {slug})}, doseq=True),
+        }
+        for slug, title, count in skill_index.skill_counts(index)
+    ]
+    context = {
+        **_layout_context(content_version),
+        'page': page,
+        'skill_filters': filtros,
+        'skill_query': urlencode({'skill': slugs}, doseq=True),
+    }
+    response = render(request, 'main/project_list.html', context=context)
+    return cache_page_response(request, nome, content_version, response)
+
+
+@require_safe
+def project_detail(request, slug):
+    """
+    Página de um projeto. A página inteira fica em cache por versão do
+    conteúdo; o corpo, por geração do projeto, que só muda quando o projeto
+    ou suas habilidades mudam.
+    """
+    content_version = get_content_version()
+    nome = f'project:{slug}'
+    cached = get_cached_page(request, nome, content_version)
+    if cached is not None:
+        return cached
+    project = get_object_or_404(Project, slug=slug, is_active=True)
+    context = {
+        **_layout_context(content_version),
+        'project': project,
+        'project_generation': get_project_generation(project.pk),
+    }
+    response = render(request, 'main/project_detail.html', context=context)
+    return cache_page_response(request, nome, content_version, response)
 
 
-@cache_page(60 * 60 * 24)  # 1 dia de cache
+@versioned_cache_page(60 * 60 * 24)  # 1 dia de cache
 def robots(request):
     return render(request, 'main/robots.txt', content_type='text/plain')
 
-@cache_page(60 * 60 * 24)
+@versioned_cache_page(60 * 60 * 24)
 def sitemap(request):
-    return render(request, 'main/sitemap.xml', content_type='application/xml')
+    context = {
+        'site_url': settings.SITE_URL,
+        'project_slugs': Project.objects.filter(is_active=True)
+        .order_by('-featured', 'ordering_index', '-created').values_list('slug', flat=True),
+    }
+    return render(request, 'main/sitemap.xml', context=context, content_type='application/xml')
+
+
+def icon_sprite(request, digest):
+    """
+    Sprite SVG dos ícones do conteúdo. A URL leva o hash do sprite: se
+    confere com o atual, a resposta pode ficar em cache indefinidamente.
+    """
+    atual, svg = get_sprite()
+    response = HttpResponse(svg, content_type='image/svg+xml')
+    if digest == atual:
+        patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=5 * 60)
+    return response
+
+
+@require_safe
+def content_api(request, section=api.PORTFOLIO):
+    """
+    Conteúdo do portfólio em JSON (``/api/portfolio.json`` ou uma seção).
+    O corpo, o gzip e o ETag vêm prontos do cache da versão atual.
+    """
+    if section != api.PORTFOLIO and section not in api.SECTIONS:
+        raise Http404
+    etag, corpo, comprimido = api.get_payload(section)
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    elif ACCEPTS_GZIP.search(request.headers.get('Accept-Encoding', '')):
+        response = HttpResponse(comprimido, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(corpo, content_type='application/json')
+    response['ETag'] = etag
+    response['Access-Control-Allow-Origin'] = '*'
+    patch_cache_control(response, public=True, max_age=60)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
 
 
 @login_required
 def test_view(request):
-    return render(request, 'main/test.html')
\ No newline at end of file
+    return render(request, 'main/test.html')
+
+
+@csrf_exempt
+@require_POST
+def section_views(request):
+    """Recebe o beacon com as seções vistas na página inicial."""
+    sections = set(request.POST.get('sections', '').split(',')) & TRACKED_SECTIONS
+    if not sections:
+        return HttpResponseBadRequest()
+    for section in sections:
+        analytics.record('/', section=section)
+    return HttpResponse(status=204)
@@ -0,0 +1,91 @@
+"""
+Aquecimento do worker na inicialização.
+
+Com o loader em cache, cada template é lido e compilado uma única vez por
+processo; carregá-los aqui evita que a primeira requisição de cada worker
+pague esse custo para a página inicial e todos os seus includes. O mesmo
+vale para o URLconf, importado e indexado no primeiro ``{% url %}``.
+
+As funções são chamadas apenas nos pontos de entrada do servidor
+(``core.wsgi`` e ``core.asgi``), não em comandos como ``migrate`` ou
+``shell``, que não renderizam páginas.
+"""
+import logging
+import time
+from pathlib import Path
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.template.utils import get_app_template_dirs
+from django.urls import get_resolver
+
+logger = logging.getLogger(__name__)
+
+PAGES = (
+    "main/index.html", "main/project_list.html", "main/project_detail.html",
+    "main/robots.txt", "main/sitemap.xml",
+)
+# Diretórios cujos templates são todos carregados (login e recuperação de senha)
+DIRECTORIES = ("registration",)
+
+
+def _literal(expression):
+    """Nome do template se for uma string fixa (não uma variável de contexto)."""
+    return expression.var if isinstance(expression.var, str) else None
+
+
+def _dependencies(template):
+    """Templates estendidos e incluídos com nome fixo."""
+    nodelist = template.template.nodelist
+    for node in nodelist.get_nodes_by_type(ExtendsNode):
+        yield _literal(node.parent_name)
+    for node in nodelist.get_nodes_by_type(IncludeNode):
+        yield _literal(node.template)
+
+
+def _directory_templates(engine):
+    dirs = [*engine.engine.dirs, *get_app_template_dirs("templates")]
+    for base in map(Path, dirs):
+        for directory in DIRECTORIES:
+            for path in sorted((base / directory).glob("*.html")):
+                yield path.relative_to(base).as_posix()
+
+
+def warm_templates():
+    """Compila as páginas públicas, seus includes e os templates de registro."""
+    inicio = time.perf_counter()
+    compilados = set()
+    for engine in engines.all():
+        if not hasattr(engine, "engine"):
+            continue
+        pendentes = [*PAGES, *_directory_templates(engine)]
+        while pendentes:
+            nome = pendentes.pop()
+            if not nome or nome in compilados:
+                continue
+            try:
+                template = engine.get_template(nome)
+            except TemplateDoesNotExist:
+                continue
+            except TemplateSyntaxError:
+                logger.exception("Erro ao pré-compilar o template %s.", nome)
+                continue
+            compilados.add(nome)
+            pendentes.extend(_dependencies(template))
+    logger.info(
+        "%d templates pré-compilados em %.1f ms.",
+        len(compilados), (time.perf_counter() - inicio) * 1000,
+    )
+    return compilados
+
+
+def warm_urls():
+    """
+    Importa o URLconf e monta o índice de reversão do resolver raiz.
+
+    Chamado após a criação da aplicação WSGI/ASGI, quando todos os apps já
+    terminaram de inicializar.
+    """
+    inicio = time.perf_counter()
+    get_resolver().reverse_dict
+    logger.info("URLconf carregado em %.1f ms.", (time.perf_counter() - inicio) * 1000)
@@ -0,0 +1,224 @@
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files import locks
+from django.utils.module_loading import import_string
+
+from core import metrics
+
+_MISSING = object()
+
+
+class MetricsCacheMixin:
+    """
+    Conta acertos e falhas de leitura do backend de cache.
+
+    O rótulo exportado vem de ``OPTIONS['METRICS_NAME']`` (padrão ``default``).
+    """
+
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self.metrics_name = params.get("OPTIONS", {}).get("METRICS_NAME", "default")
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            metrics.CACHE_REQUESTS.inc((self.metrics_name, "miss"))
+            return default
+        metrics.CACHE_REQUESTS.inc((self.metrics_name, "hit"))
+        return value
+
+
+class InstrumentedLocMemCache(MetricsCacheMixin, LocMemCache):
+    pass
+
+
+class InstrumentedFileBasedCache(MetricsCacheMixin, FileBasedCache):
+    def incr(self, key, delta=1, version=None):
+        """
+        Incrementa o valor mantendo a expiração original da chave.
+
+        O ``incr`` herdado (``get`` seguido de ``set`` com o timeout padrão)
+        trocaria a expiração de chaves sem prazo, como as versões de
+        conteúdo, por ``TIMEOUT``. Aqui o arquivo é reescrito no lugar,
+        com a mesma expiração, sob um lock exclusivo.
+        """
+        try:
+            with open(self._key_to_file(key, version), "r+b") as f:
+                try:
+                    locks.lock(f, locks.LOCK_EX)
+                    try:
+                        expiry = pickle.load(f)
+                    except EOFError:
+                        expiry = 0
+                    if expiry is not None and expiry < time.time():
+                        raise ValueError(f"Key '{key}' not found")
+                    value = pickle.loads(zlib.decompress(f.read())) + delta
+                    f.seek(0)
+                    f.write(pickle.dumps(expiry, self.pickle_protocol))
+                    f.write(zlib.compress(pickle.dumps(value, self.pickle_protocol)))
+                    f.truncate()
+                    return value
+                finally:
+                    locks.unlock(f)
+        except FileNotFoundError:
+            raise ValueError(f"Key '{key}' not found")
+
+
+# Rótulo das leituras da memória local nas métricas de cache
+LOCAL_METRICS_NAME = "local"
+
+# Camada local de cada processo, por nome do alias (como no LocMemCache)
+_locals = {}
+_locks = {}
+
+
+class TieredCache(BaseCache):
+    """
+    Cache em dois níveis: LRU em memória do processo na frente de um cache
+    compartilhado entre os workers (outro alias de ``CACHES``).
+
+    As leituras consultam primeiro a memória local e, em caso de falha, o
+    cache compartilhado, guardando o valor localmente por no máximo
+    ``LOCAL_TIMEOUT`` segundos. Escritas e remoções vão para os dois níveis.
+
+    Cada worker só enxerga a escrita de outro processo quando a sua cópia
+    local expira; por isso a invalidação deve ser feita por versão: as
+    chaves de ``LOCAL_BYPASS`` (as versões) são sempre lidas do
+    cache compartilhado, e as demais chaves, que incluem a versão, nunca
+    ficam desatualizadas.
+
+    OPTIONS:
+        SHARED: alias do cache compartilhado (obrigatório).
+        LOCAL_TIMEOUT: tempo máximo de uma entrada na memória local (s).
+        LOCAL_MAX_ENTRIES: entradas na memória local antes de descartar as
+            menos usadas.
+        LOCAL_BYPASS: prefixos de chaves que nunca são guardadas localmente.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, name, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = options["SHARED"]
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 30)
+        self.local_max_entries = options.get("LOCAL_MAX_ENTRIES", 500)
+        self.local_bypass = tuple(options.get("LOCAL_BYPASS", ()))
+        self._local = _locals.setdefault(name, OrderedDict())
+        self._lock = _locks.setdefault(name, Lock())
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _remember(self, key, version, value, timeout=None):
+        """Guarda uma cópia local (serializada, como no LocMemCache)."""
+        if key.startswith(self.local_bypass):
+            return
+        expira = time.time() + self.local_timeout
+        if timeout is not None and timeout is not DEFAULT_TIMEOUT:
+            backend_timeout = self.get_backend_timeout(timeout)
+            if backend_timeout is not None:
+                expira = min(expira, backend_timeout)
+        local_key = self.make_and_validate_key(key, version=version)
+        entrada = (pickle.dumps(value, self.pickle_protocol), expira)
+        with self._lock:
+            self._local[local_key] = entrada
+            self._local.move_to_end(local_key, last=False)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem()
+
+    def _forget(self, key, version):
+        local_key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            self._local.pop(local_key, None)
+
+    def get(self, key, default=None, version=None):
+        if not key.startswith(self.local_bypass):
+            local_key = self.make_and_validate_key(key, version=version)
+            with self._lock:
+                entrada = self._local.get(local_key)
+                if entrada is not None and entrada[1] > time.time():
+                    self._local.move_to_end(local_key, last=False)
+                else:
+                    entrada = None
+            if entrada is not None:
+                metrics.CACHE_REQUESTS.inc((LOCAL_METRICS_NAME, "hit"))
+                return pickle.loads(entrada[0])
+            metrics.CACHE_REQUESTS.inc((LOCAL_METRICS_NAME, "miss"))
+        value = self.shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        self._remember(key, version, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self._remember(key, version, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if not self.shared.add(key, value, timeout, version=version):
+            return False
+        self._remember(key, version, value, timeout)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self._forget(key, version)
+        return self.shared.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def incr(self, key, delta=1, version=None):
+        self._forget(key, version)
+        return self.shared.incr(key, delta, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+@contextmanager
+def isolated_caches():
+    """
+    Substitui todos os aliases de ``CACHES`` por cópias vazias enquanto o
+    bloco executa, para testes e benchmarks não lerem nem apagarem o cache
+    em uso pelo site. Os caches em disco vão para um diretório temporário,
+    removido ao final; os em memória (e a camada local do ``TieredCache``)
+    ganham um ``LOCATION`` próprio.
+    """
+    from django.test.utils import override_settings
+
+    diretorio = tempfile.mkdtemp(prefix="isolated-cache-")
+    isolados = {}
+    for alias, params in settings.CACHES.items():
+        if issubclass(import_string(params["BACKEND"]), FileBasedCache):
+            location = os.path.join(diretorio, alias)
+        else:
+            location = f"isolated-{alias}-{os.path.basename(diretorio)}"
+        isolados[alias] = {**params, "LOCATION": location}
+    try:
+        with override_settings(CACHES=isolados):
+            yield
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
@@ -0,0 +1,238 @@
+"""
+Métricas operacionais no formato de exposição do Prometheus.
+
+Cada thread acumula suas observações em um dicionário próprio, de modo que
+o registro de uma métrica no caminho da requisição não usa locks; quando a
+thread termina, o dicionário é somado aos totais do processo. O
+processo consolida esses dicionários periodicamente em um arquivo JSON em
+``METRICS_DIR``; o endpoint ``/metrics`` soma os arquivos de todos os
+processos de workers. Sem ``METRICS_DIR`` apenas o processo atual é exportado.
+"""
+import atexit
+import json
+import os
+import itertools
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = {}
+_collectors = []
+_local = threading.local()
+# Dicionários das threads vivas e totais das threads já encerradas
+_shards = {}
+_retired = {}
+_shards_lock = threading.Lock()
+_shard_ids = itertools.count()
+_process_id = f"{os.getpid()}-{time.time_ns()}"
+_last_dump = 0.0
+
+
+class _ThreadToken:
+    """Referenciado só pela thread; é coletado quando ela termina."""
+
+
+def _shard():
+    """Dicionário de observações exclusivo da thread atual."""
+    try:
+        return _local.data
+    except AttributeError:
+        data = _local.data = {}
+        shard_id = next(_shard_ids)
+        with _shards_lock:
+            _shards[shard_id] = data
+        # Servidores com uma thread por requisição criariam um shard por thread
+        _local.token = _ThreadToken()
+        weakref.finalize(_local.token, _retire, shard_id)
+        return data
+
+
+def _retire(shard_id):
+    """Soma o dicionário de uma thread encerrada aos totais do processo."""
+    with _shards_lock:
+        data = _shards.pop(shard_id, None)
+        for (name, labels), value in (data or {}).items():
+            _merge(_retired, name, labels, value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry[name] = self
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, labels=(), amount=1):
+        data = _shard()
+        key = (self.name, labels)
+        data[key] = data.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Valor instantâneo, preenchido por coletores no momento da exportação."""
+    kind = "gauge"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, labels=()):
+        data = _shard()
+        key = (self.name, labels)
+        counts = data.get(key)
+        if counts is None:
+            # Um contador por bucket, +Inf e a soma no último item
+            counts = data[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+
+def register_collector(collector):
+    """
+    Registra uma função chamada na exportação que retorna amostras
+    ``(nome, labels, valor)`` de métricas já declaradas.
+    """
+    _collectors.append(collector)
+
+
+def _merge(target, name, labels, value):
+    key = (name, tuple(labels))
+    current = target.get(key)
+    if current is None:
+        target[key] = list(value) if isinstance(value, list) else value
+    elif isinstance(current, list):
+        for i, v in enumerate(value):
+            current[i] += v
+    else:
+        target[key] = current + value
+
+
+def collect_local():
+    """Consolida as observações de todas as threads deste processo."""
+    merged = {}
+    with _shards_lock:
+        for (name, labels), value in _retired.items():
+            _merge(merged, name, labels, value)
+        shards = list(_shards.values())
+    for shard in shards:
+        for (name, labels), value in list(shard.items()):
+            _merge(merged, name, labels, list(value) if isinstance(value, list) else value)
+    for collector in _collectors:
+        for name, labels, value in collector():
+            _merge(merged, name, labels, value)
+    return merged
+
+
+def dump():
+    """Grava o estado do processo no diretório compartilhado."""
+    global _last_dump
+    _last_dump = time.monotonic()
+    directory = settings.METRICS_DIR
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    samples = [[name, list(labels), value] for (name, labels), value in collect_local().items()]
+    path = Path(directory) / f"{_process_id}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(samples))
+    os.replace(tmp, path)
+
+
+def maybe_dump():
+    if time.monotonic() - _last_dump >= settings.METRICS_DUMP_INTERVAL:
+        dump()
+
+
+def collect_all():
+    """Soma os estados de todos os processos (ou só do atual)."""
+    directory = settings.METRICS_DIR
+    if not directory:
+        return collect_local()
+    dump()
+    merged = {}
+    agora = time.time()
+    for path in Path(directory).glob("*.json"):
+        try:
+            samples = json.loads(path.read_text())
+            recente = agora - path.stat().st_mtime <= settings.METRICS_GAUGE_MAX_AGE
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in samples:
+            metric = _registry.get(name)
+            # Gauges de processos encerrados não representam mais o presente
+            if metric is None or (metric.kind == "gauge" and not recente):
+                continue
+            _merge(merged, name, labels, value)
+    return merged
+
+
+def _format_labels(labelnames, labels, extra=()):
+    pares = list(zip(labelnames, labels)) + list(extra)
+    if not pares:
+        return ""
+    conteudo = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pares
+    )
+    return "{" + conteudo + "}"
+
+
+def render():
+    """Serializa as métricas no formato texto do Prometheus."""
+    samples = collect_all()
+    linhas = []
+    for name, metric in sorted(_registry.items()):
+        linhas.append(f"# HELP {name} {metric.documentation}")
+        linhas.append(f"# TYPE {name} {metric.kind}")
+        for (sample_name, labels), value in sorted(samples.items()):
+            if sample_name != name:
+                continue
+            if metric.kind != "histogram":
+                linhas.append(f"{name}{_format_labels(metric.labelnames, labels)} {value}")
+                continue
+            acumulado = 0
+            limites = [str(b) for b in metric.buckets] + ["+Inf"]
+            for limite, contagem in zip(limites, value[:-1]):
+                acumulado += contagem
+                rotulos = _format_labels(metric.labelnames, labels, [("le", limite)])
+                linhas.append(f"{name}_bucket{rotulos} {acumulado}")
+            rotulos = _format_labels(metric.labelnames, labels)
+            linhas.append(f"{name}_sum{rotulos} {value[-1]}")
+            linhas.append(f"{name}_count{rotulos} {acumulado}")
+    return "\n".join(linhas) + "\n"
+
+
+# Métricas da aplicação
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Latência das requisições por view.", ("view",)
+)
+RESPONSES = Counter(
+    "http_responses_total", "Respostas por view e classe de status.", ("view", "status")
+)
+DB_QUERIES = Counter("db_queries_total", "Consultas ao banco por view.", ("view",))
+DB_TIME = Counter(
+    "db_query_duration_seconds_total", "Tempo gasto em consultas ao banco por view.", ("view",)
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Leituras de cache por backend e resultado.", ("cache", "result")
+)
+CONTACT_SUBMISSIONS = Counter(
+    "contact_submissions_total", "Envios do formulário de contato.", ("result",)
+)
+
+atexit.register(dump)
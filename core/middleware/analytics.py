@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+from apps.main import analytics
+
+
+class PageViewMiddleware(MiddlewareMixin):
+    """
+    Contabiliza visualizações de páginas HTML públicas.
+
+    Apenas GETs com resposta 200 em ``text/html`` são contados, excluindo
+    os prefixos de ``ANALYTICS_EXCLUDED_PREFIXES`` (admin e autenticação).
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.excluded = tuple(settings.ANALYTICS_EXCLUDED_PREFIXES)
+
+    def process_response(self, request, response):
+        if (
+            request.method == "GET"
+            and response.status_code == 200
+            and response.get("Content-Type", "").startswith("text/html")
+            and not request.path.startswith(self.excluded)
+        ):
+            analytics.record(request.path, analytics.referrer_host(request))
+        return response
@@ -0,0 +1,93 @@
+from functools import partial
+
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, get_user_model
+from django.contrib.auth.middleware import AuthenticationMiddleware, auser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+from django_otp import DEVICE_ID_SESSION_KEY
+from django_otp.middleware import OTPMiddleware
+
+from apps.accounts import cache as auth_cache
+
+
+def get_user(request):
+    """
+    ``auth.get_user`` com o usuário em cache por sessão.
+
+    A entrada só é usada se a sessão ainda pertence ao mesmo usuário e o
+    hash de autenticação da sessão confere com o do usuário em cache; em
+    qualquer outro caso (sessão anônima, chave rotacionada, senha trocada)
+    o usuário é carregado do banco pelo fluxo padrão. O cache guarda os
+    campos do usuário sem a senha (ver ``apps.accounts.cache``).
+    """
+    session = request.session
+    try:
+        user_id = auth._get_user_session_key(request)
+        session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return auth.get_user(request)
+    if session.session_key is None:
+        return auth.get_user(request)
+
+    key = auth_cache.user_key(user_id, session.session_key)
+    entry = cache.get(key)
+    if entry is not None and constant_time_compare(
+        session.get(HASH_SESSION_KEY, ""), entry["session_hash"]
+    ):
+        return auth_cache.load_user(get_user_model(), entry)
+
+    user = auth.get_user(request)
+    # A sessão pode ter sido rotacionada ou descartada na verificação
+    if user.is_authenticated and session.session_key is not None:
+        cache.set(
+            auth_cache.user_key(user.pk, session.session_key), auth_cache.dump_user(user),
+            auth_cache.TIMEOUT,
+        )
+    return user
+
+
+def _get_request_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = get_user(request)
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    ``AuthenticationMiddleware`` que evita buscar o usuário no banco a cada
+    requisição do admin. A variante assíncrona (``request.auser``) não usa
+    o cache.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(partial(_get_request_user, request))
+        request.auser = partial(auser, request)
+
+
+class CachedOTPMiddleware(OTPMiddleware):
+    """
+    ``OTPMiddleware`` com o dispositivo verificado em cache por usuário
+    (só identificação e ``confirmed``, sem os segredos do dispositivo).
+    """
+
+    def _verify_user_sync(self, request, user):
+        self._init_user_fields(user)
+
+        if user.is_authenticated:
+            persistent_id = request.session.get(DEVICE_ID_SESSION_KEY)
+            device = None
+            if persistent_id:
+                key = auth_cache.device_key(user.pk, persistent_id)
+                entry = cache.get(key)
+                if entry is not None:
+                    device = auth_cache.load_device(entry)
+                else:
+                    device = self._device_from_persistent_id(persistent_id)
+                    if device is not None:
+                        cache.set(key, auth_cache.dump_device(device), auth_cache.TIMEOUT)
+            user.otp_device = self._finalize_device(request, user, device)
+
+        return user
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+
+from core import metrics
+
+# Registro dos limitadores deste processo, exposto por snapshot()
+_limiters = {}
+
+IN_FLIGHT = metrics.Gauge("concurrency_in_flight", "Requisições em andamento por grupo.", ("group",))
+WAITING = metrics.Gauge("concurrency_waiting", "Requisições aguardando vaga por grupo.", ("group",))
+ADMITTED = metrics.Counter("concurrency_admitted_total", "Requisições admitidas por grupo.", ("group",))
+REJECTED = metrics.Counter("concurrency_rejected_total", "Requisições rejeitadas com 503 por grupo.", ("group",))
+
+
+class GroupLimiter:
+    """
+    Limita as requisições simultâneas de um grupo de rotas.
+
+    Até ``limit`` requisições são atendidas ao mesmo tempo; as seguintes
+    aguardam no máximo ``timeout`` segundos, com no máximo ``queue``
+    requisições na fila. Quando a fila está cheia a rejeição é imediata.
+    """
+
+    def __init__(self, name, limit, queue, timeout):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._async_semaphores = {}
+
+    def _enter_queue(self):
+        with self._lock:
+            if self.waiting >= self.queue:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+            return True
+
+    def _leave_queue(self, admitted):
+        with self._lock:
+            self.waiting -= 1
+            if admitted:
+                self.in_flight += 1
+                self.admitted += 1
+            else:
+                self.rejected += 1
+
+    def _admit(self):
+        with self._lock:
+            self.in_flight += 1
+            self.admitted += 1
+
+    def _release_counters(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def acquire(self):
+        if self._semaphore.acquire(blocking=False):
+            self._admit()
+            return True
+        if not self._enter_queue():
+            return False
+        admitted = self._semaphore.acquire(timeout=self.timeout)
+        self._leave_queue(admitted)
+        return admitted
+
+    def release(self):
+        self._release_counters()
+        self._semaphore.release()
+
+    def _async_semaphore(self):
+        # Um semáforo por event loop (uvicorn usa um loop por processo)
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._async_semaphores[loop] = asyncio.BoundedSemaphore(self.limit)
+        return semaphore
+
+    async def aacquire(self):
+        semaphore = self._async_semaphore()
+        if not semaphore.locked():
+            await semaphore.acquire()
+            self._admit()
+            return True
+        if not self._enter_queue():
+            return False
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.timeout)
+            admitted = True
+        except asyncio.TimeoutError:
+            admitted = False
+        self._leave_queue(admitted)
+        return admitted
+
+    def arelease(self):
+        self._release_counters()
+        self._async_semaphore().release()
+
+    def stats(self):
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+def snapshot():
+    """Retorna as métricas de fila de cada grupo de rotas deste processo."""
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
+
+
+def _collect():
+    for name, stats in snapshot().items():
+        yield IN_FLIGHT.name, (name,), stats["in_flight"]
+        yield WAITING.name, (name,), stats["waiting"]
+        yield ADMITTED.name, (name,), stats["admitted"]
+        yield REJECTED.name, (name,), stats["rejected"]
+
+
+metrics.register_collector(_collect)
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    Descarta carga quando um grupo de rotas está saturado.
+
+    As rotas são divididas em três grupos configurados em
+    ``CONCURRENCY_LIMITS``: ``public`` (páginas públicas), ``contact``
+    (POST do formulário de contato) e ``auth`` (admin e autenticação, pelos
+    prefixos de ``CONCURRENCY_AUTH_PREFIXES``). Requisições que não
+    conseguem vaga dentro do prazo recebem um 503 com ``Retry-After``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.auth_prefixes = tuple(settings.CONCURRENCY_AUTH_PREFIXES)
+        self.retry_after = settings.CONCURRENCY_RETRY_AFTER
+        for name, config in settings.CONCURRENCY_LIMITS.items():
+            if name not in _limiters:
+                _limiters[name] = GroupLimiter(name, **config)
+        self.limiters = {name: _limiters[name] for name in settings.CONCURRENCY_LIMITS}
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
+
+    def route_group(self, request):
+        if request.path.startswith(self.auth_prefixes):
+            return "auth"
+        if request.method == "POST" and request.path == "/":
+            return "contact"
+        return "public"
+
+    def overloaded(self):
+        response = HttpResponse(
+            "Servidor sobrecarregado. Tente novamente em instantes.",
+            status=503,
+            content_type="text/plain; charset=utf-8",
+        )
+        response["Retry-After"] = str(self.retry_after)
+        return response
+
+    def __call__(self, request):
+        if self._is_async:
+            return self.__acall__(request)
+        limiter = self.limiters.get(self.route_group(request))
+        if limiter is None:
+            return self.get_response(request)
+        if not limiter.acquire():
+            return self.overloaded()
+        try:
+            return self.get_response(request)
+        finally:
+            limiter.release()
+
+    async def __acall__(self, request):
+        limiter = self.limiters.get(self.route_group(request))
+        if limiter is None:
+            return await self.get_response(request)
+        if not await limiter.aacquire():
+            return self.overloaded()
+        try:
+            return await self.get_response(request)
+        finally:
+            limiter.arelease()
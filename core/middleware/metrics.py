@@ -0,0 +1,69 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connection
+
+from core import metrics
+
+
+def view_label(request):
+    """Nome da view para os rótulos, agrupando todo o admin em ``admin``."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    if match.namespaces and match.namespaces[0] == "admin":
+        return "admin"
+    return match.view_name
+
+
+class MetricsMiddleware:
+    """
+    Mede latência, status e consultas ao banco de cada requisição.
+
+    Deve ser o primeiro middleware, para incluir o tempo dos demais e as
+    respostas 503 do limitador de concorrência. No modo assíncrono as
+    consultas rodam em outras threads e não são contabilizadas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
+
+    def _record(self, request, response, duration, queries=None):
+        view = view_label(request)
+        metrics.REQUEST_LATENCY.observe(duration, (view,))
+        metrics.RESPONSES.inc((view, f"{response.status_code // 100}xx"))
+        if queries:
+            metrics.DB_QUERIES.inc((view,), queries[0])
+            metrics.DB_TIME.inc((view,), queries[1])
+        metrics.maybe_dump()
+
+    def __call__(self, request):
+        if self._is_async:
+            return self.__acall__(request)
+        queries = [0, 0.0]
+
+        def count_queries(execute, sql, params, many, context):
+            inicio = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries[0] += 1
+                queries[1] += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            response = self.get_response(request)
+        self._record(request, response, time.perf_counter() - inicio, queries)
+        return response
+
+    async def __acall__(self, request):
+        inicio = time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, response, time.perf_counter() - inicio)
+        return response
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.deprecation import MiddlewareMixin
+
+from core.utils.html import minify_response
+
+
+class HtmlMinifyMiddleware(MiddlewareMixin):
+    """
+    Remove comentários e indentação das respostas HTML antes da compressão
+    (deve ficar abaixo do ``GZipMiddleware``). Ativo com ``HTML_MINIFY``;
+    respostas já minificadas, como a página inicial em cache, são ignoradas.
+    """
+
+    def __init__(self, get_response):
+        if not settings.HTML_MINIFY:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        return minify_response(response)
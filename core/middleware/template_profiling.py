@@ -0,0 +1,43 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from core import template_profiling
+
+
+class TemplateProfilingMiddleware:
+    """
+    Adiciona o cabeçalho ``Server-Timing`` com o tempo próprio de cada
+    template renderizado na requisição (visível nas ferramentas de
+    desenvolvedor do navegador). Ativo apenas com ``TEMPLATE_PROFILING``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        template_profiling.install()
+        self.get_response = get_response
+        self._is_async = iscoroutinefunction(get_response)
+        if self._is_async:
+            markcoroutinefunction(self)
+
+    def _add_header(self, response, profile):
+        valor = profile.server_timing()
+        if valor:
+            response["Server-Timing"] = valor
+        return response
+
+    def __call__(self, request):
+        if self._is_async:
+            return self.__acall__(request)
+        with template_profiling.profile() as profile:
+            response = self.get_response(request)
+        return self._add_header(response, profile)
+
+    async def __acall__(self, request):
+        with template_profiling.profile() as profile:
+            response = await self.get_response(request)
+        return self._add_header(response, profile)
@@ -0,0 +1,148 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from core import metrics
+from core.utils.ip import client_ip
+
+THROTTLE_REJECTED = metrics.Counter(
+    "throttle_rejected_total", "Tentativas recusadas com 429 por regra e motivo.", ("rule", "reason")
+)
+THROTTLE_LOCKOUTS = metrics.Counter(
+    "throttle_lockouts_total", "Bloqueios aplicados por regra e chave.", ("rule", "kind")
+)
+
+# Prefixo das chaves (lidas sempre do cache compartilhado, ver LOCAL_BYPASS)
+PREFIX = "throttle:"
+# Bloqueios anteriores contam para a duração do próximo por até 1 dia
+STRIKES_TIMEOUT = 24 * 60 * 60
+
+
+def _ident(value):
+    # Contas são normalizadas e não aparecem em claro nas chaves
+    return hashlib.sha256(value.strip().lower().encode()).hexdigest()[:32]
+
+
+def sliding_count(key, window, increment=False):
+    """
+    Contagem aproximada de eventos na janela deslizante de ``window`` s.
+
+    Soma a janela fixa atual com a anterior, ponderada pela fração dela
+    ainda dentro da janela deslizante.
+    """
+    agora = time.time()
+    indice = int(agora // window)
+    atual = f"{key}:{indice}"
+    if increment:
+        cache.add(atual, 0, window * 2)
+        try:
+            contagem = cache.incr(atual)
+        except ValueError:
+            cache.set(atual, 1, window * 2)
+            contagem = 1
+    else:
+        contagem = cache.get(atual, 0)
+    anterior = cache.get(f"{key}:{indice - 1}", 0)
+    return contagem + anterior * (1 - (agora % window) / window)
+
+
+def locked_until(rule, kind, ident):
+    return cache.get(f"{PREFIX}lock:{rule}:{kind}:{ident}")
+
+
+def lock(rule, kind, ident):
+    """Bloqueia a chave com duração dobrada a cada reincidência."""
+    strikes_key = f"{PREFIX}strikes:{rule}:{kind}:{ident}"
+    cache.add(strikes_key, 0, STRIKES_TIMEOUT)
+    try:
+        strikes = cache.incr(strikes_key)
+    except ValueError:
+        strikes = 1
+    duracao = min(
+        settings.THROTTLE_LOCKOUT_BASE * 2 ** (strikes - 1), settings.THROTTLE_LOCKOUT_MAX
+    )
+    ate = time.time() + duracao
+    cache.set(f"{PREFIX}lock:{rule}:{kind}:{ident}", ate, duracao)
+    THROTTLE_LOCKOUTS.inc((rule, kind))
+    return ate
+
+
+def reset_account(rule, account):
+    """Zera as tentativas e reincidências de uma conta (após login válido)."""
+    ident = _ident(account)
+    window = settings.THROTTLE_RULES[rule]["account"][1]
+    indice = int(time.time() // window)
+    cache.delete_many([
+        f"{PREFIX}count:{rule}:account:{ident}:{indice}",
+        f"{PREFIX}count:{rule}:account:{ident}:{indice - 1}",
+        f"{PREFIX}strikes:{rule}:account:{ident}",
+    ])
+
+
+def _logged_in(sender, request, user, **kwargs):
+    # No two_factor o login só termina no passo do token, sem o usuário no POST
+    for rule, config in settings.THROTTLE_RULES.items():
+        if config.get("reset_on_login"):
+            reset_account(rule, user.get_username())
+
+
+class ThrottleMiddleware(MiddlewareMixin):
+    """
+    Limita tentativas de login e de recuperação de senha.
+
+    Cada regra de ``THROTTLE_RULES`` conta os POSTs nos seus caminhos em
+    janelas deslizantes por IP e por conta (campo do formulário). Ao passar
+    do limite a chave é bloqueada por ``THROTTLE_LOCKOUT_BASE`` segundos,
+    dobrando a cada reincidência. A recusa (429) acontece antes de sessão,
+    CSRF e da view: nenhum hash de senha é calculado e nenhum e-mail enviado.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.rules = {
+            path: name
+            for name, config in settings.THROTTLE_RULES.items()
+            for path in config["paths"]
+        }
+        user_logged_in.connect(_logged_in, dispatch_uid="throttle_logged_in")
+
+    def rejected(self, rule, reason, ate):
+        THROTTLE_REJECTED.inc((rule, reason))
+        response = HttpResponse(
+            "Muitas tentativas. Tente novamente mais tarde.",
+            status=429,
+            content_type="text/plain; charset=utf-8",
+        )
+        response["Retry-After"] = str(max(1, math.ceil(ate - time.time())))
+        return response
+
+    def process_request(self, request):
+        if request.method != "POST":
+            return None
+        rule = self.rules.get(request.path_info)
+        if rule is None:
+            return None
+        config = settings.THROTTLE_RULES[rule]
+
+        chaves = [("ip", _ident(client_ip(request)))]
+        account = request.POST.get(config["account_field"], "")
+        if account:
+            chaves.append(("account", _ident(account)))
+
+        for kind, ident in chaves:
+            ate = locked_until(rule, kind, ident)
+            if ate is not None:
+                return self.rejected(rule, f"{kind}_locked", ate)
+
+        for kind, ident in chaves:
+            limite, janela = config[kind]
+            contagem = sliding_count(f"{PREFIX}count:{rule}:{kind}:{ident}", janela, increment=True)
+            if contagem > limite:
+                return self.rejected(rule, f"{kind}_limit", lock(rule, kind, ident))
+        return None
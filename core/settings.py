@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import os
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -57,35 +57,177 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.metrics.MetricsMiddleware',
+    'core.middleware.template_profiling.TemplateProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'django.middleware.gzip.GZipMiddleware',
+    'core.middleware.minify.HtmlMinifyMiddleware',
+    'core.middleware.concurrency.ConcurrencyLimitMiddleware',
+    'core.middleware.throttle.ThrottleMiddleware',
+    'core.middleware.analytics.PageViewMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django_otp.middleware.OTPMiddleware',
+    'core.middleware.auth.CachedAuthenticationMiddleware',
+    'core.middleware.auth.CachedOTPMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Limite de requisições simultâneas por grupo de rotas, por processo.
+# limit: em andamento; queue: máximo aguardando; timeout: espera máxima (s)
+CONCURRENCY_LIMITS = {
+    'public': {
+        'limit': config('CONCURRENCY_PUBLIC_LIMIT', default=32, cast=int),
+        'queue': 64,
+        'timeout': 0.5,
+    },
+    'contact': {
+        'limit': config('CONCURRENCY_CONTACT_LIMIT', default=4, cast=int),
+        'queue': 8,
+        'timeout': 1.0,
+    },
+    'auth': {
+        'limit': config('CONCURRENCY_AUTH_LIMIT', default=4, cast=int),
+        'queue': 8,
+        'timeout': 2.0,
+    },
+}
+# Prefixos de rotas do grupo 'auth' (admin, two_factor e contas)
+CONCURRENCY_AUTH_PREFIXES = [
+    '/adminmk/', '/account/', '/password_', '/reset/', '/logout/',
+]
+CONCURRENCY_RETRY_AFTER = 5
+
+# Tentativas de login e de recuperação de senha por IP e por conta:
+# (limite, janela em segundos). Acima do limite, bloqueio de
+# THROTTLE_LOCKOUT_BASE segundos, dobrado a cada reincidência
+THROTTLE_RULES = {
+    'login': {
+        'paths': ['/account/login/'],
+        'account_field': 'auth-username',
+        'ip': (30, 5 * 60),
+        'account': (5, 15 * 60),
+        'reset_on_login': True,
+    },
+    'admin_login': {
+        'paths': ['/adminmk/login/'],
+        'account_field': 'username',
+        'ip': (30, 5 * 60),
+        'account': (5, 15 * 60),
+        'reset_on_login': True,
+    },
+    'password_reset': {
+        'paths': ['/password_reset/'],
+        'account_field': 'email',
+        'ip': (10, 60 * 60),
+        'account': (3, 60 * 60),
+    },
+}
+THROTTLE_LOCKOUT_BASE = 60
+THROTTLE_LOCKOUT_MAX = 24 * 60 * 60
+# Atrás de proxy reverso o REMOTE_ADDR é o do proxy, igual para todos os
+# visitantes: informe o cabeçalho com o IP do cliente (ex.:
+# HTTP_X_FORWARDED_FOR) e quantos proxies confiáveis o preenchem
+CLIENT_IP_HEADER = config('CLIENT_IP_HEADER', default='')
+TRUSTED_PROXY_COUNT = config('TRUSTED_PROXY_COUNT', default=1, cast=int)
+
+# Agregação de visualizações em memória, gravada em lotes
+ANALYTICS_FLUSH_INTERVAL = config('ANALYTICS_FLUSH_INTERVAL', default=60, cast=int)
+ANALYTICS_MAX_KEYS = 1000
+ANALYTICS_EXCLUDED_PREFIXES = CONCURRENCY_AUTH_PREFIXES + ['/static/', '/media/', '/icons/', '/api/', '/test/']
+
+# Métricas Prometheus em /metrics. Com METRICS_DIR, cada worker grava seu
+# estado nesse diretório e o endpoint soma todos (limpe-o ao reiniciar o serviço)
+METRICS_DIR = config('METRICS_DIR', default='') or None
+METRICS_DUMP_INTERVAL = 10
+METRICS_GAUGE_MAX_AGE = 60
+# Sem token, só IPs de METRICS_ALLOWED_IPS, resolvidos por CLIENT_IP_HEADER
+# (requisições repassadas por proxy são recusadas se ele não estiver definido)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_ALLOWED_IPS = ['127.0.0.1/32', '::1/128']
+
+# Cabeçalho Server-Timing com o tempo de renderização de cada template
+# (apenas para diagnóstico: expõe nomes de templates)
+TEMPLATE_PROFILING = config('TEMPLATE_PROFILING', default=False, cast=bool)
+
+# Endereço canônico do site, usado nas URLs absolutas de Open Graph e JSON-LD
+SITE_URL = config('SITE_URL', default='https://matheusbraga.dev').rstrip('/')
+
+# Remove comentários e indentação das respostas HTML (a página inicial é
+# guardada já minificada, uma vez por versão do conteúdo)
+HTML_MINIFY = config('HTML_MINIFY', default=True, cast=bool)
+# Tempo das páginas públicas completas em cache (além dos fragmentos)
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+# Projetos na página inicial (destaques primeiro) e por página em /projects/
+HOMEPAGE_PROJECTS = 6
+PROJECTS_PER_PAGE = 12
+# Máximo de habilidades combinadas no filtro /projects/?skill=
+PROJECT_SKILL_FILTERS = 5
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': ['templates'],
-        'APP_DIRS': True,
+        'DIRS': [BASE_DIR / 'templates'],
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Templates compilados uma vez por processo (e pré-compilados no
+            # boot, ver WORKER_WARMUP); equivale a APP_DIRS com cache
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
 
+# Pré-compila a página inicial, seus includes e os templates de registro e
+# carrega o URLconf na inicialização de cada processo do servidor
+# (core.wsgi e core.asgi, ver apps.main.warmup)
+WORKER_WARMUP = config('WORKER_WARMUP', default=True, cast=bool)
+
 WSGI_APPLICATION = 'core.wsgi.application'
 
+# Usa a view assíncrona da página inicial (recomendado apenas no deploy ASGI)
+ASYNC_INDEX = config('ASYNC_INDEX', default=False, cast=bool)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Memória de cada worker na frente de um cache em disco compartilhado por
+# todos os processos; a invalidação usa a versão do conteúdo (apps.main.cache)
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.TieredCache',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'LOCAL_TIMEOUT': 30,
+            'LOCAL_MAX_ENTRIES': 500,
+            'LOCAL_BYPASS': [
+                'main:content_version', 'main:project_generation:', 'main:skill_index',
+                'accounts:generation:', 'throttle:',
+            ],
+        },
+    },
+    'shared': {
+        'BACKEND': 'core.cache.InstrumentedFileBasedCache',
+        'LOCATION': config('CACHE_DIR', default=os.path.join(BASE_DIR, 'cache')),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'METRICS_NAME': 'shared',
+        },
+    },
+}
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -150,6 +292,37 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 LOGIN_URL = 'two_factor:login'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = "/"
+
+# E-mail: as mensagens são gravadas na fila (apps.main.mail) e entregues
+# pelo comando send_outbox com OUTBOX_DELIVERY_BACKEND
+EMAIL_BACKEND = 'apps.main.mail.OutboxEmailBackend'
+OUTBOX_DELIVERY_BACKEND = config(
+    'OUTBOX_DELIVERY_BACKEND', default='django.core.mail.backends.smtp.EmailBackend'
+)
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+# Espera antes da n-ésima nova tentativa: BACKOFF * 2^(n-1), até MAX_BACKOFF (s)
+OUTBOX_RETRY_BACKOFF = 60
+OUTBOX_RETRY_MAX_BACKOFF = 60 * 60
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+EMAIL_TIMEOUT = 10
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
+# Destinatários do aviso de novas mensagens de contato (separados por vírgula)
+MESSAGE_NOTIFY_TO = config('MESSAGE_NOTIFY_TO', default='', cast=Csv())
+# 'immediate': um e-mail por mensagem; 'digest': um resumo a cada
+# MESSAGE_DIGEST_INTERVAL segundos (enviado por send_outbox --loop ou
+# send_message_digest)
+MESSAGE_NOTIFY_MODE = config('MESSAGE_NOTIFY_MODE', default='digest')
+MESSAGE_DIGEST_INTERVAL = config('MESSAGE_DIGEST_INTERVAL', default=60 * 60, cast=int)
+MESSAGE_DIGEST_MAX_ITEMS = 50
+
+# Mensagens sempre em cookie assinado, sem recorrer à sessão: visitantes
+# anônimos nunca gravam sessão no banco (criada apenas no login do admin)
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -86,6 +86,30 @@ document.addEventListener('DOMContentLoaded', () => {
         `;
     });
 
+    // --- Engajamento: envia as seções vistas ao sair da página ---
+    const analyticsUrl = body.dataset.analyticsUrl;
+    if (analyticsUrl && navigator.sendBeacon) {
+        const seenSections = new Set();
+        const sectionObserver = new IntersectionObserver((entries) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    seenSections.add(entry.target.id);
+                    sectionObserver.unobserve(entry.target);
+                }
+            });
+        }, { threshold: 0.5 });
+        sections.forEach(section => section.id && sectionObserver.observe(section));
+
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'hidden' && seenSections.size) {
+                const data = new FormData();
+                data.append('sections', [...seenSections].join(','));
+                navigator.sendBeacon(analyticsUrl, data);
+                seenSections.clear();
+            }
+        });
+    }
+
     // --- Inicializa índices dos itens da timeline para animação ---
     timelineItems.forEach((item, index) => {
         item.style.setProperty('--item-index', index + 1);
@@ -0,0 +1,103 @@
+"""
+Perfil de renderização de templates.
+
+Quando instalado, ``Template._render`` e ``IncludeNode.render`` passam a
+medir o tempo gasto em cada template (incluindo pais de ``{% extends %}``)
+e em cada ``{% include %}``. As medições só são acumuladas dentro de
+``profile()``; fora dele o custo é uma leitura de ``ContextVar``.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.template.base import Template
+from django.template.loader_tags import IncludeNode
+
+_current = ContextVar("template_profile", default=None)
+
+
+class Profile:
+    def __init__(self):
+        # nome -> [chamadas, tempo total, tempo próprio]
+        self.templates = {}
+        # (template de origem, template incluído) -> [chamadas, tempo total]
+        self.includes = {}
+        self._stack = []
+
+    def rows(self, limit=None):
+        """Templates ordenados pelo tempo próprio (sem os templates filhos)."""
+        linhas = sorted(self.templates.items(), key=lambda item: item[1][2], reverse=True)
+        return linhas[:limit]
+
+    def include_rows(self, limit=None):
+        linhas = sorted(self.includes.items(), key=lambda item: item[1][1], reverse=True)
+        return linhas[:limit]
+
+    def server_timing(self, limit=10):
+        """Valor do cabeçalho ``Server-Timing`` com o tempo próprio de cada template."""
+        metricas = []
+        for indice, (nome, (chamadas, _, proprio)) in enumerate(self.rows(limit)):
+            descricao = f"{nome} x{chamadas}".replace('"', "'")
+            metricas.append(f'tpl{indice};dur={proprio * 1000:.2f};desc="{descricao}"')
+        return ", ".join(metricas)
+
+
+def _timed_render(original):
+    def _render(self, context):
+        profile = _current.get()
+        if profile is None:
+            return original(self, context)
+        profile._stack.append(0.0)
+        inicio = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            decorrido = time.perf_counter() - inicio
+            filhos = profile._stack.pop()
+            if profile._stack:
+                profile._stack[-1] += decorrido
+            entrada = profile.templates.setdefault(self.name or "<string>", [0, 0.0, 0.0])
+            entrada[0] += 1
+            entrada[1] += decorrido
+            entrada[2] += decorrido - filhos
+    _render.profiled = True
+    return _render
+
+
+def _timed_include(original):
+    def render(self, context):
+        profile = _current.get()
+        if profile is None:
+            return original(self, context)
+        inicio = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            chave = (self.origin.template_name, self.template.token.strip("\"'"))
+            entrada = profile.includes.setdefault(chave, [0, 0.0])
+            entrada[0] += 1
+            entrada[1] += time.perf_counter() - inicio
+    render.profiled = True
+    return render
+
+
+def install():
+    """
+    Instrumenta o motor de templates (idempotente). Deve ser chamado depois
+    de ``setup_test_environment()``, que substitui ``Template._render``.
+    """
+    if not getattr(Template._render, "profiled", False):
+        Template._render = _timed_render(Template._render)
+    if not getattr(IncludeNode.render, "profiled", False):
+        IncludeNode.render = _timed_include(IncludeNode.render)
+
+
+@contextmanager
+def profile():
+    """Acumula as renderizações feitas dentro do bloco em um ``Profile``."""
+    atual = Profile()
+    token = _current.set(atual)
+    try:
+        yield atual
+    finally:
+        _current.reset(token)
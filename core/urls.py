@@ -18,11 +18,16 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from django.conf.urls.static import static
-from two_factor.urls import urlpatterns as two_factor_urls
+from core.utils.urls import lazy_path
+from core.views import metrics_view
 
 urlpatterns = [
+    path('metrics', metrics_view, name='metrics'),
     path('adminmk/', admin.site.urls),
     path('', include('apps.main.urls')),
     path('', include('apps.accounts.urls')),
-    path('', include(two_factor_urls)),
+    # two_factor (views, qrcode, Pillow) só é importado no primeiro acesso ao
+    # login. Sob account/, e não na raiz, para os 404 de outros endereços não
+    # passarem por ele; as rotas continuam em /account/login/ etc.
+    lazy_path('account/', 'two_factor.urls', 'two_factor', strip_route=True),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,56 @@
+import re
+
+# Blocos cujo conteúdo não é alterado (espaços significativos ou código)
+_PRESERVED = re.compile(
+    r"(<(pre|textarea|script|style)\b.*?</\2\s*>)", re.IGNORECASE | re.DOTALL
+)
+# Comentários HTML, exceto os condicionais (<!--[if ...]>)
+_COMMENT = re.compile(r"<!--(?!\[).*?-->", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _collapse(match):
+    # Uma quebra de linha equivale a um espaço na renderização, mas mantém
+    # o HTML legível e não junta palavras de elementos inline vizinhos
+    return "\n" if "\n" in match.group() else " "
+
+
+def minify_html(html):
+    """
+    Remove comentários e a indentação de um documento HTML.
+
+    Cada sequência de espaços vira um único espaço (ou uma quebra de linha),
+    o que não altera a renderização. O conteúdo de ``pre``, ``textarea``,
+    ``script`` e ``style`` é mantido como está.
+    """
+    partes = _PRESERVED.split(html)
+    resultado = []
+    # split com dois grupos: texto, bloco preservado, nome da tag, texto...
+    for indice in range(0, len(partes), 3):
+        texto = _COMMENT.sub("", partes[indice])
+        resultado.append(_WHITESPACE.sub(_collapse, texto))
+        if indice + 1 < len(partes):
+            resultado.append(partes[indice + 1])
+    return "".join(resultado).strip()
+
+
+def minify_response(response):
+    """
+    Minifica o conteúdo de uma resposta ``text/html`` (uma única vez).
+
+    Respostas em streaming, já comprimidas ou com outro tipo de conteúdo
+    são devolvidas sem alteração.
+    """
+    if (
+        getattr(response, "html_minified", False)
+        or response.streaming
+        or response.has_header("Content-Encoding")
+        or not response.get("Content-Type", "").startswith("text/html")
+    ):
+        return response
+    conteudo = response.content.decode(response.charset)
+    response.content = minify_html(conteudo)
+    if response.has_header("Content-Length"):
+        response["Content-Length"] = str(len(response.content))
+    response.html_minified = True
+    return response
@@ -0,0 +1,19 @@
+from django.conf import settings
+
+
+def client_ip(request):
+    """
+    IP do visitante.
+
+    Com ``CLIENT_IP_HEADER`` (ex.: ``HTTP_X_FORWARDED_FOR``) o IP vem do
+    cabeçalho preenchido pelo proxy reverso: cada proxy acrescenta ao fim
+    da lista o endereço de quem o chamou, então o cliente é o
+    ``TRUSTED_PROXY_COUNT``-ésimo valor a partir do fim. Valores anteriores
+    foram enviados pelo próprio cliente e são ignorados.
+    """
+    header = settings.CLIENT_IP_HEADER
+    if header:
+        valores = [v.strip() for v in request.META.get(header, "").split(",") if v.strip()]
+        if len(valores) >= settings.TRUSTED_PROXY_COUNT:
+            return valores[-settings.TRUSTED_PROXY_COUNT]
+    return request.META.get("REMOTE_ADDR", "")
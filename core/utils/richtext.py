@@ -0,0 +1,31 @@
+import markdown
+import nh3
+
+# Tags aceitas em campos de uma linha (títulos)
+INLINE_TAGS = {
+    "a", "abbr", "b", "br", "code", "del", "em", "i", "kbd", "mark", "s",
+    "small", "span", "strong", "sub", "sup", "u",
+}
+# Atributos de nh3 mais ``class``, usado pelos autores para estilizar trechos
+ATTRIBUTES = {
+    **{tag: set(attrs) for tag, attrs in nh3.ALLOWED_ATTRIBUTES.items()},
+    "*": {"class", "title"},
+}
+
+
+def render_markdown(text, inline=False):
+    """
+    Converte Markdown em HTML sanitizado.
+
+    HTML escrito diretamente no texto continua aceito, mas passa pela mesma
+    lista de tags e atributos permitidos. Com ``inline=True`` o resultado não
+    é envolvido em ``<p>`` e só mantém tags de texto, para uso em títulos.
+    """
+    if not text:
+        return ""
+    html = markdown.markdown(text, extensions=["extra", "sane_lists"])
+    if inline:
+        if html.startswith("<p>") and html.endswith("</p>") and html.count("<p>") == 1:
+            html = html[3:-4]
+        return nh3.clean(html, tags=INLINE_TAGS, attributes=ATTRIBUTES)
+    return nh3.clean(html, attributes=ATTRIBUTES)
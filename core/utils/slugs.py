@@ -0,0 +1,18 @@
+from django.utils.html import strip_tags
+from django.utils.text import slugify
+
+
+def unique_slug(text, exists, max_length=255, fallback="item"):
+    """
+    Slug de ``text`` que ainda não está em uso.
+
+    ``exists`` recebe um slug candidato e informa se ele já existe; em caso
+    de colisão é acrescentado um sufixo numérico (``-2``, ``-3``...).
+    """
+    base = slugify(strip_tags(text or ""))[:max_length].strip("-") or fallback
+    slug, n = base, 1
+    while exists(slug):
+        n += 1
+        sufixo = f"-{n}"
+        slug = f"{base[:max_length - len(sufixo)]}{sufixo}"
+    return slug
@@ -0,0 +1,107 @@
+import copy
+from functools import cached_property
+from importlib import import_module
+
+from django.urls.resolvers import RoutePattern, URLResolver
+
+
+def _strip_route(pattern, prefix):
+    """Cópia de ``pattern`` (path ou include) sem ``prefix`` no início da rota."""
+    route = str(pattern.pattern)
+    if not route.startswith(prefix):
+        raise ValueError(f"A rota {route!r} não começa com {prefix!r}.")
+    pattern = copy.copy(pattern)
+    pattern.pattern = RoutePattern(
+        route[len(prefix):], name=pattern.pattern.name, is_endpoint=pattern.pattern._is_endpoint,
+    )
+    return pattern
+
+
+class LazyURLConf:
+    """Objeto no lugar do módulo de URLconf, importado no primeiro acesso."""
+
+    def __init__(self, module, attribute="urlpatterns", strip=""):
+        self.module = module
+        self.attribute = attribute
+        self.strip = strip
+
+    @cached_property
+    def urlpatterns(self):
+        patterns = getattr(import_module(self.module), self.attribute)
+        # Apps como o two_factor exportam a tupla (urlpatterns, app_name)
+        if isinstance(patterns, tuple):
+            patterns = patterns[0]
+        if self.strip:
+            patterns = [_strip_route(pattern, self.strip) for pattern in patterns]
+        return patterns
+
+    def __repr__(self):
+        return f"<LazyURLConf {self.module}>"
+
+
+class LazyURLResolver(URLResolver):
+    """
+    Resolver que não carrega o URLconf quando o resolver pai é populado.
+
+    O ``_populate()`` do resolver raiz (disparado pelo primeiro ``reverse()``
+    ou ``{% url %}``) popula todos os includes. Aqui essa chamada é ignorada
+    até que o próprio resolver seja usado: ao resolver um caminho que
+    chegue até ele ou ao reverter um nome do seu namespace.
+    """
+
+    loaded = False
+
+    def _populate(self):
+        if self.loaded:
+            super()._populate()
+
+    def _load(self):
+        self.loaded = True
+
+    def resolve(self, path):
+        self._load()
+        return super().resolve(path)
+
+    def _reverse_with_prefix(self, lookup_view, _prefix, *args, **kwargs):
+        self._load()
+        return super()._reverse_with_prefix(lookup_view, _prefix, *args, **kwargs)
+
+    def _is_callback(self, name):
+        self._load()
+        return super()._is_callback(name)
+
+    @property
+    def reverse_dict(self):
+        self._load()
+        return super().reverse_dict
+
+    @property
+    def namespace_dict(self):
+        self._load()
+        return super().namespace_dict
+
+    @property
+    def app_dict(self):
+        self._load()
+        return super().app_dict
+
+
+def lazy_path(route, module, app_name, namespace=None, attribute="urlpatterns", strip_route=False):
+    """
+    Equivalente a ``path(route, include((module, app_name), namespace))``
+    sem importar ``module`` na carga do URLconf raiz.
+
+    Exige um namespace: nomes sem namespace só podem ser revertidos
+    populando o include, o que anularia o carregamento tardio.
+
+    Com ``strip_route=True`` o ``route`` é removido do início das rotas do
+    módulo, que já o incluem (ex.: as ``account/...`` do two_factor). Assim
+    o include fica sob um prefixo próprio sem mudar os endereços, e só as
+    requisições com esse prefixo chegam a importá-lo.
+    """
+    return LazyURLResolver(
+        RoutePattern(route, is_endpoint=False),
+        LazyURLConf(module, attribute, route if strip_route else ""),
+        app_name=app_name,
+        namespace=namespace or app_name,
+    )
@@ -0,0 +1,37 @@
+import hmac
+import ipaddress
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.cache import never_cache
+
+from core import metrics
+from core.utils.ip import client_ip
+
+# Cabeçalhos que indicam uma requisição repassada por proxy reverso
+FORWARDED_HEADERS = ("HTTP_X_FORWARDED_FOR", "HTTP_X_REAL_IP", "HTTP_FORWARDED")
+
+
+def _allowed(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        header = request.META.get("HTTP_AUTHORIZATION", "")
+        # Bytes: compare_digest recusa strings com caracteres não ASCII
+        return hmac.compare_digest(header.encode(), f"Bearer {token}".encode())
+    if not settings.CLIENT_IP_HEADER and any(h in request.META for h in FORWARDED_HEADERS):
+        # Atrás de um proxy sem CLIENT_IP_HEADER o REMOTE_ADDR é o do proxy
+        # (127.0.0.1), não o do cliente: sem token, recusa
+        return False
+    try:
+        address = ipaddress.ip_address(client_ip(request))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(rede) for rede in settings.METRICS_ALLOWED_IPS)
+
+
+@never_cache
+def metrics_view(request):
+    """Exporta as métricas para o Prometheus (token ou IP autorizado)."""
+    if not _allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")